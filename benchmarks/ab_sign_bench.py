@@ -0,0 +1,43 @@
+"""
+Micro-benchmark for the Douyin a_bogus signer.
+
+    python benchmarks/ab_sign_bench.py [-n 2000]
+"""
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from streamget.platforms.douyin import ab_sign
+
+QUERY = ('aid=6383&app_name=douyin_web&live_id=1&device_platform=web&language=zh-CN&enter_from=web_live'
+         '&cookie_enabled=true&screen_width=1728&screen_height=1117&browser_language=zh-CN&browser_platform=MacIntel'
+         '&browser_name=Chrome&browser_version=116.0.0.0&web_rid=745964462470&msToken=')
+USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+              'Chrome/116.0.5845.97 Safari/537.36 Core/1.116.567.400 QQBrowser/19.7.6764.400')
+
+CASES = {
+    'ab_sign': lambda: ab_sign.ab_sign(QUERY, USER_AGENT),
+    'ab_sign (cold UA cache)': lambda: (ab_sign.clear_sign_cache(), ab_sign.ab_sign(QUERY, USER_AGENT)),
+    'sm3 (64 bytes)': lambda: ab_sign.SM3().sum('a' * 64),
+    'sm3 (1 KiB)': lambda: ab_sign.SM3().sum('a' * 1024),
+    'rc4 (user agent)': lambda: ab_sign.rc4_encrypt(USER_AGENT, '\x00\x01\x0e'),
+    'result_encrypt (user agent)': lambda: ab_sign.result_encrypt(USER_AGENT, 's3'),
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-n', '--number', type=int, default=2000, help='calls per measurement')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='number of measurements')
+    args = parser.parse_args()
+
+    for name, func in CASES.items():
+        best = min(timeit.repeat(func, number=args.number, repeat=args.repeat)) / args.number
+        print(f'{name:<30} {best * 1e6:10.1f} us/call')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,271 @@
+"""
+A local stand-in for the platform APIs, for load testing without touching the real sites.
+
+    python benchmarks/fake_platform_server.py [--port 8765] [--latency 50] [--jitter 20] \
+        [--error-rate 0.01] [--payload-kb 16]
+
+It speaks plain HTTP/1.1 with keep-alive and answers by path, whatever host the request was meant for:
+
+    GET  /webcast/room/web/enter/                      Douyin room data
+    GET  /room/v1/Room/room_init                       Bilibili room status
+    GET  /xlive/web-room/v1/index/getH5InfoByRoom      Bilibili room info
+    GET  /room/v1/Room/playUrl                         Bilibili stream URLs
+    POST /gql                                          Twitch GQL (room query and playback token)
+    GET  /api/channel/hls/<channel>.m3u8               Twitch HLS master playlist
+    GET  *.m3u8 / *.flv                                stream probes, a short media playlist
+
+Every response is delayed by `latency` +/- `jitter` milliseconds, `error_rate` of them are HTTP 500, and the
+room data responses are padded to about `payload_kb` KiB. See load_test.py for the matching client side.
+"""
+import argparse
+import asyncio
+import json
+import random
+import signal
+import urllib.parse
+from collections import Counter
+from dataclasses import dataclass
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 500: 'Internal Server Error'}
+
+
+@dataclass
+class ServerConfig:
+    """
+    Behaviour of the fake server.
+
+    Attributes:
+        latency (float): Mean delay added to every response, in milliseconds.
+        jitter (float): The delay varies uniformly by up to this many milliseconds.
+        error_rate (float): Fraction of requests answered with HTTP 500.
+        payload_kb (float): Approximate size of the room data responses, in KiB.
+        seed (int | None): Seed of the random generator, for repeatable runs.
+    """
+    latency: float = 50.0
+    jitter: float = 20.0
+    error_rate: float = 0.0
+    payload_kb: float = 16.0
+    seed: int | None = None
+
+
+def _padding(size: int) -> list[dict]:
+    # Filler entries in the shape of the lists the real APIs return (recommended rooms, banners...).
+    entry = {'id_str': '7000000000000000000', 'title': 'recommended live room', 'cover': 'https://p3.img/cover.jpg'}
+    return [entry] * max(0, size // (len(json.dumps(entry)) + 2))
+
+
+def _stream_data(room_id: str) -> dict:
+    data = {}
+    for name, bitrate, resolution in (('origin', 6000, '1920x1080'), ('uhd', 4000, '1920x1080'),
+                                      ('hd', 2000, '1280x720'), ('sd', 1000, '960x540'), ('ld', 600, '640x360')):
+        base = f'pull-{name}.douyincdn.com/third/stream-{room_id}_{name}'
+        data[name] = {'main': {
+            'flv': f'https://{base}.flv?expire=1760000000&sign=0123456789abcdef',
+            'hls': f'https://{base}.m3u8?expire=1760000000&sign=0123456789abcdef',
+            'sdk_params': json.dumps({'VCodec': 'h264', 'vbitrate': bitrate * 1000, 'resolution': resolution}),
+        }}
+    return {'data': data}
+
+
+def douyin_room(web_rid: str, padding: list[dict]) -> dict:
+    stream_data = _stream_data(web_rid)
+    qualities = {'FULL_HD1': 'uhd', 'HD1': 'hd', 'SD1': 'sd', 'SD2': 'ld'}
+    room = {
+        'id_str': web_rid, 'status': 2, 'title': f'room {web_rid}',
+        'stream_url': {
+            'flv_pull_url': {k: stream_data['data'][v]['main']['flv'] for k, v in qualities.items()},
+            'hls_pull_url_map': {k: stream_data['data'][v]['main']['hls'] for k, v in qualities.items()},
+            'stream_orientation': 1,
+            'live_core_sdk_data': {'pull_data': {'stream_data': json.dumps(stream_data)}},
+        },
+    }
+    return {'data': {'data': [room], 'user': {'nickname': f'anchor {web_rid}'}, 'similar_rooms': padding},
+            'status_code': 0}
+
+
+def bilibili_room_init(room_id: str) -> dict:
+    return {'code': 0, 'data': {'room_id': int(room_id), 'uid': int(room_id) + 1, 'live_status': 1}}
+
+
+def bilibili_h5_info(room_id: str, padding: list[dict]) -> dict:
+    return {'code': 0, 'data': {
+        'room_info': {'uid': int(room_id) + 1, 'room_id': int(room_id), 'title': f'room {room_id}',
+                      'live_status': 1},
+        'anchor_info': {'base_info': {'uname': f'anchor {room_id}'}},
+        'banner_info': padding,
+    }}
+
+
+def bilibili_play_url(room_id: str) -> dict:
+    durl = [{'url': f'https://cn-gotcha{i:02d}.bilivideo.com/live-bvc/{room_id}/live_{room_id}.flv'
+                    f'?expires=1760003600&qn=10000&sign=0123456789abcdef', 'order': i + 1} for i in range(3)]
+    return {'code': 0, 'data': {'current_qn': 10000, 'durl': durl}}
+
+
+def twitch_gql(body: object, padding: list[dict]) -> object:
+    if isinstance(body, list):
+        channel = body[0]['variables']['channel']
+        return [{'data': {'user': {'displayName': channel, 'stream': {'id': '1'},
+                                   'broadcastSettings': {'title': f'{channel} live'}}},
+                 'extensions': {'padding': padding}}]
+    token = json.dumps({'channel': body['variables']['login'], 'expires': 1760001000})
+    return {'data': {'streamPlaybackAccessToken': {'value': token, 'signature': '0123456789abcdef'}}}
+
+
+def twitch_master_playlist(channel: str) -> str:
+    lines = ['#EXTM3U']
+    for name, bandwidth, resolution in (('1080p60', 8500000, '1920x1080'), ('720p60', 3400000, '1280x720'),
+                                        ('480p30', 1400000, '852x480'), ('160p30', 290000, '284x160')):
+        lines += [f'#EXT-X-MEDIA:TYPE=VIDEO,GROUP-ID="{name}",NAME="{name}",AUTOSELECT=YES,DEFAULT=YES',
+                  f'#EXT-X-STREAM-INF:BANDWIDTH={bandwidth},RESOLUTION={resolution},VIDEO="{name}"',
+                  f'https://video-weaver.hls.ttvnw.net/v1/playlist/{channel}-{name}.m3u8']
+    lines += ['#EXT-X-MEDIA:TYPE=VIDEO,GROUP-ID="audio_only",NAME="audio_only",AUTOSELECT=NO,DEFAULT=NO',
+              '#EXT-X-STREAM-INF:BANDWIDTH=160000,CODECS="mp4a.40.2",VIDEO="audio_only"',
+              f'https://video-weaver.hls.ttvnw.net/v1/playlist/{channel}-audio.m3u8']
+    return '\n'.join(lines) + '\n'
+
+
+MEDIA_PLAYLIST = '#EXTM3U\n#EXT-X-TARGETDURATION:2\n#EXTINF:2.000,\nsegment0.ts\n'
+
+
+class FakePlatformServer:
+    """
+    The fake platform API server.
+
+    Example:
+        >>> server = FakePlatformServer(ServerConfig(latency=20, error_rate=0.01))
+        >>> port = await server.start('127.0.0.1', 0)
+        >>> ...
+        >>> await server.stop()
+    """
+
+    def __init__(self, config: ServerConfig):
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.padding = _padding(int(config.payload_kb * 1024))
+        self.counts: Counter[int] = Counter()
+        self._server: asyncio.AbstractServer | None = None
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> int:
+        """
+        Starts listening and returns the port, which is picked by the system when `port` is 0.
+        """
+        self._server = await asyncio.start_server(self._handle_connection, host, port, backlog=4096)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def route(self, method: str, path: str, query: dict[str, str], body: bytes) -> tuple[int, str, str]:
+        """
+        Returns the status, content type and body of the response to a request.
+        """
+        if path.startswith('/webcast/room/web/enter'):
+            return 200, 'application/json', json.dumps(douyin_room(query.get('web_rid', '0'), self.padding))
+        if path == '/room/v1/Room/room_init':
+            return 200, 'application/json', json.dumps(bilibili_room_init(query.get('id', '0')))
+        if path == '/xlive/web-room/v1/index/getH5InfoByRoom':
+            return 200, 'application/json', json.dumps(bilibili_h5_info(query.get('room_id', '0'), self.padding))
+        if path == '/room/v1/Room/playUrl':
+            return 200, 'application/json', json.dumps(bilibili_play_url(query.get('cid', '0')))
+        if path == '/gql' and method == 'POST':
+            try:
+                payload = json.loads(body)
+            except ValueError:
+                return 400, 'application/json', '{"error":"invalid body"}'
+            return 200, 'application/json', json.dumps(twitch_gql(payload, self.padding))
+        if path.startswith('/api/channel/hls/'):
+            channel = path.rsplit('/', 1)[-1].removesuffix('.m3u8')
+            return 200, 'application/vnd.apple.mpegurl', twitch_master_playlist(channel)
+        if path.endswith(('.m3u8', '.flv')):
+            return 200, 'application/vnd.apple.mpegurl', MEDIA_PLAYLIST
+        return 404, 'text/plain', 'not found'
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get('content-length', 0))
+                body = await reader.readexactly(length) if length else b''
+
+                delay = self.config.latency + self.random.uniform(-self.config.jitter, self.config.jitter)
+                if delay > 0:
+                    await asyncio.sleep(delay / 1000)
+
+                parts = urllib.parse.urlsplit(target)
+                query = dict(urllib.parse.parse_qsl(parts.query))
+                if self.random.random() < self.config.error_rate:
+                    status, content_type, text = 500, 'application/json', '{"error":"injected failure"}'
+                else:
+                    status, content_type, text = self.route(method, parts.path, query, body)
+                self.counts[status] += 1
+
+                payload = text.encode('utf-8')
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                writer.write(
+                    f'HTTP/1.1 {status} {REASONS.get(status, "")}\r\n'
+                    f'Content-Type: {content_type}\r\nContent-Length: {len(payload)}\r\n'
+                    f'Connection: {"keep-alive" if keep_alive else "close"}\r\n\r\n'.encode('latin-1') + payload)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+def add_config_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument('--latency', type=float, default=50.0, help='mean response delay in ms')
+    parser.add_argument('--jitter', type=float, default=20.0, help='uniform delay variation in ms')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of HTTP 500 responses')
+    parser.add_argument('--payload-kb', type=float, default=16.0, help='approximate room data size in KiB')
+    parser.add_argument('--seed', type=int, default=None, help='random seed')
+
+
+def config_from_args(args: argparse.Namespace) -> ServerConfig:
+    return ServerConfig(args.latency, args.jitter, args.error_rate, args.payload_kb, args.seed)
+
+
+async def serve(args: argparse.Namespace) -> None:
+    server = FakePlatformServer(config_from_args(args))
+    port = await server.start(args.host, args.port)
+    # load_test.py reads this line to find the port.
+    print(f'listening on {args.host}:{port}', flush=True)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            # Windows: Ctrl+C still interrupts asyncio.run.
+            pass
+    try:
+        await stop.wait()
+    finally:
+        await server.stop()
+        print(f'responses: {dict(server.counts)}', flush=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765, help='0 picks a free port')
+    add_config_arguments(parser)
+    asyncio.run(serve(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+"""
+Load test of the resolver against fake_platform_server.py.
+
+    python benchmarks/load_test.py [--rooms 10000] [--concurrency 1000] [--latency 50] [--error-rate 0.01]
+    python benchmarks/load_test.py --server 127.0.0.1:8765 --rooms 10000
+
+Rooms are spread over Douyin, Bilibili and Twitch and resolved with BatchResolver. Every request is sent to
+the fake server instead of the real host, over plain HTTP/1.1 on a shared connection pool, so the run
+measures the library (signing, parsing, pooling, scheduling) rather than the platforms. Without --server the
+fake server is started in a separate process with the given latency, error rate and payload size.
+
+Reported: throughput, p50/p99 latency of the lookups (time inside their concurrency slot, and end to end
+including the wait for a slot), errors, and the memory of this process.
+"""
+import argparse
+import asyncio
+import gc
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import httpx
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fake_platform_server import add_config_arguments
+
+from streamget.batch import BatchResolver
+from streamget.requests.client_pool import ClientPool, set_client_pool
+
+PLATFORMS = {
+    'douyin': ('DouyinLiveStream', 'https://live.douyin.com/{}'),
+    'bilibili': ('BilibiliLiveStream', 'https://live.bilibili.com/{}'),
+    'twitch': ('TwitchLiveStream', 'https://www.twitch.tv/channel{}'),
+}
+
+
+class LocalRedirectTransport(httpx.AsyncBaseTransport):
+    """
+    Sends every request to the fake server, keeping its path, query and body.
+    """
+
+    def __init__(self, host: str, port: int, max_connections: int):
+        self.host = host
+        self.port = port
+        limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        self._inner = httpx.AsyncHTTPTransport(limits=limits)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        request.url = request.url.copy_with(scheme='http', host=self.host, port=self.port)
+        return await self._inner.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+def start_server(args: argparse.Namespace) -> tuple[subprocess.Popen, str, int]:
+    command = [sys.executable, str(Path(__file__).with_name('fake_platform_server.py')), '--port', '0',
+               '--latency', str(args.latency), '--jitter', str(args.jitter), '--error-rate', str(args.error_rate),
+               '--payload-kb', str(args.payload_kb)]
+    if args.seed is not None:
+        command += ['--seed', str(args.seed)]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    if not line.startswith('listening on '):
+        process.kill()
+        raise RuntimeError(f'The fake server did not start: {line!r}')
+    host, port = line.removeprefix('listening on ').strip().rsplit(':', 1)
+    return process, host, int(port)
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return float('nan')
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def max_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # KiB on Linux, bytes on macOS.
+    return rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+
+
+async def run(args: argparse.Namespace, host: str, port: int) -> None:
+    platforms = [PLATFORMS[name] for name in args.platforms]
+    items = [(platforms[i % len(platforms)][0], platforms[i % len(platforms)][1].format(100000 + i), 'OD')
+             for i in range(args.rooms)]
+
+    pool = ClientPool(transport=LocalRedirectTransport(host, port, args.connections))
+    set_client_pool(pool)
+    resolver = BatchResolver(max_concurrency=args.concurrency, per_platform_concurrency=args.concurrency)
+
+    service: list[float] = []
+    for name, _ in platforms:
+        instance = resolver.get_instance(name)
+        fetch_stream = instance.fetch_stream
+
+        async def timed(url, quality=None, fetch_stream=fetch_stream):
+            start = time.perf_counter()
+            try:
+                return await fetch_stream(url, quality)
+            finally:
+                service.append(time.perf_counter() - start)
+
+        instance.fetch_stream = timed
+
+    if args.tracemalloc:
+        tracemalloc.start()
+    gc.collect()
+    rss_before = max_rss_mb()
+
+    end_to_end: list[float] = []
+    errors: dict[str, int] = {}
+    offline = 0
+    start = time.perf_counter()
+    async for result in resolver.resolve_many(items):
+        end_to_end.append(time.perf_counter() - start)
+        if not result.ok:
+            name = type(result.error).__name__
+            errors[name] = errors.get(name, 0) + 1
+        elif not result.stream.is_live:
+            offline += 1
+    elapsed = time.perf_counter() - start
+
+    peak = tracemalloc.get_traced_memory()[1] if args.tracemalloc else None
+    if args.tracemalloc:
+        tracemalloc.stop()
+    await pool.aclose()
+
+    print(f'rooms              {args.rooms} ({", ".join(args.platforms)}), concurrency {args.concurrency}, '
+          f'connections {args.connections}')
+    print(f'elapsed            {elapsed:.2f} s')
+    print(f'throughput         {args.rooms / elapsed:.1f} rooms/s')
+    print(f'lookup p50/p99     {statistics.median(service) * 1000:.1f} / {percentile(service, 0.99) * 1000:.1f} ms')
+    print(f'end-to-end p50/p99 {statistics.median(end_to_end):.2f} / {percentile(end_to_end, 0.99):.2f} s')
+    print(f'errors             {sum(errors.values())} {errors or ""}')
+    print(f'not live           {offline}')
+    rss_after = max_rss_mb()
+    if rss_after is not None:
+        print(f'max RSS            {rss_after:.1f} MB (+{rss_after - rss_before:.1f} MB during the run)')
+    if peak is not None:
+        print(f'traced peak        {peak / (1024 * 1024):.1f} MB')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rooms', type=int, default=10000, help='number of rooms to resolve')
+    parser.add_argument('--concurrency', type=int, default=1000, help='rooms resolved at the same time')
+    parser.add_argument('--connections', type=int, default=100,
+                        help='connections to the fake server (default: the ClientPool default)')
+    parser.add_argument('--platforms', nargs='+', choices=sorted(PLATFORMS), default=sorted(PLATFORMS))
+    parser.add_argument('--server', help='host:port of a running fake server (default: start one)')
+    parser.add_argument('--tracemalloc', action='store_true', help='also report the traced peak (slower)')
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    process = None
+    if args.server:
+        host, port = args.server.rsplit(':', 1)
+        port = int(port)
+    else:
+        process, host, port = start_server(args)
+    try:
+        asyncio.run(run(args, host, port))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""
+Offline benchmark of the platform parsers: fetch_web_stream_data + fetch_stream_url replayed from cassettes.
+
+    python benchmarks/platform_bench.py [-n 200] [-p huya -p douyin] [--save baseline.json]
+    python benchmarks/platform_bench.py --baseline baseline.json [--tolerance 0.25]
+
+Every response comes from benchmarks/fixtures/*.json (see record_fixtures.py), so the timings only contain
+request building, signing, parsing and result building. With --baseline the script exits with status 1 when
+a platform is slower than the saved run by more than the tolerance.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from streamget.platforms import load_platform
+from streamget.requests.client_pool import ClientPool, set_client_pool
+from streamget.requests.replay import RecordReplayTransport
+
+FIXTURES = Path(__file__).resolve().parent / 'fixtures'
+
+
+async def run_once(transport: RecordReplayTransport) -> tuple[float, float, object]:
+    metadata = transport.metadata
+    transport.rewind()
+    live_stream = load_platform(metadata['platform'])()
+    start = time.perf_counter()
+    json_data = await getattr(live_stream, metadata.get('method', 'fetch_web_stream_data'))(metadata['url'])
+    middle = time.perf_counter()
+    stream = await live_stream.fetch_stream_url(json_data, metadata.get('video_quality'))
+    return middle - start, time.perf_counter() - middle, stream
+
+
+async def bench(path: Path, number: int) -> dict:
+    transport = RecordReplayTransport(path)
+    pool = ClientPool(transport=transport)
+    set_client_pool(pool)
+    try:
+        # The first run imports the module and fills the class-level caches; it is checked, not timed.
+        _, _, stream = await run_once(transport)
+        if transport.misses:
+            raise RuntimeError(f'{path.name}: no recorded response for {transport.misses[0]}')
+        if not stream.is_live or not stream.record_url:
+            raise RuntimeError(f'{path.name}: the replayed lookup returned no stream URL')
+
+        web, build = [], []
+        for _ in range(number):
+            web_time, build_time, _ = await run_once(transport)
+            web.append(web_time)
+            build.append(build_time)
+    finally:
+        await pool.aclose()
+
+    total = [a + b for a, b in zip(web, build)]
+    return {
+        'platform': transport.metadata['platform'],
+        'requests': len(transport.interactions),
+        'web_ms': statistics.median(web) * 1000,
+        'build_ms': statistics.median(build) * 1000,
+        'p50_ms': statistics.median(total) * 1000,
+        'p99_ms': sorted(total)[min(len(total) - 1, int(len(total) * 0.99))] * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-n', '--number', type=int, default=200, help='lookups per platform')
+    parser.add_argument('-p', '--fixture', action='append', help='fixture name, e.g. "douyin" (default: all)')
+    parser.add_argument('--save', type=Path, help='write the results as JSON')
+    parser.add_argument('--baseline', type=Path, help='compare the p50 times with a saved run')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed slowdown against the baseline')
+    args = parser.parse_args()
+
+    paths = sorted(FIXTURES.glob('*.json'))
+    if args.fixture:
+        paths = [path for path in paths if path.stem in args.fixture]
+
+    results = {}
+    print(f'{"fixture":<12} {"platform":<22} {"req":>4} {"web ms":>8} {"build ms":>9} {"p50 ms":>8} {"p99 ms":>8}')
+    for path in paths:
+        result = results[path.stem] = asyncio.run(bench(path, args.number))
+        print(f'{path.stem:<12} {result["platform"]:<22} {result["requests"]:>4} {result["web_ms"]:>8.3f} '
+              f'{result["build_ms"]:>9.3f} {result["p50_ms"]:>8.3f} {result["p99_ms"]:>8.3f}')
+
+    if args.save:
+        args.save.write_text(json.dumps(results, indent=2) + '\n', encoding='utf-8')
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+        regressions = [
+            f'{name}: {result["p50_ms"]:.3f} ms vs {baseline[name]["p50_ms"]:.3f} ms'
+            for name, result in results.items()
+            if name in baseline and result['p50_ms'] > baseline[name]['p50_ms'] * (1 + args.tolerance)
+        ]
+        for line in regressions:
+            print(f'REGRESSION {line}')
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Records the HTTP traffic of one platform lookup into a cassette for platform_bench.py.
+
+    python benchmarks/record_fixtures.py BilibiliLiveStream https://live.bilibili.com/22603245 \
+        -o benchmarks/fixtures/bilibili.json [--quality OD] [--proxy http://127.0.0.1:7890]
+
+fetch_web_stream_data (or the room data method given with --method, e.g. _get_app_web_stream_data for a
+Douyin app page) and fetch_stream_url are run once against the live site. Cookies, credentials and
+signature parameters are redacted before the cassette is written; check the file for other personal data
+before committing it.
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from streamget.platforms import PLATFORM_MODULES, load_platform
+from streamget.requests.client_pool import ClientPool, set_client_pool
+from streamget.requests.replay import RecordReplayTransport
+
+
+async def lookup(platform: str, url: str, quality: str | None, method: str = 'fetch_web_stream_data'):
+    live_stream = load_platform(platform)()
+    json_data = await getattr(live_stream, method)(url)
+    return await live_stream.fetch_stream_url(json_data, quality)
+
+
+async def record(args: argparse.Namespace) -> None:
+    inner = httpx.AsyncHTTPTransport(http2=True, verify=False, proxy=args.proxy)
+    metadata = {'platform': args.platform, 'url': args.url, 'video_quality': args.quality, 'method': args.method}
+    transport = RecordReplayTransport(mode='record', inner=inner, metadata=metadata)
+    pool = ClientPool(transport=transport)
+    set_client_pool(pool)
+    try:
+        stream = await lookup(args.platform, args.url, args.quality, args.method)
+    finally:
+        await pool.aclose()
+    transport.save(args.output)
+    print(stream.to_json(indent=2))
+    print(f'{len(transport.interactions)} responses written to {args.output}')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('platform', choices=sorted(PLATFORM_MODULES), help='platform class name')
+    parser.add_argument('url', help='room URL')
+    parser.add_argument('-o', '--output', type=Path, required=True, help='cassette file')
+    parser.add_argument('--quality', default='OD', help='video quality passed to fetch_stream_url')
+    parser.add_argument('--method', default='fetch_web_stream_data', help='method that fetches the room data')
+    parser.add_argument('--proxy', default=None, help='proxy used for the recording')
+    asyncio.run(record(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Memory and serialization benchmark for StreamData.
+
+    python benchmarks/stream_data_bench.py [-n 100000]
+"""
+import argparse
+import json
+import sys
+import timeit
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from streamget.data import StreamData, orjson, wrap_stream
+
+SAMPLE = {
+    'platform': '抖音',
+    'anchor_name': 'StreamerName',
+    'is_live': True,
+    'title': 'Live Title',
+    'quality': 'OD',
+    'm3u8_url': 'https://pull-hls-f1.douyincdn.com/stage/stream-1234567890_or4.m3u8?expire=1700000000&sign=abcdef',
+    'flv_url': 'https://pull-flv-f1.douyincdn.com/stage/stream-1234567890_or4.flv?expire=1700000000&sign=abcdef',
+    'record_url': 'https://pull-hls-f1.douyincdn.com/stage/stream-1234567890_or4.m3u8?expire=1700000000&sign=abcdef',
+    'extra': {'backup_url_list': []},
+    'live_url': 'https://live.douyin.com/745964462470',
+}
+
+
+def measure_memory(n: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    items = [wrap_stream(SAMPLE) for _ in range(n)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    del items
+    return size / n
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-n', '--number', type=int, default=100000, help='instances / calls per measurement')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='number of measurements')
+    args = parser.parse_args()
+
+    print(f'orjson installed: {orjson is not None}')
+    print(f'{"memory per instance":<30} {measure_memory(args.number):10.1f} bytes')
+
+    stream = StreamData.from_dict(SAMPLE)
+    cases = {
+        'wrap_stream': lambda: wrap_stream(SAMPLE),
+        'to_json': stream.to_json,
+        'to_bytes': stream.to_bytes,
+        'json.dumps(indent=4)': lambda: json.dumps(stream.to_dict(), ensure_ascii=False, indent=4),
+        'freeze': stream.freeze,
+    }
+    for name, func in cases.items():
+        best = min(timeit.repeat(func, number=args.number, repeat=args.repeat)) / args.number
+        print(f'{name:<30} {best * 1e6:10.2f} us/call')
+
+
+if __name__ == '__main__':
+    main()
@@ -144,7 +144,7 @@ class StreamFetcher:
         url = url_template.format(room_id=room_id)
         web_data = await instance.fetch_web_stream_data(url)
         stream_obj = await instance.fetch_stream_url(web_data, "OD")
-        return stream_obj.to_json()
+        return stream_obj.to_json(indent=4)
 
 
 class OutputFormatter:
@@ -29,6 +29,10 @@ setup(
         'httpx[http2]>=0.28.1',
         'PyExecJS>=1.5.1',
     ],
+    extras_require={
+        'fast': ['orjson>=3.9.0'],
+        'arrow': ['pyarrow>=14.0.0'],
+    },
     classifiers=[
         'Development Status :: 3 - Alpha',
         'Intended Audience :: Developers',
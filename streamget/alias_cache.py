@@ -0,0 +1,245 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+from .requests.single_flight import SingleFlight
+
+DEFAULT_TTL = 30 * 24 * 3600
+
+
+def default_cache_path() -> Path:
+    """
+    Returns the default location of the alias database.
+
+    The directory is taken from the STREAMGET_CACHE_DIR environment variable, then XDG_CACHE_HOME/streamget,
+    then ~/.cache/streamget.
+    """
+    cache_dir = os.environ.get('STREAMGET_CACHE_DIR')
+    if not cache_dir:
+        cache_dir = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'streamget'
+    return Path(cache_dir) / 'aliases.sqlite3'
+
+
+class AliasCache:
+    """
+    A cache of vanity names and short URLs resolved to canonical room ids.
+
+    Mappings are kept in a small in-memory LRU and, when a database path is given, in an SQLite database
+    shared by every process that uses the same file, so a room id resolved once is reused by later polls
+    and by other workers until its TTL expires. Database calls run in a worker thread, so a busy database
+    never blocks the event loop. The cache never breaks a lookup: if the database cannot be opened or
+    written, it keeps working from memory only. Values must be JSON-serializable.
+
+    Example:
+        >>> cache = AliasCache(default_cache_path(), ttl=7 * 24 * 3600)
+        >>> room_id = await cache.resolve('huya', 'lpl', lambda: scrape_room_id('https://www.huya.com/lpl'))
+    """
+
+    def __init__(self, path: str | Path | None = None, ttl: float = DEFAULT_TTL, memory_size: int = 4096):
+        """
+        Initializes a new alias cache. The database is opened on first use.
+
+        Args:
+            path (str | Path | None): The SQLite database file, e.g. `default_cache_path()`. Defaults to None
+                (the mappings are kept in this process only).
+            ttl (float): Seconds a mapping is kept. Defaults to 30 days.
+            memory_size (int): Maximum number of mappings kept in memory. Defaults to 4096.
+        """
+        self.path = str(path) if path else None
+        self.ttl = ttl
+        self.memory_size = memory_size
+        self._memory: OrderedDict[tuple[str, str], tuple[Any, float]] = OrderedDict()
+        self._conn: sqlite3.Connection | None = None
+        self._disabled = self.path is None
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+
+    def _connect(self) -> sqlite3.Connection | None:
+        if self._conn is None and not self._disabled:
+            try:
+                if self.path != ':memory:':
+                    Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute(
+                    'CREATE TABLE IF NOT EXISTS aliases ('
+                    'namespace TEXT NOT NULL, alias TEXT NOT NULL, value TEXT NOT NULL, expires REAL NOT NULL, '
+                    'PRIMARY KEY (namespace, alias))'
+                )
+                self._conn = conn
+            except (sqlite3.Error, OSError):
+                self._disabled = True
+        return self._conn
+
+    def _execute(self, sql: str, params: tuple = ()) -> list[tuple]:
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return []
+            try:
+                return conn.execute(sql, params).fetchall()
+            except sqlite3.Error:
+                return []
+
+    async def _run(self, sql: str, params: tuple = ()) -> list[tuple]:
+        # sqlite3 blocks, for up to the busy timeout while another process writes, so it runs off the loop.
+        if self._disabled:
+            return []
+        return await asyncio.to_thread(self._execute, sql, params)
+
+    def _remember(self, key: tuple[str, str], value: Any, expires: float) -> None:
+        self._memory[key] = (value, expires)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    async def get(self, namespace: str, alias: str) -> Any | None:
+        """
+        Returns the cached id for an alias.
+
+        Args:
+            namespace (str): The kind of mapping, usually the platform (e.g. "huya").
+            alias (str): The vanity name or URL.
+
+        Returns:
+            Any | None: The cached value, or None if it is missing or expired.
+        """
+        key = (namespace, alias)
+        now = time.time()
+        cached = self._memory.get(key)
+        if cached is not None:
+            if cached[1] > now:
+                self._memory.move_to_end(key)
+                return cached[0]
+            del self._memory[key]
+
+        rows = await self._run(
+            'SELECT value, expires FROM aliases WHERE namespace = ? AND alias = ? AND expires > ?',
+            (namespace, alias, now))
+        if not rows:
+            return None
+        try:
+            value = json.loads(rows[0][0])
+        except ValueError:
+            return None
+        self._remember(key, value, rows[0][1])
+        return value
+
+    async def set(self, namespace: str, alias: str, value: Any, ttl: float | None = None) -> None:
+        """
+        Stores the id of an alias.
+
+        Args:
+            namespace (str): The kind of mapping, usually the platform (e.g. "huya").
+            alias (str): The vanity name or URL.
+            value (Any): The JSON-serializable id.
+            ttl (float | None): Seconds the mapping is kept. Defaults to the cache TTL.
+        """
+        expires = time.time() + (self.ttl if ttl is None else ttl)
+        self._remember((namespace, alias), value, expires)
+        await self._run(
+            'INSERT OR REPLACE INTO aliases (namespace, alias, value, expires) VALUES (?, ?, ?, ?)',
+            (namespace, alias, json.dumps(value, ensure_ascii=False), expires))
+
+    async def delete(self, namespace: str, alias: str) -> None:
+        """
+        Removes the mapping of an alias, e.g. after the cached id turned out to be wrong.
+        """
+        self._memory.pop((namespace, alias), None)
+        await self._run('DELETE FROM aliases WHERE namespace = ? AND alias = ?', (namespace, alias))
+
+    async def clear(self) -> None:
+        """
+        Removes every mapping.
+        """
+        self._memory.clear()
+        await self._run('DELETE FROM aliases')
+
+    def close(self) -> None:
+        """
+        Closes the database connection. The cache reopens it if it is used again.
+        """
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    async def resolve(
+            self,
+            namespace: str,
+            alias: str,
+            fetch: Callable[[], Awaitable[Any]],
+            ttl: float | None = None
+    ) -> Any:
+        """
+        Returns the cached id for an alias, or resolves it with `fetch` and caches it.
+
+        Concurrent lookups of the same alias share one `fetch`. Exceptions and None results are not cached.
+
+        Args:
+            namespace (str): The kind of mapping, usually the platform (e.g. "huya").
+            alias (str): The vanity name or URL.
+            fetch (Callable[[], Awaitable[Any]]): Resolves the alias over the network.
+            ttl (float | None): Seconds the mapping is kept. Defaults to the cache TTL.
+
+        Returns:
+            Any: The id.
+        """
+        value = await self.get(namespace, alias)
+        if value is not None:
+            return value
+
+        async def fetch_and_store() -> Any:
+            result = await fetch()
+            if result is not None:
+                await self.set(namespace, alias, result, ttl)
+            return result
+
+        return await self._flight.do((namespace, alias), fetch_and_store)
+
+
+class _DisabledAliasCache(AliasCache):
+    async def get(self, namespace: str, alias: str) -> Any | None:
+        return None
+
+    async def set(self, namespace: str, alias: str, value: Any, ttl: float | None = None) -> None:
+        pass
+
+
+_default_cache: AliasCache | None = None
+
+
+def get_alias_cache() -> AliasCache:
+    """
+    Returns the process-wide alias cache used by the platform classes.
+
+    By default the mappings are kept in memory only. Setting the STREAMGET_ALIAS_CACHE environment variable
+    to "1" also stores them in the database at `default_cache_path()`, and "0" disables the cache.
+    """
+    global _default_cache
+    if _default_cache is None:
+        setting = os.environ.get('STREAMGET_ALIAS_CACHE')
+        if setting == '0':
+            _default_cache = _DisabledAliasCache()
+        elif setting == '1':
+            _default_cache = AliasCache(default_cache_path())
+        else:
+            _default_cache = AliasCache()
+    return _default_cache
+
+
+def set_alias_cache(cache: AliasCache | None) -> None:
+    """
+    Replaces the process-wide alias cache, e.g. to store it in a database or change the TTL.
+
+    Passing None disables caching of aliases.
+    """
+    global _default_cache
+    _default_cache = cache if cache is not None else _DisabledAliasCache()
@@ -0,0 +1,214 @@
+import asyncio
+import importlib
+import weakref
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass
+from typing import Any, Union
+
+from .data import StreamData
+from .platforms.base import BaseLiveStream
+
+PlatformSpec = Union[str, type[BaseLiveStream], BaseLiveStream]
+
+
+@dataclass
+class BatchItem:
+    """
+    A single room to resolve.
+
+    Attributes:
+        platform (str | type[BaseLiveStream] | BaseLiveStream): The platform class, its name
+            (e.g. "HuyaLiveStream") or a configured instance to use for this room.
+        url (str): The room URL.
+        quality (str | int | None): The requested video quality. Defaults to None (original quality).
+    """
+    platform: PlatformSpec
+    url: str
+    quality: str | int | None = None
+
+
+@dataclass
+class BatchResult:
+    """
+    The outcome of resolving one `BatchItem`.
+
+    Attributes:
+        item (BatchItem): The item that was resolved.
+        stream (StreamData | None): The resolved stream, or None if resolving failed.
+        error (BaseException | None): The exception raised while resolving, if any.
+    """
+    item: BatchItem
+    stream: StreamData | None = None
+    error: BaseException | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class BatchResolver:
+    """
+    Resolves many live rooms concurrently with bounded parallelism.
+
+    Items are fanned out under a global concurrency limit and a per-platform limit, so one slow or
+    rate-limited platform cannot take every slot. One platform instance is created per class and shared
+    by all of its rooms, and every request goes through the shared HTTP client pool.
+
+    Example:
+        >>> async def main():
+        ...     resolver = BatchResolver(max_concurrency=100, per_platform_concurrency=20)
+        ...     items = [
+        ...         ('HuyaLiveStream', 'https://www.huya.com/52333', 'OD'),
+        ...         (BilibiliLiveStream, 'https://live.bilibili.com/22603245', None),
+        ...     ]
+        ...     async for result in resolver.resolve_many(items):
+        ...         print(result.item.url, result.stream.is_live if result.ok else result.error)
+        >>> asyncio.run(main())
+    """
+
+    def __init__(
+            self,
+            max_concurrency: int = 50,
+            per_platform_concurrency: int = 10,
+            platform_concurrency: dict[str, int] | None = None,
+            proxy_addr: str | None = None,
+            cookies: str | None = None,
+    ):
+        """
+        Initializes a new batch resolver.
+
+        Args:
+            max_concurrency (int): Maximum number of rooms resolved at the same time. Defaults to 50.
+            per_platform_concurrency (int): Maximum number of rooms of one platform resolved at the same time.
+                Defaults to 10.
+            platform_concurrency (dict[str, int] | None): Per-platform overrides of `per_platform_concurrency`,
+                keyed by class name (e.g. {"DouyinLiveStream": 5}). Defaults to None.
+            proxy_addr (str | None): The proxy address used by the platform instances created by the resolver.
+                Defaults to None.
+            cookies (str | None): The cookies used by the platform instances created by the resolver.
+                Defaults to None.
+        """
+        self.max_concurrency = max_concurrency
+        self.per_platform_concurrency = per_platform_concurrency
+        self.platform_concurrency = platform_concurrency or {}
+        self.proxy_addr = proxy_addr
+        self.cookies = cookies
+        self._instances: dict[type[BaseLiveStream], BaseLiveStream] = {}
+        self._limits: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str | None, asyncio.Semaphore]] = \
+            weakref.WeakKeyDictionary()
+
+    @staticmethod
+    def _load_class(name: str) -> type[BaseLiveStream]:
+        package = importlib.import_module(__package__)
+        cls = getattr(package, name, None)
+        if not (isinstance(cls, type) and issubclass(cls, BaseLiveStream)):
+            raise ValueError(f'Unsupported platform: {name}')
+        return cls
+
+    def get_instance(self, platform: PlatformSpec) -> BaseLiveStream:
+        """
+        Returns the platform instance used for `platform`, creating it on first use.
+
+        Args:
+            platform (str | type[BaseLiveStream] | BaseLiveStream): The platform class, its name or an instance.
+
+        Returns:
+            BaseLiveStream: The shared instance for this platform class, or `platform` itself if it is
+                already an instance.
+        """
+        if isinstance(platform, BaseLiveStream):
+            return platform
+        cls = self._load_class(platform) if isinstance(platform, str) else platform
+        instance = self._instances.get(cls)
+        if instance is None:
+            instance = self._instances[cls] = cls(proxy_addr=self.proxy_addr, cookies=self.cookies)
+        return instance
+
+    def get_limit(self, name: str | None = None) -> asyncio.Semaphore:
+        """
+        Returns the semaphore limiting concurrent work on the running event loop.
+
+        Args:
+            name (str | None): A platform class name for its per-platform limit, or None for the global limit.
+
+        Returns:
+            asyncio.Semaphore: The semaphore to hold while resolving a room.
+        """
+        limits = self._limits.setdefault(asyncio.get_running_loop(), {})
+        semaphore = limits.get(name)
+        if semaphore is None:
+            if name is None:
+                limit = self.max_concurrency
+            else:
+                limit = self.platform_concurrency.get(name, self.per_platform_concurrency)
+            semaphore = limits[name] = asyncio.Semaphore(limit)
+        return semaphore
+
+    async def resolve(self, item: BatchItem | tuple) -> BatchResult:
+        """
+        Resolves a single room, waiting for a free global and per-platform slot first.
+
+        Exceptions raised by the platform are captured in the returned result instead of being raised.
+
+        Args:
+            item (BatchItem | tuple): The room to resolve, or a (platform, url[, quality]) tuple.
+
+        Returns:
+            BatchResult: The resolved stream or the error.
+        """
+        if not isinstance(item, BatchItem):
+            item = BatchItem(*item)
+
+        try:
+            instance = self.get_instance(item.platform)
+            async with self.get_limit(), self.get_limit(type(instance).__name__):
+                stream = await instance.fetch_stream(item.url, item.quality)
+            return BatchResult(item=item, stream=stream)
+        except Exception as e:
+            return BatchResult(item=item, error=e)
+
+    async def resolve_many(self, items: Iterable[BatchItem | tuple]) -> AsyncIterator[BatchResult]:
+        """
+        Resolves many rooms concurrently and yields each result as soon as it is ready.
+
+        Results are yielded in completion order, not input order. Leaving the loop early cancels the
+        rooms that are still being resolved.
+
+        Args:
+            items (Iterable[BatchItem | tuple]): The rooms to resolve, as `BatchItem` objects or
+                (platform, url[, quality]) tuples.
+
+        Yields:
+            BatchResult: The result for each item.
+        """
+        pending = {asyncio.ensure_future(self.resolve(item)) for item in items}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def resolve_many(
+        items: Iterable[BatchItem | tuple],
+        max_concurrency: int = 50,
+        per_platform_concurrency: int = 10,
+        **kwargs: Any
+) -> AsyncIterator[BatchResult]:
+    """
+    Resolves many rooms concurrently with a new `BatchResolver`.
+
+    See `BatchResolver.resolve_many` for details; extra keyword arguments are passed to `BatchResolver`.
+
+    Example:
+        >>> async for result in resolve_many([('HuyaLiveStream', 'https://www.huya.com/52333')]):
+        ...     print(result.stream)
+    """
+    resolver = BatchResolver(max_concurrency, per_platform_concurrency, **kwargs)
+    async for result in resolver.resolve_many(items):
+        yield result
@@ -0,0 +1,235 @@
+import copy
+import sys
+import time
+import urllib.parse
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+from .requests.single_flight import SingleFlight
+
+# (platform, canonical room, quality, proxy address, cookies)
+CacheKey = tuple[str, str, str | None, str | None, str | None]
+
+
+@dataclass
+class CacheStats:
+    """
+    Counters of a `ResultCache`.
+
+    Attributes:
+        hits (int): Lookups answered with a fresh entry.
+        stale_hits (int): Lookups answered with a stale entry while it was being refreshed.
+        misses (int): Lookups that had to wait for a fetch.
+        coalesced (int): Lookups that joined a fetch already in flight instead of starting their own.
+        evictions (int): Entries dropped to stay within the entry or memory limits.
+        entries (int): Number of cached entries.
+        size (int): Estimated memory used by the cached values, in bytes.
+    """
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    evictions: int = 0
+    entries: int = 0
+    size: int = 0
+
+
+@dataclass
+class _Entry:
+    value: Any
+    expires: float
+    stale_until: float
+    size: int
+
+
+def canonical_room_url(url: str) -> str:
+    """
+    Normalizes a room URL so that equivalent spellings share a cache entry.
+
+    The scheme and host are lower-cased, a leading "www." is dropped, the fragment and trailing slash are
+    removed, and the query parameters are sorted. The query is kept because several platforms identify the
+    room by it (e.g. YouTube "?v=", Baidu "?room_id=").
+
+    Args:
+        url (str): The room URL.
+
+    Returns:
+        str: The canonical URL, e.g. "huya.com/52333" or "youtube.com/watch?v=abc".
+    """
+    parsed = urllib.parse.urlsplit(url.strip())
+    host = parsed.netloc.lower().removeprefix('www.')
+    key = host + parsed.path.rstrip('/')
+    if parsed.query:
+        query = sorted(urllib.parse.parse_qsl(parsed.query, keep_blank_values=True))
+        key += '?' + urllib.parse.urlencode(query)
+    return key
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Estimates the memory used by a cached value, following dicts, lists, tuples and object attributes
+    (including those stored in `__slots__`).
+
+    Args:
+        value (Any): The value.
+
+    Returns:
+        int: The estimated size in bytes.
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    elif isinstance(value, list | tuple | set):
+        size += sum(estimate_size(item) for item in value)
+    elif hasattr(value, '__dict__'):
+        size += estimate_size(vars(value))
+    elif hasattr(value, '__slots__'):
+        for cls in type(value).__mro__:
+            for name in cls.__dict__.get('__slots__', ()):
+                size += estimate_size(getattr(value, name, None))
+    return size
+
+
+class ResultCache:
+    """
+    An in-memory cache for resolved streams with TTL, stale-while-revalidate and single-flight fetching.
+
+    Entries are fresh for `ttl` seconds (or the per-platform TTL), and may then be served stale for up to
+    `stale_ttl` more seconds while a single background refresh runs. Concurrent lookups of a key that is
+    not cached share one fetch. The least recently used entries are evicted once `max_entries` or
+    `max_bytes` is exceeded. Failed fetches are never cached.
+
+    Example:
+        >>> BaseLiveStream.result_cache = ResultCache(ttl=10, platform_ttl={'DouyinLiveStream': 5})
+        >>> stream = await DouyinLiveStream().fetch_stream('https://live.douyin.com/745964462470', 'OD')
+    """
+
+    def __init__(
+            self,
+            ttl: float = 10,
+            stale_ttl: float = 30,
+            platform_ttl: dict[str, float] | None = None,
+            max_entries: int = 4096,
+            max_bytes: int = 32 * 1024 * 1024,
+    ):
+        """
+        Initializes a new result cache.
+
+        Args:
+            ttl (float): Seconds an entry is fresh. Defaults to 10.
+            stale_ttl (float): Seconds an expired entry may still be served while it is refreshed. Defaults to 30.
+            platform_ttl (dict[str, float] | None): Per-platform overrides of `ttl`, keyed by class name
+                (e.g. {"DouyinLiveStream": 5}). Defaults to None.
+            max_entries (int): Maximum number of entries. Defaults to 4096.
+            max_bytes (int): Maximum estimated memory used by the cached values. Defaults to 32 MiB.
+        """
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.platform_ttl = platform_ttl or {}
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[CacheKey, _Entry] = OrderedDict()
+        self._size = 0
+        self._stats = CacheStats()
+        self._flight = SingleFlight()
+
+    def get_ttl(self, platform: str) -> float:
+        """
+        Returns the TTL used for a platform.
+
+        Args:
+            platform (str): The platform class name.
+
+        Returns:
+            float: The TTL in seconds.
+        """
+        return self.platform_ttl.get(platform, self.ttl)
+
+    async def get_or_fetch(self, key: CacheKey, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Returns the cached value for `key`, fetching it if it is missing or expired.
+
+        Args:
+            key (CacheKey): The (platform, canonical room, quality, proxy address, cookies) key.
+            fetch (Callable[[], Awaitable[Any]]): Produces a new value for the key.
+
+        Returns:
+            Any: A deep copy of the cached value, so callers can modify it without changing the cache.
+        """
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None:
+            if now < entry.expires:
+                self._stats.hits += 1
+                self._entries.move_to_end(key)
+                return copy.deepcopy(entry.value)
+            if now < entry.stale_until:
+                self._stats.stale_hits += 1
+                self._entries.move_to_end(key)
+                self._flight.start(key, lambda: self._fetch(key, fetch))
+                return copy.deepcopy(entry.value)
+
+        if self._flight.in_flight(key):
+            self._stats.coalesced += 1
+        else:
+            self._stats.misses += 1
+        return copy.deepcopy(await self._flight.do(key, lambda: self._fetch(key, fetch)))
+
+    async def _fetch(self, key: CacheKey, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        value = await fetch()
+        self.set(key, value)
+        return value
+
+    def set(self, key: CacheKey, value: Any) -> None:
+        """
+        Stores a value, replacing any previous entry for the key.
+
+        Args:
+            key (CacheKey): The (platform, canonical room, quality, proxy address, cookies) key.
+            value (Any): The value to cache.
+        """
+        self.invalidate(key)
+        ttl = self.get_ttl(key[0])
+        now = time.monotonic()
+        entry = _Entry(value=value, expires=now + ttl, stale_until=now + ttl + self.stale_ttl,
+                       size=estimate_size(value))
+        self._entries[key] = entry
+        self._size += entry.size
+        while self._entries and (len(self._entries) > self.max_entries or self._size > self.max_bytes):
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= evicted.size
+            self._stats.evictions += 1
+
+    def invalidate(self, key: CacheKey) -> None:
+        """
+        Drops the entry for a key, if any.
+
+        Args:
+            key (CacheKey): The (platform, canonical room, quality, proxy address, cookies) key.
+        """
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry.size
+
+    def clear(self) -> None:
+        """
+        Drops every entry.
+        """
+        self._entries.clear()
+        self._size = 0
+
+    def stats(self) -> CacheStats:
+        """
+        Returns a snapshot of the cache counters.
+        """
+        return CacheStats(
+            hits=self._stats.hits,
+            stale_hits=self._stats.stale_hits,
+            misses=self._stats.misses,
+            coalesced=self._stats.coalesced,
+            evictions=self._stats.evictions,
+            entries=len(self._entries),
+            size=self._size
+        )
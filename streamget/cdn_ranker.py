@@ -0,0 +1,215 @@
+import asyncio
+import time
+import urllib.parse
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from .requests.single_flight import SingleFlight
+from .verifier import StreamVerifier
+
+
+@dataclass
+class CdnScore:
+    """
+    The measured latency of a CDN.
+
+    Attributes:
+        latency (float): The smoothed time to first byte, in seconds. Failed probes count as the ranker timeout.
+        samples (int): Number of probes the score is based on.
+        failures (int): Number of consecutive failed probes.
+        updated_at (float): Monotonic time of the last probe.
+    """
+    latency: float
+    samples: int = 0
+    failures: int = 0
+    updated_at: float = 0.0
+
+
+def cdn_key(url: str) -> str:
+    """
+    Returns the key under which the latency of a stream URL is recorded: its host name.
+
+    Args:
+        url (str): The stream URL.
+
+    Returns:
+        str: The lower-cased host, e.g. "tx.flv.huya.com".
+    """
+    return urllib.parse.urlsplit(url).netloc.lower()
+
+
+class CdnRanker:
+    """
+    Orders stream URLs by the measured time to first byte of their CDN.
+
+    The first time a CDN is seen, one of its URLs is requested and the time until the response headers
+    arrive is recorded; all unknown CDNs are probed concurrently under a single deadline. Scores are
+    smoothed with an exponentially weighted moving average whose history loses half its weight every
+    `half_life` seconds, and are measured again once they are older than `max_age`, so a CDN that slows
+    down drops in the ranking. Concurrent rankings share the probes of the same CDN, which keeps the number
+    of probes per CDN constant however many rooms are resolved at once.
+
+    Example:
+        >>> ranker = CdnRanker(max_age=300)
+        >>> urls = await ranker.rank([tx_url, al_url, hs_url])  # fastest CDN first
+        >>> ranker.scores()
+    """
+
+    def __init__(
+            self,
+            alpha: float = 0.3,
+            half_life: float = 600,
+            max_age: float = 300,
+            timeout: float = 3,
+            verifier: StreamVerifier | None = None
+    ):
+        """
+        Initializes a new CDN ranker.
+
+        Args:
+            alpha (float): Weight of a new sample in the moving average. Defaults to 0.3.
+            half_life (float): Seconds after which the history of a score has lost half its weight. Defaults to 600.
+            max_age (float): Seconds after which a score is measured again. Defaults to 300.
+            timeout (float): Seconds to wait for the probes; a CDN that has not answered counts this long.
+                Defaults to 3.
+            verifier (StreamVerifier | None): Sends the probes. Defaults to a verifier on the shared client pool.
+        """
+        self.alpha = alpha
+        self.half_life = half_life
+        self.max_age = max_age
+        self.timeout = timeout
+        self.verifier = verifier or StreamVerifier(timeout=timeout)
+        self._scores: dict[str, CdnScore] = {}
+        self._flight = SingleFlight()
+
+    def record(self, key: str, latency: float | None) -> CdnScore:
+        """
+        Adds a latency sample for a CDN.
+
+        Args:
+            key (str): The CDN key, see `cdn_key`.
+            latency (float | None): The time to first byte in seconds, or None if the probe failed.
+
+        Returns:
+            CdnScore: The updated score.
+        """
+        now = time.monotonic()
+        sample = self.timeout if latency is None else latency
+        score = self._scores.get(key)
+        if score is None:
+            score = self._scores[key] = CdnScore(latency=sample)
+        else:
+            weight = (1 - self.alpha) * 0.5 ** ((now - score.updated_at) / self.half_life)
+            score.latency = weight * score.latency + (1 - weight) * sample
+        score.samples += 1
+        score.failures = score.failures + 1 if latency is None else 0
+        score.updated_at = now
+        return score
+
+    def latency(self, key: str) -> float | None:
+        """
+        Returns the smoothed latency of a CDN, or None if it has not been measured.
+        """
+        score = self._scores.get(key)
+        return score.latency if score is not None else None
+
+    def scores(self) -> dict[str, CdnScore]:
+        """
+        Returns a snapshot of the scores, keyed by CDN.
+        """
+        return {key: CdnScore(s.latency, s.samples, s.failures, s.updated_at) for key, s in self._scores.items()}
+
+    def clear(self) -> None:
+        """
+        Forgets every score.
+        """
+        self._scores.clear()
+
+    def _is_fresh(self, key: str) -> bool:
+        score = self._scores.get(key)
+        return score is not None and time.monotonic() - score.updated_at < self.max_age
+
+    async def measure(
+            self,
+            url: str,
+            proxy_addr: str | None = None,
+            headers: dict | None = None,
+            http2: bool = True
+    ) -> float | None:
+        """
+        Returns the time to first byte of a stream URL.
+
+        Args:
+            url (str): The stream URL.
+            proxy_addr (str | None): The proxy address to use. Defaults to None.
+            headers (dict | None): Custom headers for the request. Defaults to None.
+            http2 (bool): If True, enables HTTP/2 support. Defaults to True.
+
+        Returns:
+            float | None: The latency in seconds, or None if the request failed or was rejected.
+        """
+        start = time.monotonic()
+        status = await self.verifier.probe(url, proxy_addr, headers, http2)
+        if not self.verifier.is_working(status):
+            return None
+        return time.monotonic() - start
+
+    async def _measure_and_record(self, key: str, url: str, proxy_addr: str | None, headers: dict | None,
+                                  http2: bool) -> None:
+        try:
+            latency = await self.measure(url, proxy_addr, headers, http2)
+        except asyncio.CancelledError:
+            self.record(key, None)
+            raise
+        self.record(key, latency)
+
+    async def rank(
+            self,
+            urls: Iterable[str],
+            proxy_addr: str | None = None,
+            headers: dict | None = None,
+            http2: bool = True
+    ) -> list[str]:
+        """
+        Returns the URLs ordered by the latency of their CDN, fastest first.
+
+        CDNs without a recent score are probed first. URLs of CDNs with equal scores keep their original order,
+        and no URL is dropped.
+
+        Args:
+            urls (Iterable[str]): The stream URLs, in the platform's order. Duplicates and empty values are
+                skipped.
+            proxy_addr (str | None): The proxy address to use. Defaults to None.
+            headers (dict | None): Custom headers for the probes. Defaults to None.
+            http2 (bool): If True, enables HTTP/2 support. Defaults to True.
+
+        Returns:
+            list[str]: The URLs, fastest first.
+        """
+        urls = list(dict.fromkeys(url for url in urls if url))
+        if len(urls) < 2:
+            return urls
+
+        keys = {url: cdn_key(url) for url in urls}
+        to_measure: dict[str, str] = {}
+        for url, key in keys.items():
+            if key not in to_measure and not self._is_fresh(key):
+                to_measure[key] = url
+
+        if to_measure:
+            tasks = [
+                asyncio.ensure_future(self._flight.do(
+                    key, lambda k=key, u=url: self._measure_and_record(k, u, proxy_addr, headers, http2)))
+                for key, url in to_measure.items()
+            ]
+            _, pending = await asyncio.wait(tasks, timeout=self.timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        def sort_key(url: str) -> float:
+            latency = self.latency(keys[url])
+            return latency if latency is not None else float('inf')
+
+        return sorted(urls, key=sort_key)
+
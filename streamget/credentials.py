@@ -0,0 +1,360 @@
+import abc
+import asyncio
+import base64
+import json
+import os
+import threading
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from .requests.single_flight import SingleFlight
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
+
+
+@dataclass
+class Credential:
+    """
+    A login session or access token obtained for an account.
+
+    Attributes:
+        value (str): The cookie string or token.
+        expires_at (float | None): Unix time after which the credential is no longer valid, or None if unknown.
+        created_at (float): Unix time at which the credential was obtained.
+        extra (dict): Other values returned by the login, e.g. a partner code.
+    """
+    value: str
+    expires_at: float | None = None
+    created_at: float = field(default_factory=time.time)
+    extra: dict = field(default_factory=dict)
+
+    def expires_within(self, seconds: float) -> bool:
+        """
+        Returns whether the credential expires in less than `seconds` seconds.
+        """
+        return self.expires_at is not None and self.expires_at - time.time() < seconds
+
+    @property
+    def expired(self) -> bool:
+        return self.expires_within(0)
+
+
+def jwt_expiry(token: str) -> float | None:
+    """
+    Returns the "exp" claim of a JSON Web Token, without verifying it.
+
+    Args:
+        token (str): The token.
+
+    Returns:
+        float | None: The expiry as Unix time, or None if the token is not a JWT or has no expiry.
+    """
+    parts = token.split('.')
+    if len(parts) != 3:
+        return None
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(parts[1] + '=' * (-len(parts[1]) % 4)))
+        return float(payload['exp'])
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+class CredentialStore(abc.ABC):
+    """
+    Shares login sessions between platform instances, so an account logs in once instead of once per room.
+
+    `obtain` returns the stored credential while it is valid. When it is about to expire (within
+    `refresh_margin` seconds) it is still returned, and a single background login replaces it; when it is
+    missing or expired, concurrent callers wait for a single login. Subclasses only implement `_load`,
+    `_save` and `_remove`; stores whose hooks block, e.g. on a file or a lock, set `blocking` so the hooks
+    run in a worker thread instead of on the event loop.
+    """
+    blocking: bool = False
+
+    def __init__(self, refresh_margin: float = 300):
+        """
+        Initializes a new credential store.
+
+        Args:
+            refresh_margin (float): Seconds before expiry at which a credential is refreshed in the background.
+                Defaults to 300.
+        """
+        self.refresh_margin = refresh_margin
+        self._flight = SingleFlight()
+
+    @abc.abstractmethod
+    def _load(self, key: str) -> Credential | None:
+        """
+        Returns the stored credential for a key, expired or not, or None.
+        """
+
+    @abc.abstractmethod
+    def _save(self, key: str, credential: Credential) -> None:
+        """
+        Stores a credential, replacing the previous one.
+        """
+
+    @abc.abstractmethod
+    def _remove(self, key: str) -> None:
+        """
+        Removes the credential of a key, if any.
+        """
+
+    def _invalidate(self, key: str, value: str | None) -> None:
+        """
+        Removes the credential of a key if it is still `value` (or whatever it is, if `value` is None).
+        """
+        if value is not None:
+            credential = self._load(key)
+            if credential is None or credential.value != value:
+                return
+        self._remove(key)
+
+    async def _run(self, func: Callable, *args):
+        if self.blocking:
+            return await asyncio.to_thread(func, *args)
+        return func(*args)
+
+    async def get(self, key: str) -> Credential | None:
+        """
+        Returns the stored credential for a key if it has not expired.
+
+        Args:
+            key (str): The account key, e.g. "soop:username".
+
+        Returns:
+            Credential | None: The credential, or None.
+        """
+        credential = await self._run(self._load, key)
+        if credential is None or credential.expired:
+            return None
+        return credential
+
+    async def set(self, key: str, credential: Credential) -> None:
+        """
+        Stores a credential, replacing the previous one.
+
+        Args:
+            key (str): The account key, e.g. "soop:username".
+            credential (Credential): The credential.
+        """
+        await self._run(self._save, key, credential)
+
+    async def invalidate(self, key: str, value: str | None = None) -> None:
+        """
+        Removes a credential that was rejected by the platform.
+
+        Args:
+            key (str): The account key.
+            value (str | None): The rejected cookie string or token. If given, the stored credential is only
+                removed if it is still this one, so a newer login made by another instance is kept.
+        """
+        await self._run(self._invalidate, key, value)
+
+    async def obtain(self, key: str, login: Callable[[], Awaitable[Credential | None]]) -> Credential | None:
+        """
+        Returns a valid credential for an account, logging in only when needed.
+
+        Args:
+            key (str): The account key, e.g. "soop:username".
+            login (Callable[[], Awaitable[Credential | None]]): Logs in and returns the new credential, or None
+                if the login did not succeed. Failed logins are not stored.
+
+        Returns:
+            Credential | None: The credential, or None if the login did not succeed.
+        """
+        async def login_and_store() -> Credential | None:
+            new_credential = await login()
+            if new_credential is not None:
+                await self.set(key, new_credential)
+            return new_credential
+
+        credential = await self.get(key)
+        if credential is not None:
+            if credential.expires_within(self.refresh_margin):
+                self._flight.start(key, login_and_store)
+            return credential
+        return await self._flight.do(key, login_and_store)
+
+
+class MemoryCredentialStore(CredentialStore):
+    """
+    Keeps credentials in memory, shared by every platform instance of this process.
+    """
+
+    def __init__(self, refresh_margin: float = 300):
+        super().__init__(refresh_margin)
+        self._credentials: dict[str, Credential] = {}
+
+    def _load(self, key: str) -> Credential | None:
+        return self._credentials.get(key)
+
+    def _save(self, key: str, credential: Credential) -> None:
+        self._credentials[key] = credential
+
+    def _remove(self, key: str) -> None:
+        self._credentials.pop(key, None)
+
+
+class FileCredentialStore(CredentialStore):
+    """
+    Keeps credentials in a JSON file, shared by every process that uses the same file and kept across restarts.
+
+    The file is only readable by its owner and is replaced atomically on every change. Every change is a
+    read-modify-write made under an exclusive lock on a ".lock" file next to it, so concurrent logins of
+    several workers do not overwrite each other. Changes made by other processes are picked up when the
+    file is replaced. File access and locking run in a worker thread, so a slow disk or a lock held by
+    another process never blocks the event loop.
+    """
+    blocking = True
+    # Attempts at the Windows lock, each of which waits about 10 seconds before failing.
+    LOCK_ATTEMPTS = 6
+
+    def __init__(self, path: str | Path, refresh_margin: float = 300):
+        """
+        Initializes a new file-backed credential store.
+
+        Args:
+            path (str | Path): The JSON file. It is created on the first login.
+            refresh_margin (float): Seconds before expiry at which a credential is refreshed in the background.
+                Defaults to 300.
+        """
+        super().__init__(refresh_margin)
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(f'.{self.path.name}.lock')
+        self._credentials: dict[str, Credential] = {}
+        # (inode, size, mtime in ns) of the file last read; every write replaces the file, so its inode changes.
+        self._signature: tuple[int, int, int] | None = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[bool]:
+        # Yields whether the inter-process lock is held; without it (e.g. a read-only directory) the store
+        # still works for this process.
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        except OSError:
+            yield False
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                yield True
+                return
+            for _ in range(self.LOCK_ATTEMPTS):
+                try:
+                    msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+            else:
+                # Still contended: go on without the inter-process lock rather than failing the login.
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(fd)
+
+    def _reload(self, force: bool = False) -> None:
+        try:
+            stat = self.path.stat()
+        except OSError:
+            # Missing, or removed by another process.
+            self._credentials, self._signature = {}, None
+            return
+        signature = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        if signature == self._signature and not force:
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+            self._credentials = {key: Credential(**value) for key, value in data.items()}
+        except (OSError, ValueError, TypeError):
+            self._credentials = {}
+        self._signature = signature
+
+    def _write(self) -> None:
+        tmp_path = self.path.with_name(f'.{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({key: asdict(value) for key, value in self._credentials.items()}, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        stat = self.path.stat()
+        self._signature = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    def _update(self, change: Callable[[dict[str, Credential]], bool]) -> None:
+        # Read-modify-write under the inter-process lock, from the current file rather than the cached copy.
+        with self._lock, self._file_lock():
+            self._reload(force=True)
+            if not change(self._credentials):
+                return
+            try:
+                self._write()
+            except OSError:
+                # Keep the session for this process even if it cannot be persisted.
+                pass
+
+    def _load(self, key: str) -> Credential | None:
+        with self._lock:
+            self._reload()
+            return self._credentials.get(key)
+
+    def _save(self, key: str, credential: Credential) -> None:
+        def change(credentials: dict[str, Credential]) -> bool:
+            credentials[key] = credential
+            return True
+
+        self._update(change)
+
+    def _remove(self, key: str) -> None:
+        self._update(lambda credentials: credentials.pop(key, None) is not None)
+
+    def _invalidate(self, key: str, value: str | None) -> None:
+        # The check that the rejected credential is still the stored one is made under the same lock as the
+        # removal, so a login written by another process in between is kept.
+        def change(credentials: dict[str, Credential]) -> bool:
+            credential = credentials.get(key)
+            if credential is None or (value is not None and credential.value != value):
+                return False
+            del credentials[key]
+            return True
+
+        self._update(change)
+
+
+def _default_store() -> CredentialStore:
+    path = os.environ.get('STREAMGET_CREDENTIALS_FILE')
+    return FileCredentialStore(path) if path else MemoryCredentialStore()
+
+
+_default_credential_store = _default_store()
+
+
+def get_credential_store() -> CredentialStore:
+    """
+    Returns the process-wide credential store used by the platforms that log in.
+
+    It keeps credentials in memory, or in the file named by the STREAMGET_CREDENTIALS_FILE environment variable.
+    """
+    return _default_credential_store
+
+
+def set_credential_store(store: CredentialStore) -> None:
+    """
+    Replaces the process-wide credential store, e.g. with a `FileCredentialStore` shared by several workers.
+    """
+    global _default_credential_store
+    _default_credential_store = store
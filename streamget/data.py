@@ -1,15 +1,89 @@
 import json
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
+from typing import Any
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
 
-@dataclass
-class StreamData:
+
+class _StreamDataMixin:
+    """
+    Serialization shared by `StreamData` and `FrozenStreamData`.
+    """
+    __slots__ = ()
+    _field_names: tuple[str, ...] = ()
+
+    def to_dict(self) -> dict:
+        """
+        Returns the fields as a new dict. Unlike `dataclasses.asdict`, nested values are not copied.
+        """
+        return {name: getattr(self, name) for name in self._field_names}
+
+    def to_bytes(self) -> bytes:
+        """
+        Converts the object to compact UTF-8 encoded JSON, using orjson when it is installed.
+
+        Returns:
+            bytes: The JSON document.
+        """
+        data = self.to_dict()
+        if orjson is not None:
+            try:
+                return orjson.dumps(data)
+            except TypeError:
+                # e.g. integers wider than 64 bits, which the standard library handles
+                pass
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def to_json(self, indent: int | None = None) -> str:
+        """
+        Converts the object to a JSON string.
+
+        The output is compact unless `indent` is given, which is meant for output read by people.
+
+        Args:
+            indent (int | None): The indentation of pretty-printed output. Defaults to None (compact).
+
+        Returns:
+            str: A JSON representation of the object.
+
+        Example:
+            >>> stream_data = StreamData(platform="Twitch", anchor_name="StreamerName")
+            >>> stream_data.to_json()
+            '{"platform":"Twitch","anchor_name":"StreamerName",...}'
+        """
+        if indent is not None:
+            return json.dumps(self.to_dict(), ensure_ascii=False, indent=indent)
+        return self.to_bytes().decode('utf-8')
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]):
+        """
+        Creates an object from a dict without copying or modifying it.
+
+        Missing fields are set to None, and keys that are not fields are ignored.
+
+        Args:
+            data (dict[str, Any]): The field values, e.g. the output of `to_dict` or of `json.loads`.
+
+        Returns:
+            The new object.
+        """
+        get = data.get
+        return cls(*[get(name) for name in cls._field_names])
+
+
+@dataclass(slots=True)
+class StreamData(_StreamDataMixin):
     """
     Represents metadata and URLs associated with a streaming session.
 
     This class encapsulates essential information about a stream, including platform details,
     streamer information, stream status, and URLs for different stream formats.
-    It also provides a method to convert the object to a JSON string.
+    It also provides methods to convert the object to JSON. Instances use `__slots__`, so that large numbers
+    of them are cheap to keep in memory; `freeze` returns an immutable copy.
 
     Attributes:
         platform (str): The streaming platform (e.g., "Twitch", "SOOP", "TikTok").
@@ -47,35 +121,49 @@ class StreamData:
     extra: dict = None
     live_url: str = None
 
-    def to_json(self) -> str:
+    def freeze(self) -> 'FrozenStreamData':
         """
-        Converts the StreamData object to a JSON string.
+        Returns an immutable copy of this object. The `extra` dict is shared, not copied.
+        """
+        return FrozenStreamData(*[getattr(self, name) for name in self._field_names])
 
-        This method serializes the object's attributes into a JSON format, making it easy to
-        transmit or store the stream data.
 
-        Returns:
-            str: A JSON representation of the StreamData object.
+@dataclass(slots=True, frozen=True)
+class FrozenStreamData(_StreamDataMixin):
+    """
+    An immutable `StreamData`, e.g. for results kept in a long-lived cache or shared between tasks.
 
-        Example:
-            >>> stream_data = StreamData(platform="Twitch", anchor_name="StreamerName")
-            >>> json_data = stream_data.to_json()
-            >>> print(json_data)
-            {
-                "platform": "Twitch",
-                "anchor_name": "StreamerName",
-                ...
-            }
+    It has the same fields and serialization methods as `StreamData`; `thaw` returns a mutable copy.
+    """
+    platform: str = None
+    anchor_name: str = None
+    is_live: bool = None
+    title: str = None
+    quality: str = None
+    m3u8_url: str = None
+    flv_url: str = None
+    record_url: str = None
+    new_cookies: str = None
+    new_token: str = None
+    extra: dict = None
+    live_url: str = None
+
+    def thaw(self) -> StreamData:
+        """
+        Returns a mutable copy of this object. The `extra` dict is shared, not copied.
         """
-        return json.dumps(self.__dict__, ensure_ascii=False, indent=4)
+        return StreamData(*[getattr(self, name) for name in self._field_names])
+
+
+StreamData._field_names = FrozenStreamData._field_names = tuple(f.name for f in fields(StreamData))
+_field_name_set = frozenset(StreamData._field_names)
 
 
 def wrap_stream(data: dict) -> StreamData:
     """
     Wraps a dictionary into a StreamData object with default values for missing fields.
 
-    This function ensures that all required and optional fields are present in the input dictionary.
-    If a field is missing, it is set to `None`.
+    Missing fields are set to `None`. The input dictionary is not modified.
 
     Args:
         data (dict): A dictionary containing stream data.
@@ -84,7 +172,7 @@ def wrap_stream(data: dict) -> StreamData:
         StreamData: An instance of StreamData with default values for missing fields.
 
     Raises:
-        TypeError: If the input is not a dictionary.
+        TypeError: If the input is not a dictionary, or has a key that is not a field of StreamData.
 
     Example:
         >>> json_data = {"platform": "Bilibili", "anchor_name": "StreamerName"}
@@ -98,13 +186,7 @@ def wrap_stream(data: dict) -> StreamData:
     if not isinstance(data, dict):
         raise TypeError("Input must be a dictionary")
 
-    required_fields = [
-        "platform", "anchor_name", "is_live", "title", "quality", "m3u8_url", "flv_url", "record_url", "live_url"
-    ]
-    optional_fields = ["new_cookies", "new_token"]
-
-    for field in required_fields + optional_fields:
-        if field not in data:
-            data[field] = None
-
-    return StreamData(**data)
+    for key in data:
+        if key not in _field_name_set:
+            raise TypeError(f"StreamData.__init__() got an unexpected keyword argument '{key}'")
+    return StreamData.from_dict(data)
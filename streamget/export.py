@@ -0,0 +1,353 @@
+import abc
+import gzip
+import importlib
+import json
+from collections.abc import AsyncIterable, Iterable
+from dataclasses import fields
+from pathlib import Path
+from types import ModuleType
+from typing import IO, Any
+
+from .data import StreamData, orjson
+
+FIELD_NAMES = tuple(f.name for f in fields(StreamData))
+
+
+def _pyarrow() -> ModuleType:
+    # Imported on first use: pyarrow is optional and slow to import.
+    try:
+        pa = importlib.import_module('pyarrow')
+        importlib.import_module('pyarrow.ipc')
+        importlib.import_module('pyarrow.parquet')
+    except ImportError as e:
+        raise ImportError('pyarrow is required for Arrow and Parquet export; install it with '
+                          '"pip install streamget[arrow]"') from e
+    return pa
+
+
+def _dumps(value: Any) -> str:
+    if orjson is not None:
+        try:
+            return orjson.dumps(value).decode('utf-8')
+        except TypeError:
+            pass
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+class _BatchWriter(abc.ABC):
+    """
+    Buffers up to `chunk_size` streams and writes them as one chunk, so memory use does not grow with the
+    number of streams written.
+    """
+
+    def __init__(self, chunk_size: int):
+        self.chunk_size = chunk_size
+        self.rows = 0
+        self._buffer: list[StreamData] = []
+        self._closed = False
+
+    @abc.abstractmethod
+    def _write_chunk(self, streams: list[StreamData]) -> None:
+        """
+        Writes a chunk of buffered streams.
+        """
+
+    @abc.abstractmethod
+    def _close(self) -> None:
+        """
+        Finishes the output and releases the file.
+        """
+
+    def write(self, stream: StreamData | None) -> None:
+        """
+        Adds a stream to the output. None values (e.g. failed lookups) are skipped.
+
+        Args:
+            stream (StreamData | None): The stream to write.
+        """
+        if stream is None:
+            return
+        self._buffer.append(stream)
+        if len(self._buffer) >= self.chunk_size:
+            self.flush()
+
+    def write_many(self, streams: Iterable[StreamData | None]) -> int:
+        """
+        Adds every stream of an iterable to the output, consuming it lazily.
+
+        Args:
+            streams (Iterable[StreamData | None]): The streams to write.
+
+        Returns:
+            int: The total number of rows written so far, including buffered ones.
+        """
+        for stream in streams:
+            self.write(stream)
+        return self.rows + len(self._buffer)
+
+    def flush(self) -> None:
+        """
+        Writes the buffered streams.
+        """
+        if self._buffer:
+            self._write_chunk(self._buffer)
+            self.rows += len(self._buffer)
+            self._buffer = []
+
+    def close(self) -> None:
+        """
+        Writes the buffered streams and closes the output.
+        """
+        if not self._closed:
+            self._closed = True
+            try:
+                self.flush()
+            finally:
+                self._close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class NDJSONWriter(_BatchWriter):
+    """
+    Writes streams as newline-delimited JSON, one compact object per line.
+
+    Paths ending in ".gz" are gzip-compressed.
+
+    Example:
+        >>> with NDJSONWriter('results.ndjson') as writer:
+        ...     async for result in resolver.resolve_many(items):
+        ...         writer.write(result.stream)
+    """
+
+    def __init__(self, output: str | Path | IO[bytes], chunk_size: int = 1000):
+        """
+        Initializes a new NDJSON writer.
+
+        Args:
+            output (str | Path | IO[bytes]): The file path, or a binary file object that is left open.
+            chunk_size (int): Number of streams encoded and written at once. Defaults to 1000.
+        """
+        super().__init__(chunk_size)
+        if isinstance(output, str | Path):
+            path = Path(output)
+            # Kept open until close(); the writer itself is the context manager.
+            self._file = gzip.open(path, 'wb') if path.suffix == '.gz' else open(path, 'wb')  # noqa: SIM115
+            self._owns_file = True
+        else:
+            self._file = output
+            self._owns_file = False
+
+    def _write_chunk(self, streams: list[StreamData]) -> None:
+        self._file.write(b''.join(stream.to_bytes() + b'\n' for stream in streams))
+
+    def _close(self) -> None:
+        if self._owns_file:
+            self._file.close()
+        else:
+            self._file.flush()
+
+
+def arrow_schema():
+    """
+    Returns the Arrow schema used for exported streams. Every `StreamData` field is a column; `extra` is
+    stored as a JSON string because its keys differ between platforms.
+
+    Returns:
+        pyarrow.Schema: The schema.
+    """
+    pa = _pyarrow()
+    return pa.schema([(name, pa.bool_() if name == 'is_live' else pa.string()) for name in FIELD_NAMES])
+
+
+def to_record_batch(streams: list[StreamData]):
+    """
+    Converts streams to an Arrow record batch, one column per field.
+
+    Args:
+        streams (list[StreamData]): The streams.
+
+    Returns:
+        pyarrow.RecordBatch: The record batch.
+    """
+    pa = _pyarrow()
+    columns = []
+    for name in FIELD_NAMES:
+        values = [getattr(stream, name) for stream in streams]
+        if name == 'extra':
+            values = [_dumps(value) if value is not None else None for value in values]
+        elif name == 'is_live':
+            values = [bool(value) if value is not None else None for value in values]
+        else:
+            values = [str(value) if value is not None and not isinstance(value, str) else value for value in values]
+        columns.append(values)
+    return pa.record_batch(columns, schema=arrow_schema())
+
+
+class ArrowWriter(_BatchWriter):
+    """
+    Writes streams to an Arrow IPC file, one record batch per chunk. Requires pyarrow.
+
+    Example:
+        >>> with ArrowWriter('results.arrow') as writer:
+        ...     writer.write_many(streams)
+    """
+
+    def __init__(self, output: str | Path | IO[bytes], chunk_size: int = 10000):
+        """
+        Initializes a new Arrow IPC writer.
+
+        Args:
+            output (str | Path | IO[bytes]): The file path or a binary file object.
+            chunk_size (int): Number of streams per record batch. Defaults to 10000.
+        """
+        pa = _pyarrow()
+        super().__init__(chunk_size)
+        self._writer = pa.ipc.new_file(str(output) if isinstance(output, Path) else output, arrow_schema())
+
+    def _write_chunk(self, streams: list[StreamData]) -> None:
+        self._writer.write_batch(to_record_batch(streams))
+
+    def _close(self) -> None:
+        self._writer.close()
+
+
+class ParquetWriter(_BatchWriter):
+    """
+    Writes streams to a Parquet file, one row group per chunk. Requires pyarrow.
+
+    Example:
+        >>> with ParquetWriter('results.parquet', compression='zstd') as writer:
+        ...     writer.write_many(streams)
+    """
+
+    def __init__(self, output: str | Path | IO[bytes], chunk_size: int = 10000, compression: str = 'zstd'):
+        """
+        Initializes a new Parquet writer.
+
+        Args:
+            output (str | Path | IO[bytes]): The file path or a binary file object.
+            chunk_size (int): Number of streams per row group. Defaults to 10000.
+            compression (str): The Parquet compression codec. Defaults to "zstd".
+        """
+        pa = _pyarrow()
+        super().__init__(chunk_size)
+        self._writer = pa.parquet.ParquetWriter(
+            str(output) if isinstance(output, Path) else output, arrow_schema(), compression=compression)
+
+    def _write_chunk(self, streams: list[StreamData]) -> None:
+        self._writer.write_batch(to_record_batch(streams))
+
+    def _close(self) -> None:
+        self._writer.close()
+
+
+WRITERS = {
+    'ndjson': NDJSONWriter,
+    'arrow': ArrowWriter,
+    'parquet': ParquetWriter,
+}
+
+
+def _format_from_path(path: str | Path) -> str:
+    path = Path(path)
+    suffix = (path.with_suffix('') if path.suffix == '.gz' else path).suffix.lower()
+    if suffix in ('.parquet', '.pq'):
+        return 'parquet'
+    if suffix in ('.arrow', '.feather', '.ipc'):
+        return 'arrow'
+    return 'ndjson'
+
+
+def open_writer(
+        output: str | Path | IO[bytes],
+        file_format: str | None = None,
+        chunk_size: int | None = None,
+        **kwargs
+) -> NDJSONWriter | ArrowWriter | ParquetWriter:
+    """
+    Creates the writer for a file.
+
+    Args:
+        output (str | Path | IO[bytes]): The file path or a binary file object.
+        file_format (str | None): "ndjson", "arrow" or "parquet". Defaults to the format matching the file
+            extension (".parquet", ".arrow"/".feather", anything else is NDJSON).
+        chunk_size (int | None): Number of streams written at once. Defaults to the writer's default.
+        **kwargs: Other options of the writer, e.g. `compression` for Parquet.
+
+    Returns:
+        NDJSONWriter | ArrowWriter | ParquetWriter: The writer, to be used as a context manager.
+
+    Raises:
+        ValueError: If the format is unknown.
+        ImportError: If Arrow or Parquet output is requested and pyarrow is not installed.
+    """
+    if file_format is None:
+        file_format = _format_from_path(output) if isinstance(output, str | Path) else 'ndjson'
+    writer_class = WRITERS.get(file_format.lower())
+    if writer_class is None:
+        raise ValueError(f'Unknown export format: {file_format}')
+    if chunk_size is not None:
+        kwargs['chunk_size'] = chunk_size
+    return writer_class(output, **kwargs)
+
+
+def export_streams(
+        streams: Iterable[StreamData | None],
+        output: str | Path | IO[bytes],
+        file_format: str | None = None,
+        chunk_size: int | None = None,
+        **kwargs
+) -> int:
+    """
+    Writes streams to a file in chunks, consuming the iterable lazily.
+
+    Args:
+        streams (Iterable[StreamData | None]): The streams. None values (e.g. failed lookups) are skipped.
+        output (str | Path | IO[bytes]): The file path or a binary file object.
+        file_format (str | None): "ndjson", "arrow" or "parquet". Defaults to the format matching the file
+            extension (".parquet", ".arrow"/".feather", anything else is NDJSON).
+        chunk_size (int | None): Number of streams written at once. Defaults to the writer's default.
+        **kwargs: Other options of the writer, e.g. `compression` for Parquet.
+
+    Returns:
+        int: The number of rows written.
+
+    Raises:
+        ValueError: If the format is unknown.
+        ImportError: If Arrow or Parquet output is requested and pyarrow is not installed.
+    """
+    with open_writer(output, file_format, chunk_size, **kwargs) as writer:
+        writer.write_many(streams)
+    return writer.rows
+
+
+async def export_streams_async(
+        streams: AsyncIterable[StreamData | None],
+        output: str | Path | IO[bytes],
+        file_format: str | None = None,
+        chunk_size: int | None = None,
+        **kwargs
+) -> int:
+    """
+    Writes streams produced by an async iterator, e.g. a batch run, to a file in chunks.
+
+    Args:
+        streams (AsyncIterable[StreamData | None]): The streams. None values (e.g. failed lookups) are skipped.
+        output (str | Path | IO[bytes]): The file path or a binary file object.
+        file_format (str | None): "ndjson", "arrow" or "parquet". Defaults to the format matching the file
+            extension.
+        chunk_size (int | None): Number of streams written at once. Defaults to the writer's default.
+        **kwargs: Other options of the writer, e.g. `compression` for Parquet.
+
+    Returns:
+        int: The number of rows written.
+    """
+    with open_writer(output, file_format, chunk_size, **kwargs) as writer:
+        async for stream in streams:
+            writer.write(stream)
+    return writer.rows
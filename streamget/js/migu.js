@@ -133,11 +133,13 @@ async function getDdCalcu(inputUrl) {
     return UTF8ToString(E);
 }
 
-const url = process.argv[2];
-
-getDdCalcu(url).then(result => {
-    console.log(result);
-}).catch(err => {
-    console.error(err);
-    process.exit(1);
-});
\ No newline at end of file
+if (require.main === module) {
+    const url = process.argv[2];
+
+    getDdCalcu(url).then(result => {
+        console.log(result);
+    }).catch(err => {
+        console.error(err);
+        process.exit(1);
+    });
+}
@@ -0,0 +1,71 @@
+/**
+ * Long-lived signing worker used by streamget.js_worker.
+ *
+ * Reads one JSON request per line from stdin: {"id": 1, "script": "/abs/path.js", "fn": "sign", "args": [...]}
+ * and writes one JSON response per line to stdout: {"id": 1, "result": ...} or {"id": 1, "error": "..."}.
+ * Each script is evaluated once and kept in memory, the same way execjs would evaluate it for every call.
+ */
+'use strict';
+
+const fs = require('fs');
+const path = require('path');
+const readline = require('readline');
+
+const stdout = process.stdout;
+
+// Signing scripts log freely; keep stdout reserved for responses.
+console.log = console.info = console.debug = (...args) => console.error(...args);
+
+const scripts = new Map();
+const functions = new Map();
+
+function load(file) {
+    let lookup = scripts.get(file);
+    if (!lookup) {
+        const source = fs.readFileSync(file, 'utf8');
+        const module = { exports: {} };
+        const factory = new Function(
+            'require', 'module', 'exports', '__filename', '__dirname',
+            source + '\n;return function (name) { return eval(name); };'
+        );
+        lookup = factory(require, module, module.exports, file, path.dirname(file));
+        scripts.set(file, lookup);
+    }
+    return lookup;
+}
+
+function resolve(file, name) {
+    const key = file + '\0' + name;
+    let fn = functions.get(key);
+    if (!fn) {
+        fn = load(file)(name);
+        if (typeof fn !== 'function') {
+            throw new TypeError(name + ' is not a function');
+        }
+        functions.set(key, fn);
+    }
+    return fn;
+}
+
+function reply(message) {
+    stdout.write(JSON.stringify(message) + '\n');
+}
+
+const rl = readline.createInterface({ input: process.stdin });
+
+rl.on('line', async (line) => {
+    let request;
+    try {
+        request = JSON.parse(line);
+    } catch (e) {
+        return;
+    }
+    try {
+        const result = await resolve(request.script, request.fn).apply(null, request.args || []);
+        reply({ id: request.id, result: result === undefined ? null : result });
+    } catch (e) {
+        reply({ id: request.id, error: String((e && e.stack) || e) });
+    }
+});
+
+rl.on('close', () => process.exit(0));
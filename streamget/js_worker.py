@@ -0,0 +1,282 @@
+import asyncio
+import atexit
+import itertools
+import json
+import os
+import shutil
+import signal
+import weakref
+from pathlib import Path
+from typing import Any
+
+from . import JS_SCRIPT_PATH, node_execute_dir
+from .requests import instrument
+
+WORKER_SCRIPT = JS_SCRIPT_PATH / 'worker.js'
+
+# Workers stopped at interpreter exit if their pool was never closed.
+_started_workers: 'weakref.WeakSet[_NodeWorker]' = weakref.WeakSet()
+
+
+def node_env() -> dict[str, str]:
+    """
+    Returns the environment for Node.js processes: the current one, with the Node.js bundled next to the
+    executable (the "node" directory) searched first.
+    """
+    env = os.environ.copy()
+    env['PATH'] = str(node_execute_dir) + os.pathsep + env.get('PATH', '')
+    return env
+
+
+class NodeWorkerError(RuntimeError):
+    """
+    Raised when a JS function cannot be executed by a Node.js worker.
+    """
+
+
+class _NodeWorker:
+    def __init__(self, process: asyncio.subprocess.Process):
+        self.process = process
+        self.pending: dict[int, asyncio.Future] = {}
+        _started_workers.add(self)
+        self.reader = asyncio.create_task(self._read_responses())
+
+    @property
+    def alive(self) -> bool:
+        return self.process.returncode is None and not self.reader.done()
+
+    async def _read_responses(self) -> None:
+        try:
+            while True:
+                line = await self.process.stdout.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                future = self.pending.pop(message.get('id'), None)
+                if future is None or future.done():
+                    continue
+                if 'error' in message:
+                    future.set_exception(NodeWorkerError(message['error']))
+                else:
+                    future.set_result(message.get('result'))
+        except asyncio.CancelledError:
+            # asyncio.run() cancels the remaining tasks, and waits for them, before closing the loop; the process
+            # must not outlive it.
+            self.kill()
+            await self.process.wait()
+            raise
+        finally:
+            for future in self.pending.values():
+                if not future.done():
+                    future.set_exception(NodeWorkerError('Node.js worker exited unexpectedly'))
+            self.pending.clear()
+
+    async def call(self, request_id: int, script: str, fn: str, args: tuple) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = future
+        message = {'id': request_id, 'script': script, 'fn': fn, 'args': list(args)}
+        self.process.stdin.write(json.dumps(message, ensure_ascii=False).encode('utf-8') + b'\n')
+        await self.process.stdin.drain()
+        return future
+
+    def kill(self) -> None:
+        if self.process.returncode is None:
+            try:
+                self.process.kill()
+            except ProcessLookupError:
+                pass
+
+    async def close(self) -> None:
+        if self.process.returncode is None:
+            self.process.stdin.close()
+            done, _ = await asyncio.wait({asyncio.ensure_future(self.process.wait())}, timeout=5)
+            if not done:
+                self.kill()
+        await asyncio.gather(self.reader, return_exceptions=True)
+
+
+class NodeWorkerPool:
+    """
+    A pool of long-lived Node.js processes that execute functions from the bundled JS scripts.
+
+    Each worker evaluates a script once and then answers calls over stdin/stdout, so signing no longer pays
+    for spawning a new Node.js process on every request. Workers are started lazily, up to `size` per event
+    loop, and at most `max_pending` calls are queued at once; further callers wait for a free slot.
+
+    Example:
+        >>> async def main():
+        ...     async with NodeWorkerPool(size=2) as pool:
+        ...         return await pool.call('taobao-sign.js', 'sign', 'token&1719411639403&12574478&{}')
+        >>> asyncio.run(main())
+    """
+
+    def __init__(self, size: int = 2, max_pending: int = 256, timeout: float = 30, node_path: str | None = None):
+        """
+        Initializes a new worker pool.
+
+        Args:
+            size (int): Maximum number of Node.js processes per event loop. Defaults to 2.
+            max_pending (int): Maximum number of calls in flight before callers have to wait. Defaults to 256.
+            timeout (float): Seconds to wait for a single call before giving up. Defaults to 30.
+            node_path (str | None): The Node.js executable to use. Defaults to `node` from the bundled "node"
+                directory or the PATH.
+        """
+        self.size = size
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.node_path = node_path or 'node'
+        self._ids = itertools.count(1)
+        self._workers: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, list[_NodeWorker]] = \
+            weakref.WeakKeyDictionary()
+        self._slots: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = \
+            weakref.WeakKeyDictionary()
+        self._spawn_locks: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock] = \
+            weakref.WeakKeyDictionary()
+
+    async def _spawn(self) -> _NodeWorker:
+        env = node_env()
+        node_path = shutil.which(self.node_path, path=env['PATH']) or self.node_path
+        try:
+            process = await asyncio.create_subprocess_exec(
+                node_path, str(WORKER_SCRIPT),
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+                limit=16 * 1024 * 1024,
+                env=env
+            )
+        except OSError as e:
+            raise NodeWorkerError(f'Failed to start Node.js, please check if the Node.js environment is installed. {e}')
+        return _NodeWorker(process)
+
+    async def _get_worker(self) -> _NodeWorker:
+        loop = asyncio.get_running_loop()
+        # Workers hold their loop through their pipes, so the entries of closed loops are not dropped by
+        # the weak keys.
+        for closed_loop in [key for key in self._workers if key.is_closed()]:
+            del self._workers[closed_loop]
+        workers = self._workers.setdefault(loop, [])
+        workers[:] = [worker for worker in workers if worker.alive]
+        idle = [worker for worker in workers if not worker.pending]
+        if idle:
+            return idle[0]
+        if len(workers) < self.size:
+            # Concurrent callers must not all start a process while the first one is still booting.
+            async with self._spawn_locks.setdefault(loop, asyncio.Lock()):
+                if len(workers) < self.size:
+                    workers.append(await self._spawn())
+                    return workers[-1]
+        return min(workers, key=lambda w: len(w.pending))
+
+    async def call(self, script: str | Path, fn: str, *args: Any, timeout: float | None = None) -> Any:
+        """
+        Calls a global function defined in a JS script.
+
+        Args:
+            script (str | Path): A script name from `streamget/js` (e.g. 'x-bogus.js') or an absolute path.
+            fn (str): The name of the function to call.
+            *args (Any): JSON-serializable arguments passed to the function.
+            timeout (float | None): Seconds to wait for the result. Defaults to the pool timeout.
+
+        Returns:
+            Any: The JSON-decoded return value of the function.
+
+        Raises:
+            NodeWorkerError: If Node.js is unavailable, the function throws or the call times out.
+        """
+        script_path = Path(script)
+        if not script_path.is_absolute():
+            script_path = JS_SCRIPT_PATH / script_path
+
+        loop = asyncio.get_running_loop()
+        slots = self._slots.get(loop)
+        if slots is None:
+            slots = self._slots[loop] = asyncio.Semaphore(self.max_pending)
+
+        async with slots:
+            worker = await self._get_worker()
+            request_id = next(self._ids)
+            try:
+                future = await worker.call(request_id, str(script_path), fn, args)
+                done, _ = await asyncio.wait({future}, timeout=timeout or self.timeout)
+                if not done:
+                    future.cancel()
+                    raise NodeWorkerError(f'JS call {fn} in {script_path.name} timed out')
+                return future.result()
+            except (BrokenPipeError, ConnectionResetError) as e:
+                raise NodeWorkerError(f'Node.js worker is not available: {e}')
+            finally:
+                worker.pending.pop(request_id, None)
+
+    async def aclose(self) -> None:
+        """
+        Stops every worker started by this pool on the current event loop.
+        """
+        loop = asyncio.get_running_loop()
+        workers = self._workers.pop(loop, [])
+        self._slots.pop(loop, None)
+        self._spawn_locks.pop(loop, None)
+        await asyncio.gather(*(worker.close() for worker in workers))
+
+    async def __aenter__(self) -> 'NodeWorkerPool':
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.aclose()
+
+
+_default_pool = NodeWorkerPool()
+
+
+def get_worker_pool() -> NodeWorkerPool:
+    """
+    Returns the process-wide Node.js worker pool used by the platform classes.
+    """
+    return _default_pool
+
+
+def set_worker_pool(pool: NodeWorkerPool) -> None:
+    """
+    Replaces the process-wide Node.js worker pool.
+
+    The previous pool is not stopped; call `aclose()` on it if it has been used.
+    """
+    global _default_pool
+    _default_pool = pool
+
+
+async def close_worker_pool() -> None:
+    """
+    Stops the Node.js workers of the process-wide worker pool on the current event loop.
+
+    Workers are also stopped when the event loop is shut down by `asyncio.run` and at interpreter exit.
+    """
+    await _default_pool.aclose()
+
+
+@atexit.register
+def _kill_running_workers() -> None:
+    # The event loop that owned these workers may be closed, so they are signalled by pid. A process that has
+    # not been reaped keeps its pid, so the signal cannot reach another process.
+    for worker in list(_started_workers):
+        if worker.process.returncode is None:
+            try:
+                os.kill(worker.process.pid, signal.SIGTERM)
+            except OSError:
+                pass
+
+
+async def call_js(script: str | Path, fn: str, *args: Any, timeout: float | None = None) -> Any:
+    """
+    Calls a function from a bundled JS script through the process-wide worker pool.
+
+    See `NodeWorkerPool.call` for details. The call is reported as a "sign" timing when timing callbacks are
+    registered, see `streamget.requests.instrument`.
+    """
+    if not instrument.is_enabled():
+        return await _default_pool.call(script, fn, *args, timeout=timeout)
+    with instrument.sign_span(f'{Path(script).name}:{fn}'):
+        return await _default_pool.call(script, fn, *args, timeout=timeout)
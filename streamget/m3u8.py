@@ -0,0 +1,277 @@
+import re
+from dataclasses import dataclass, field
+
+from .requests.client_pool import ClientPool, get_client_pool
+
+_ATTRIBUTE_PATTERN = re.compile(r'([A-Z0-9-]+)=("[^"]*"|[^,]*)')
+
+
+def parse_attributes(value: str) -> dict[str, str]:
+    """
+    Parses an M3U8 attribute list, e.g. 'BANDWIDTH=1280000,CODECS="avc1.4d401f,mp4a.40.2"'.
+
+    Args:
+        value (str): The attribute list following the tag name and colon.
+
+    Returns:
+        dict[str, str]: The attributes, with the quotes removed from quoted strings.
+    """
+    return {key: val[1:-1] if val[:1] == '"' else val for key, val in _ATTRIBUTE_PATTERN.findall(value)}
+
+
+def _parse_float(value: str | None) -> float | None:
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+def _parse_int(value: str | None) -> int | None:
+    value = (value or '').strip()
+    return int(value) if value.isdigit() else None
+
+
+@dataclass(slots=True)
+class MediaInfo:
+    """
+    An alternative rendition declared by an `#EXT-X-MEDIA` tag.
+
+    Attributes:
+        type (str): The rendition type, e.g. "AUDIO" or "VIDEO".
+        group_id (str): The GROUP-ID the rendition belongs to.
+        name (str): The human-readable name of the rendition.
+        uri (str | None): The media playlist of the rendition, if it has its own.
+        attributes (dict[str, str]): Every attribute of the tag.
+    """
+    type: str
+    group_id: str
+    name: str
+    uri: str | None = None
+    attributes: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class VariantStream:
+    """
+    A variant stream declared by an `#EXT-X-STREAM-INF` tag and the URI line that follows it.
+
+    Attributes:
+        uri (str): The URI of the variant's media playlist, as written in the playlist.
+        bandwidth (int): The peak bitrate in bits per second, or 0 if not declared.
+        resolution (str | None): The resolution, e.g. "1920x1080".
+        codecs (str | None): The codecs list.
+        frame_rate (float | None): The maximum frame rate.
+        media (MediaInfo | None): The last `#EXT-X-MEDIA` rendition declared before this variant.
+        attributes (dict[str, str]): Every attribute of the tag.
+    """
+    uri: str
+    bandwidth: int = 0
+    resolution: str | None = None
+    codecs: str | None = None
+    frame_rate: float | None = None
+    media: MediaInfo | None = None
+    attributes: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class Segment:
+    """
+    A media segment of a media playlist.
+
+    Attributes:
+        uri (str): The URI of the segment, as written in the playlist.
+        duration (float): The duration declared by `#EXTINF`, in seconds.
+        title (str): The title declared by `#EXTINF`.
+    """
+    uri: str
+    duration: float = 0.0
+    title: str = ''
+
+
+@dataclass(slots=True)
+class Playlist:
+    """
+    The parsed content of a master or media playlist.
+
+    Attributes:
+        streams (list[VariantStream]): The variant streams, in playlist order.
+        media (list[MediaInfo]): The alternative renditions, in playlist order.
+        segments (list[Segment]): The media segments, in playlist order.
+        target_duration (float | None): The `#EXT-X-TARGETDURATION` of a media playlist.
+        media_sequence (int): The `#EXT-X-MEDIA-SEQUENCE` of a media playlist.
+        ended (bool): Whether the playlist contains `#EXT-X-ENDLIST`.
+    """
+    streams: list[VariantStream] = field(default_factory=list)
+    media: list[MediaInfo] = field(default_factory=list)
+    segments: list[Segment] = field(default_factory=list)
+    target_duration: float | None = None
+    media_sequence: int = 0
+    ended: bool = False
+
+    @property
+    def is_master(self) -> bool:
+        return bool(self.streams or self.media)
+
+    def sorted_streams(self) -> list[VariantStream]:
+        """
+        Returns the variant streams sorted by bandwidth, highest first. Variants with the same bandwidth
+        keep their playlist order.
+        """
+        return sorted(self.streams, key=lambda stream: stream.bandwidth, reverse=True)
+
+
+class M3U8Parser:
+    """
+    An incremental parser for M3U8 master and media playlists.
+
+    The playlist is fed in chunks of any size as they are received and parsed line by line in a single
+    pass, so a large playlist never has to be buffered as a whole. Every `#EXT-X-STREAM-INF` is paired
+    with the URI line that follows it, so missing or extra lines cannot shift bandwidths onto the wrong
+    variant.
+
+    Example:
+        >>> parser = M3U8Parser()
+        >>> parser.feed('#EXTM3U\\n#EXT-X-STREAM-INF:BANDWIDTH=1280000,RESOLUTION=1280x720\\nhi')
+        >>> parser.feed('gh.m3u8\\n')
+        >>> parser.close().streams[0]
+        VariantStream(uri='high.m3u8', bandwidth=1280000, resolution='1280x720', ...)
+    """
+
+    def __init__(self):
+        self.playlist = Playlist()
+        self._buffer = ''
+        self._stream_info: dict[str, str] | None = None
+        self._media: MediaInfo | None = None
+        self._extinf: tuple[float, str] | None = None
+
+    def feed(self, chunk: str) -> None:
+        """
+        Parses the complete lines of a chunk and keeps the trailing partial line for the next chunk.
+
+        Args:
+            chunk (str): The next piece of the playlist text.
+        """
+        lines = (self._buffer + chunk).split('\n')
+        self._buffer = lines.pop()
+        for line in lines:
+            self._parse_line(line)
+
+    def close(self) -> Playlist:
+        """
+        Parses the remaining partial line and returns the playlist.
+
+        Returns:
+            Playlist: The parsed playlist.
+        """
+        if self._buffer:
+            self._parse_line(self._buffer)
+            self._buffer = ''
+        return self.playlist
+
+    def _parse_line(self, line: str) -> None:
+        line = line.strip()
+        if not line:
+            return
+        if line[0] != '#':
+            self._parse_uri(line)
+            return
+
+        tag, _, value = line.partition(':')
+        if tag == '#EXT-X-STREAM-INF':
+            self._stream_info = parse_attributes(value)
+        elif tag == '#EXT-X-MEDIA':
+            attributes = parse_attributes(value)
+            self._media = MediaInfo(
+                type=attributes.get('TYPE', ''),
+                group_id=attributes.get('GROUP-ID', ''),
+                name=attributes.get('NAME', ''),
+                uri=attributes.get('URI'),
+                attributes=attributes
+            )
+            self.playlist.media.append(self._media)
+        elif tag == '#EXTINF':
+            duration, _, title = value.partition(',')
+            self._extinf = (_parse_float(duration) or 0.0, title)
+        elif tag == '#EXT-X-TARGETDURATION':
+            self.playlist.target_duration = _parse_float(value)
+        elif tag == '#EXT-X-MEDIA-SEQUENCE':
+            self.playlist.media_sequence = _parse_int(value) or 0
+        elif tag == '#EXT-X-ENDLIST':
+            self.playlist.ended = True
+
+    def _parse_uri(self, uri: str) -> None:
+        if self._stream_info is None:
+            duration, title = self._extinf or (0.0, '')
+            self.playlist.segments.append(Segment(uri=uri, duration=duration, title=title))
+            self._extinf = None
+            return
+
+        attributes = self._stream_info
+        self.playlist.streams.append(VariantStream(
+            uri=uri,
+            bandwidth=_parse_int(attributes.get('BANDWIDTH')) or 0,
+            resolution=attributes.get('RESOLUTION'),
+            codecs=attributes.get('CODECS'),
+            frame_rate=_parse_float(attributes.get('FRAME-RATE')),
+            media=self._media,
+            attributes=attributes
+        ))
+        self._stream_info = None
+        self._media = None
+
+
+def parse_playlist(text: str) -> Playlist:
+    """
+    Parses a complete M3U8 playlist.
+
+    Args:
+        text (str): The playlist text.
+
+    Returns:
+        Playlist: The parsed playlist.
+    """
+    parser = M3U8Parser()
+    parser.feed(text)
+    return parser.close()
+
+
+async def fetch_playlist(
+        url: str,
+        proxy_addr: str | None = None,
+        headers: dict | None = None,
+        timeout: int = 20,
+        pool: ClientPool | None = None
+) -> Playlist:
+    """
+    Downloads an M3U8 playlist and parses it while the body is being received.
+
+    Like `async_req`, errors are not raised: the lines received before the error are returned, which is an
+    empty playlist if the request failed before any data arrived. Malformed numeric tag values are ignored.
+
+    Args:
+        url (str): The URL of the playlist.
+        proxy_addr (str | None): The proxy address to use. Defaults to None.
+        headers (dict | None): Custom headers for the request. Defaults to None.
+        timeout (int): The request timeout in seconds. Defaults to 20.
+        pool (ClientPool | None): The client pool to send the request through. Defaults to the shared pool.
+
+    Returns:
+        Playlist: The parsed playlist.
+    """
+    pool = pool or get_client_pool()
+    parser = M3U8Parser()
+    try:
+        response = await pool.request(
+            'GET', url, proxy_addr=proxy_addr, headers=headers or {}, timeout=timeout,
+            follow_redirects=True, stream=True)
+        try:
+            async for chunk in response.aiter_text():
+                parser.feed(chunk)
+        finally:
+            await response.aclose()
+    except Exception:
+        pass
+    try:
+        return parser.close()
+    except Exception:
+        return parser.playlist
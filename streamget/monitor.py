@@ -0,0 +1,324 @@
+import asyncio
+import heapq
+import inspect
+import itertools
+import random
+import time
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from .batch import BatchResolver, PlatformSpec
+from .data import StreamData
+
+LIVE = 'live'
+OFFLINE = 'offline'
+ERROR = 'error'
+
+
+@dataclass
+class WatchedRoom:
+    """
+    The monitoring state of a single room.
+
+    Attributes:
+        platform (str | type[BaseLiveStream] | BaseLiveStream): The platform class, its name or an instance.
+        url (str): The room URL.
+        quality (str | int | None): The video quality requested when the room goes live.
+        is_live (bool | None): The last known live status, or None before the first check.
+        stream (StreamData | None): The stream resolved when the room last went live.
+        checks (int): Number of completed status checks.
+        offline_checks (int): Number of consecutive checks that found the room offline.
+        failures (int): Number of consecutive checks that raised an error.
+        go_live_hours (list[int]): How many times the anchor went live in each local hour of the day (0-23).
+        next_check (float): `time.monotonic()` timestamp of the next scheduled check.
+    """
+    platform: PlatformSpec
+    url: str
+    quality: str | int | None = None
+    is_live: bool | None = None
+    stream: StreamData | None = None
+    checks: int = 0
+    offline_checks: int = 0
+    failures: int = 0
+    go_live_hours: list[int] = field(default_factory=lambda: [0] * 24)
+    next_check: float = 0.0
+
+
+@dataclass
+class LiveEvent:
+    """
+    A change in the status of a watched room.
+
+    Attributes:
+        kind (str): "live" when the room went live, "offline" when it went offline, "error" when a check failed.
+        room (WatchedRoom): The room the event belongs to.
+        stream (StreamData | None): The resolved stream for "live" events.
+        error (BaseException | None): The exception for "error" events.
+        timestamp (float): Unix time of the event.
+    """
+    kind: str
+    room: WatchedRoom
+    stream: StreamData | None = None
+    error: BaseException | None = None
+    timestamp: float = field(default_factory=time.time)
+
+
+class LiveMonitor:
+    """
+    Watches many rooms and reports when they go live or offline.
+
+    Rooms are kept in a priority queue ordered by their next check. Offline rooms are checked with
+    exponential backoff, from `min_interval` up to `max_interval` seconds, except around the hours of the
+    day in which the anchor usually goes live, when they are checked every `min_interval` seconds. Live
+    rooms are checked every `live_interval` seconds. Status checks use the platform's lightweight
+    `fetch_live_status`; the stream URLs are resolved with `fetch_stream_url` only when a room goes live,
+    from the room data of the status check when it fetched it.
+
+    Example:
+        >>> async def main():
+        ...     monitor = LiveMonitor(min_interval=30, max_interval=600)
+        ...     monitor.add_room('HuyaLiveStream', 'https://www.huya.com/52333', 'OD')
+        ...     monitor.add_room(DouyinLiveStream, 'https://live.douyin.com/745964462470')
+        ...     async for event in monitor.events():
+        ...         if event.kind == 'live':
+        ...             print('live:', event.stream.anchor_name, event.stream.record_url)
+        ...         elif event.kind == 'offline':
+        ...             print('offline:', event.room.url)
+        >>> asyncio.run(main())
+    """
+
+    def __init__(
+            self,
+            min_interval: float = 30,
+            max_interval: float = 600,
+            live_interval: float = 60,
+            backoff_factor: float = 1.5,
+            hot_share: float = 0.2,
+            jitter: float = 0.1,
+            resolver: BatchResolver | None = None,
+    ):
+        """
+        Initializes a new monitor.
+
+        Args:
+            min_interval (float): Shortest delay between two checks of an offline room, in seconds. Defaults to 30.
+            max_interval (float): Longest delay between two checks of an offline room, in seconds. Defaults to 600.
+            live_interval (float): Delay between two checks of a live room, in seconds. Defaults to 60.
+            backoff_factor (float): Factor applied to the delay after each offline check. Defaults to 1.5.
+            hot_share (float): Share of a room's past go-live events that must fall in the current or the next
+                hour for the room to be checked every `min_interval` seconds. Defaults to 0.2.
+            jitter (float): Random spread applied to every delay, as a fraction of it. Defaults to 0.1.
+            resolver (BatchResolver | None): The resolver providing platform instances and concurrency limits.
+                Defaults to a new `BatchResolver`.
+        """
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.live_interval = live_interval
+        self.backoff_factor = backoff_factor
+        self.hot_share = hot_share
+        self.jitter = jitter
+        self.resolver = resolver or BatchResolver()
+        self._rooms: dict[str, WatchedRoom] = {}
+        self._queue: list[tuple[float, int, str]] = []
+        self._counter = itertools.count()
+        self._wakeup: asyncio.Event | None = None
+        self._stopped = False
+
+    def add_room(
+            self,
+            platform: PlatformSpec,
+            url: str,
+            quality: str | int | None = None,
+            go_live_hours: list[int] | None = None
+    ) -> WatchedRoom:
+        """
+        Starts watching a room. It is checked as soon as the monitor runs.
+
+        Args:
+            platform (str | type[BaseLiveStream] | BaseLiveStream): The platform class, its name or an instance.
+            url (str): The room URL. Adding the same URL again replaces the previous entry.
+            quality (str | int | None): The video quality to resolve when the room goes live. Defaults to None.
+            go_live_hours (list[int] | None): A go-live histogram saved from a previous run (see `WatchedRoom`).
+                Defaults to None.
+
+        Returns:
+            WatchedRoom: The state of the room.
+        """
+        room = WatchedRoom(platform=platform, url=url, quality=quality)
+        if go_live_hours:
+            room.go_live_hours = list(go_live_hours)
+        self._rooms[url] = room
+        self._schedule(room, time.monotonic())
+        return room
+
+    def remove_room(self, url: str) -> None:
+        """
+        Stops watching a room.
+
+        Args:
+            url (str): The room URL.
+        """
+        self._rooms.pop(url, None)
+
+    def rooms(self) -> list[WatchedRoom]:
+        """
+        Returns the state of every watched room, e.g. to persist the go-live histograms.
+        """
+        return list(self._rooms.values())
+
+    def stop(self) -> None:
+        """
+        Stops `run()` / `events()` after the checks in progress have finished.
+        """
+        self._stopped = True
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _schedule(self, room: WatchedRoom, due: float) -> None:
+        room.next_check = due
+        heapq.heappush(self._queue, (due, next(self._counter), room.url))
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _is_hot(self, room: WatchedRoom, now: float) -> bool:
+        total = sum(room.go_live_hours)
+        if not total:
+            return False
+        hour = time.localtime(now).tm_hour
+        recent = room.go_live_hours[hour] + room.go_live_hours[(hour + 1) % 24]
+        return recent / total >= self.hot_share
+
+    def next_interval(self, room: WatchedRoom, now: float | None = None) -> float:
+        """
+        Returns the delay in seconds before the next check of a room, without jitter.
+
+        Args:
+            room (WatchedRoom): The room.
+            now (float | None): Unix time used to look up the go-live histogram. Defaults to the current time.
+
+        Returns:
+            float: The delay in seconds.
+        """
+        if room.failures:
+            return min(self.max_interval, self.min_interval * self.backoff_factor ** room.failures)
+        if room.is_live:
+            return self.live_interval
+        if self._is_hot(room, time.time() if now is None else now):
+            return self.min_interval
+        return min(self.max_interval, self.min_interval * self.backoff_factor ** room.offline_checks)
+
+    def _delay(self, room: WatchedRoom) -> float:
+        delay = self.next_interval(room)
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    async def _emit(self, handler: Callable, event: LiveEvent) -> None:
+        result = handler(event)
+        if inspect.isawaitable(result):
+            await result
+
+    async def check_room(self, room: WatchedRoom, handler: Callable[[LiveEvent], Any]) -> None:
+        """
+        Checks a room once, emits an event if its status changed and schedules the next check.
+
+        Args:
+            room (WatchedRoom): The room to check.
+            handler (Callable[[LiveEvent], Any]): Called (and awaited if it returns an awaitable) with each event.
+        """
+        event = None
+        try:
+            instance = self.resolver.get_instance(room.platform)
+            async with self.resolver.get_limit(), self.resolver.get_limit(type(instance).__name__):
+                is_live, json_data = await instance.fetch_live_status(room.url)
+                stream = None
+                if is_live and not room.is_live:
+                    if json_data is None:
+                        json_data = await instance.fetch_web_stream_data(room.url)
+                    stream = await instance.fetch_stream_url(json_data, room.quality)
+                    is_live = bool(stream.is_live)
+        except Exception as e:
+            room.failures += 1
+            event = LiveEvent(kind=ERROR, room=room, error=e)
+        else:
+            room.failures = 0
+            room.checks += 1
+            if is_live and not room.is_live:
+                if room.is_live is False:
+                    # Only a transition observed by the monitor tells when the anchor usually starts.
+                    room.go_live_hours[time.localtime().tm_hour] += 1
+                room.stream = stream
+                room.offline_checks = 0
+                event = LiveEvent(kind=LIVE, room=room, stream=stream)
+            elif not is_live and room.is_live:
+                room.offline_checks = 0
+                event = LiveEvent(kind=OFFLINE, room=room)
+            elif not is_live:
+                room.offline_checks += 1
+            room.is_live = is_live
+
+        if self._rooms.get(room.url) is room:
+            self._schedule(room, time.monotonic() + self._delay(room))
+        if event is not None:
+            await self._emit(handler, event)
+
+    async def run(self, handler: Callable[[LiveEvent], Any]) -> None:
+        """
+        Runs the monitor until `stop()` is called, passing every event to `handler`.
+
+        Args:
+            handler (Callable[[LiveEvent], Any]): Called (and awaited if it returns an awaitable) with each event.
+        """
+        self._stopped = False
+        self._wakeup = asyncio.Event()
+        tasks: set[asyncio.Task] = set()
+        try:
+            while not self._stopped:
+                now = time.monotonic()
+                while self._queue and self._queue[0][0] <= now:
+                    due, _, url = heapq.heappop(self._queue)
+                    room = self._rooms.get(url)
+                    if room is None or room.next_check != due:
+                        # Removed or rescheduled since this entry was queued.
+                        continue
+                    task = asyncio.ensure_future(self.check_room(room, handler))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+
+                timeout = self._queue[0][0] - now if self._queue else None
+                self._wakeup.clear()
+                waiter = asyncio.ensure_future(self._wakeup.wait())
+                try:
+                    await asyncio.wait({waiter}, timeout=timeout)
+                finally:
+                    waiter.cancel()
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            for task in tasks:
+                task.cancel()
+            self._wakeup = None
+
+    async def events(self) -> AsyncIterator[LiveEvent]:
+        """
+        Runs the monitor and yields events as they happen, until `stop()` is called.
+
+        Yields:
+            LiveEvent: A "live", "offline" or "error" event.
+        """
+        queue: asyncio.Queue[LiveEvent] = asyncio.Queue()
+        runner = asyncio.ensure_future(self.run(queue.put))
+        try:
+            while True:
+                getter = asyncio.ensure_future(queue.get())
+                done, _ = await asyncio.wait({getter, runner}, return_when=asyncio.FIRST_COMPLETED)
+                if getter in done:
+                    yield getter.result()
+                    continue
+                getter.cancel()
+                while not queue.empty():
+                    yield queue.get_nowait()
+                runner.result()
+                return
+        finally:
+            runner.cancel()
+            await asyncio.gather(runner, return_exceptions=True)
@@ -0,0 +1,73 @@
+import importlib
+
+# Maps each platform class to the package under streamget.platforms that defines it. Platform modules are
+# only imported when their class is first used, see `load_platform`.
+PLATFORM_MODULES: dict[str, str] = {
+    'AcfunLiveStream': 'acfun',
+    'BaiduLiveStream': 'baidu',
+    'BigoLiveStream': 'bigo',
+    'BilibiliLiveStream': 'bilibili',
+    'BluedLiveStream': 'blued',
+    'ChangliaoLiveStream': 'changliao',
+    'ChzzkLiveStream': 'chzzk',
+    'DouyinLiveStream': 'douyin',
+    'DouyuLiveStream': 'douyu',
+    'FaceitLiveStream': 'faceit',
+    'FlexTVLiveStream': 'flextv',
+    'HaixiuLiveStream': 'haixiu',
+    'HuajiaoLiveStream': 'huajiao',
+    'HuamaoLiveStream': 'huamao',
+    'HuyaLiveStream': 'huya',
+    'InkeLiveStream': 'inke',
+    'JDLiveStream': 'jd',
+    'KwaiLiveStream': 'kuaishou',
+    'KugouLiveStream': 'kugou',
+    'LaixiuLiveStream': 'laixiu',
+    'LangLiveStream': 'langlive',
+    'LehaiLiveStream': 'lehai',
+    'LianJieLiveStream': 'lianjie',
+    'LiveMeLiveStream': 'liveme',
+    'LookLiveStream': 'look',
+    'MaoerLiveStream': 'maoer',
+    'MiguLiveStream': 'migu',
+    'NeteaseLiveStream': 'netease',
+    'PandaLiveStream': 'pandatv',
+    'PiaopaioLiveStream': 'piaopiao',
+    'PicartoLiveStream': 'picarto',
+    'PopkonTVLiveStream': 'popkontv',
+    'QiandureboLiveStream': 'qiandurebo',
+    'RedNoteLiveStream': 'rednote',
+    'ShopeeLiveStream': 'shopee',
+    'ShowRoomLiveStream': 'showroom',
+    'SixRoomLiveStream': 'sixroom',
+    'SoopLiveStream': 'soop',
+    'TaobaoLiveStream': 'taobao',
+    'TikTokLiveStream': 'tiktok',
+    'TwitCastingLiveStream': 'twitcasting',
+    'TwitchLiveStream': 'twitch',
+    'VVXQLiveStream': 'vvxq',
+    'WeiboLiveStream': 'weibo',
+    'WinkTVLiveStream': 'winktv',
+    'YinboLiveStream': 'yinbo',
+    'YiqiLiveStream': 'yiqilive',
+    'YoutubeLiveStream': 'youtube',
+    'YYLiveStream': 'yy',
+    'ZhihuLiveStream': 'zhihu',
+}
+
+
+def load_platform(name: str) -> type:
+    """
+    Imports a platform module and returns its class.
+
+    Args:
+        name (str): The class name, e.g. "DouyinLiveStream".
+
+    Returns:
+        type[BaseLiveStream]: The platform class.
+
+    Raises:
+        KeyError: If no platform has this class name.
+    """
+    module = importlib.import_module(f'{__name__}.{PLATFORM_MODULES[name]}.live_stream')
+    return getattr(module, name)
@@ -1,13 +1,92 @@
-import re
+import copy
+import functools
+import types
 import urllib.parse
 
-from ..requests.async_http import async_req
+from ..cache import ResultCache, canonical_room_url
+from ..cdn_ranker import CdnRanker
+from ..data import StreamData
+from ..m3u8 import fetch_playlist
+from ..requests import instrument
+
+# Platform methods timed as stages when timing callbacks are registered, see `streamget.requests.instrument`.
+TIMED_STAGES = ('fetch_web_stream_data', 'fetch_stream_url')
+
+
+class instance_or_class_method:  # noqa: N801 - used like staticmethod and classmethod
+    """
+    Declares a method that was a staticmethod and now uses the instance settings (proxy, cookies).
+
+    Called on an instance it is bound to that instance. Called on the class, as the staticmethod used to be,
+    it is bound to a new instance with the default settings, so `Platform.method(...)` keeps working.
+    """
+
+    def __init__(self, func):
+        self.__func__ = func
+        functools.update_wrapper(self, func)
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            instance = owner()
+        return types.MethodType(self.__func__, instance)
+
+
+def _timed_stage(name: str, func):
+    @functools.wraps(func)
+    async def wrapper(self, *args, **kwargs):
+        if not instrument.is_enabled():
+            return await func(self, *args, **kwargs)
+        return await instrument.run_stage(type(self).__name__, name, func, self, *args, **kwargs)
+
+    wrapper.__timed_stage__ = True
+    return wrapper
+
+
+def _timed_static_stage(platform: str, name: str, func):
+    # For stages declared as a staticmethod or classmethod, which have no instance to name the platform.
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        if not instrument.is_enabled():
+            return await func(*args, **kwargs)
+        return await instrument.run_stage(platform, name, func, *args, **kwargs)
+
+    wrapper.__timed_stage__ = True
+    return wrapper
 
 
 class BaseLiveStream:
     """
     Base class for live stream fetchers.
+
+    Attributes:
+        result_cache (ResultCache | None): The cache used by `fetch_stream`. Set it on `BaseLiveStream` to
+            cache every platform, on a platform class or on a single instance. Defaults to None (no caching).
+        verify_streams (bool): Whether platforms that return backup CDN URLs (Huya, Douyu) probe them and keep
+            only the working ones. Platforms that always check their stream (Douyin, TikTok) ignore it.
+            Defaults to False.
+        cdn_ranker (CdnRanker | None): Orders the CDN URLs of platforms that offer several (Huya, Bilibili, Douyu)
+            by measured latency, fastest first. Defaults to None (keep the platform's order).
     """
+    result_cache: ResultCache | None = None
+    verify_streams: bool = False
+    cdn_ranker: CdnRanker | None = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # The stages of every platform are timed without changing the platform classes.
+        for name in TIMED_STAGES:
+            func = cls.__dict__.get(name)
+            if func is None or getattr(getattr(func, '__func__', func), '__timed_stage__', False):
+                continue
+            if isinstance(func, staticmethod):
+                setattr(cls, name, staticmethod(_timed_static_stage(cls.__name__, name, func.__func__)))
+            elif isinstance(func, classmethod):
+                setattr(cls, name, classmethod(_timed_static_stage(cls.__name__, name, func.__func__)))
+            elif isinstance(func, instance_or_class_method):
+                setattr(cls, name, instance_or_class_method(_timed_stage(name, func.__func__)))
+            else:
+                setattr(cls, name, _timed_stage(name, func))
+
     def __init__(self, proxy_addr: str | None = None, cookies: str | None = None):
         """
         Initializes a new instance of BaseLiveStream.
@@ -47,6 +126,85 @@ class BaseLiveStream:
             'cookie': self.cookies or ''
         }
 
+    def get_room_key(self, url: str) -> str:
+        """
+        Returns the canonical form of a room URL used as the `result_cache` key.
+
+        Args:
+            url (str): The room URL.
+
+        Returns:
+            str: The canonical room key.
+        """
+        return canonical_room_url(url)
+
+    async def fetch_stream(self, url: str, quality: str | int | None = None) -> StreamData:
+        """
+        Fetches the room data and resolves the stream URLs in one call.
+
+        This is `fetch_web_stream_data` followed by `fetch_stream_url`. When `result_cache` is set, results
+        are cached per (platform, room, quality, proxy, cookies), so callers asking for the same room within the
+        TTL share one upstream lookup.
+
+        Args:
+            url (str): The room URL.
+            quality (str | int | None): The requested video quality. Defaults to None (original quality).
+
+        Returns:
+            StreamData: The resolved stream.
+        """
+        async def fetch():
+            json_data = await self.fetch_web_stream_data(url)
+            return await self.fetch_stream_url(json_data, quality)
+
+        if self.result_cache is None:
+            return await fetch()
+        # Rooms resolved through another proxy or with other cookies (e.g. a logged-in account) may differ.
+        key = (type(self).__name__, self.get_room_key(url), None if quality is None else str(quality).upper(),
+               self.proxy_addr, self.cookies)
+        return await self.result_cache.get_or_fetch(key, fetch)
+
+    async def check_live_status(self, url: str) -> bool:
+        """
+        Checks whether a room is live, without resolving its stream URLs.
+
+        Platforms override this, or `fetch_live_status`, with the smallest request that tells the live
+        status. The default implementation uses the live status of `fetch_web_stream_data`, and only
+        resolves the stream with `fetch_stream_url` when the room data does not include it.
+
+        Args:
+            url (str): The room URL.
+
+        Returns:
+            bool: True if the room is live.
+        """
+        is_live, _ = await self.fetch_live_status(url)
+        return is_live
+
+    async def fetch_live_status(self, url: str) -> tuple[bool, dict | None]:
+        """
+        Checks whether a room is live, and returns the room data if the check fetched it.
+
+        The room data can be passed to `fetch_stream_url`, so a room that turns out to be live is resolved
+        without fetching it again. It is None when the platform checks the status with a lighter request
+        (`check_live_status`).
+
+        Args:
+            url (str): The room URL.
+
+        Returns:
+            tuple[bool, dict | None]: Whether the room is live, and the output of `fetch_web_stream_data` or
+                None.
+        """
+        if type(self).check_live_status is not BaseLiveStream.check_live_status:
+            return await self.check_live_status(url), None
+        json_data = await self.fetch_web_stream_data(url)
+        if isinstance(json_data, dict) and 'is_live' in json_data:
+            return bool(json_data['is_live']), json_data
+        # fetch_stream_url may modify the room data, which is returned for a later call.
+        stream = await self.fetch_stream_url(copy.deepcopy(json_data))
+        return bool(stream.is_live), json_data
+
     @staticmethod
     def get_quality_index(quality: str | int | None = None) -> tuple:
         """
@@ -161,17 +319,9 @@ class BaseLiveStream:
         Returns:
             List[str]: A list of play URLs sorted by bandwidth (highest first).
         """
-        resp = await async_req(m3u8, proxy_addr=proxy, headers=headers)
-        play_url_list = []
-        for i in resp.split('\n'):
-            if i.startswith('https://'):
-                play_url_list.append(i.strip())
+        playlist = await fetch_playlist(m3u8, proxy_addr=proxy, headers=headers)
+        streams = playlist.sorted_streams()
+        play_url_list = [stream.uri for stream in streams if stream.uri.startswith('https://')]
         if not play_url_list:
-            for i in resp.split('\n'):
-                if i.strip().endswith('m3u8'):
-                    play_url_list.append(i.strip())
-        bandwidth_pattern = re.compile(r'BANDWIDTH=(\d+)')
-        bandwidth_list = bandwidth_pattern.findall(resp)
-        url_to_bandwidth = {url: int(bandwidth) for bandwidth, url in zip(bandwidth_list, play_url_list)}
-        play_url_list = sorted(play_url_list, key=lambda url: url_to_bandwidth[url], reverse=True)
+            play_url_list = [stream.uri for stream in streams if stream.uri.endswith('m3u8')]
         return play_url_list
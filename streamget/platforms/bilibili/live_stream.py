@@ -1,3 +1,4 @@
+import asyncio
 import json
 import urllib.parse
 from operator import itemgetter
@@ -11,8 +12,18 @@ class BilibiliLiveStream(BaseLiveStream):
     """
     A class for fetching and processing Bilibili live stream information.
     """
-    def __init__(self, proxy_addr: str | None = None, cookies: str | None = None):
+    def __init__(self, proxy_addr: str | None = None, cookies: str | None = None, single_request: bool = False):
+        """
+        Initializes a new instance of BilibiliLiveStream.
+
+        Args:
+            proxy_addr (str | None): The proxy address to use for requests. Defaults to None.
+            cookies (str | None): The cookies to include in requests. Defaults to None.
+            single_request (bool): Read the room status, title and anchor name from the getH5InfoByRoom
+                response alone instead of also requesting room_init. Defaults to False.
+        """
         super().__init__(proxy_addr, cookies)
+        self.single_request = single_request
         self.mobile_headers = self._get_mobile_headers()
         self.pc_headers = self._get_pc_headers()
 
@@ -35,13 +46,20 @@ class BilibiliLiveStream(BaseLiveStream):
             'referer': 'https://live.bilibili.com/26066074',
         }
 
-    async def _get_bilibili_room_info_h5(self, url: str) -> str:
-        room_id = url.split('?')[0].rsplit('/', maxsplit=1)[1]
+    async def _get_room_init(self, room_id: str) -> dict:
+        api = f'https://api.live.bilibili.com/room/v1/Room/room_init?id={room_id}'
+        json_str = await async_req(api, proxy_addr=self.proxy_addr, headers=self.pc_headers)
+        return json.loads(json_str)['data']
+
+    async def _get_room_info_h5(self, room_id: str) -> dict:
         api = f'https://api.live.bilibili.com/xlive/web-room/v1/index/getH5InfoByRoom?room_id={room_id}'
         json_str = await async_req(api, proxy_addr=self.proxy_addr, headers=self.pc_headers)
-        room_info = json.loads(json_str)
-        title = room_info['data']['room_info']['title'] if room_info.get('data') else ''
-        return title
+        return json.loads(json_str).get('data') or {}
+
+    async def _get_anchor_name(self, uid: int) -> str:
+        api = f'https://api.live.bilibili.com/live_user/v1/Master/info?uid={uid}'
+        json_str = await async_req(api, proxy_addr=self.proxy_addr, headers=self.pc_headers)
+        return json.loads(json_str)['data']['info']['uname']
 
     async def get_bilibili_stream_data(self, url: str, qn: str = '10000', platform: str = 'web') -> str | None:
 
@@ -55,6 +73,11 @@ class BilibiliLiveStream(BaseLiveStream):
         json_str = await async_req(play_api, proxy_addr=self.proxy_addr, headers=self.pc_headers)
         json_data = json.loads(json_str)
         if json_data and json_data['code'] == 0:
+            if self.cdn_ranker:
+                ranked = await self.cdn_ranker.rank(
+                    [i['url'] for i in json_data['data']['durl']], proxy_addr=self.proxy_addr, headers=self.pc_headers)
+                if ranked:
+                    return ranked[0]
             for i in json_data['data']['durl']:
                 if 'd1--cn-gotcha' in i['url']:
                     return i['url']
@@ -91,11 +114,25 @@ class BilibiliLiveStream(BaseLiveStream):
             select_stream_index = min(video_quality_options[qn], qn_count - 1)
             stream_data: dict = sorted_stream_list[select_stream_index]
             base_url = stream_data['base_url']
+            if self.cdn_ranker:
+                ranked = await self.cdn_ranker.rank(
+                    [i['host'] + base_url + i['extra'] for i in stream_data['url_info']],
+                    proxy_addr=self.proxy_addr, headers=self.pc_headers)
+                if ranked:
+                    return ranked[0]
             host = stream_data['url_info'][0]['host']
             extra = stream_data['url_info'][0]['extra']
             m3u8_url = host + base_url + extra
             return m3u8_url
 
+    async def check_live_status(self, url: str) -> bool:
+        """
+        Checks whether a room is live with a single room_init request.
+        """
+        room_id = url.split('?')[0].rsplit('/', maxsplit=1)[1]
+        room_init = await self._get_room_init(room_id)
+        return room_init['live_status'] == 1
+
     async def fetch_web_stream_data(self, url: str, process_data: bool = True) -> dict:
         """
         Fetches web stream data for a live room.
@@ -109,18 +146,26 @@ class BilibiliLiveStream(BaseLiveStream):
         """
         try:
             room_id = url.split('?')[0].rsplit('/', maxsplit=1)[1]
-            json_str = await async_req(f'https://api.live.bilibili.com/room/v1/Room/room_init?id={room_id}',
-                                       proxy_addr=self.proxy_addr, headers=self.pc_headers)
-            room_info = json.loads(json_str)
-            uid = room_info['data']['uid']
-            live_status = True if room_info['data']['live_status'] == 1 else False
-
-            api = f'https://api.live.bilibili.com/live_user/v1/Master/info?uid={uid}'
-            json_str2 = await async_req(api, proxy_addr=self.proxy_addr, headers=self.pc_headers)
-            anchor_info = json.loads(json_str2)
-            anchor_name = anchor_info['data']['info']['uname']
-
-            title = await self._get_bilibili_room_info_h5(url)
+            if self.single_request:
+                room_init = None
+                h5_info = await self._get_room_info_h5(room_id)
+                if not h5_info.get('room_info'):
+                    room_init = await self._get_room_init(room_id)
+            else:
+                # Both lookups only need the room id, so they are sent together.
+                room_init, h5_info = await asyncio.gather(
+                    self._get_room_init(room_id), self._get_room_info_h5(room_id))
+
+            h5_room_info = h5_info.get('room_info') or {}
+            status_info = room_init or h5_room_info
+            uid = status_info['uid']
+            live_status = True if status_info['live_status'] == 1 else False
+            title = h5_room_info.get('title', '')
+
+            anchor_name = ((h5_info.get('anchor_info') or {}).get('base_info') or {}).get('uname')
+            if not anchor_name:
+                anchor_name = await self._get_anchor_name(uid)
+
             live_url = 'https://live.bilibili.com/' + str(room_id)
             return {"anchor_name": anchor_name, "live_status": live_status, "room_url": live_url, "title": title}
         except Exception as e:
@@ -20,6 +20,13 @@ class ChzzkLiveStream(BaseLiveStream):
             'cookie': self.cookies or '',
         }
 
+    async def check_live_status(self, url: str) -> bool:
+        """
+        Checks whether a channel is live from the live detail only, without fetching the master playlist.
+        """
+        json_data = await self.fetch_web_stream_data(url, process_data=False)
+        return json_data['content']['status'] == 'OPEN'
+
     async def fetch_web_stream_data(self, url: str, process_data: bool = True) -> dict:
         """
         Fetches web stream data for a live room.
@@ -1,28 +1,50 @@
-import math
+import functools
+import struct
 import time
 
+_MASK = 0xFFFFFFFF
+_unpack_block = struct.Struct('>16I').unpack_from
+_pack_digest = struct.Struct('>8I').pack
 
-def rc4_encrypt(plaintext: str, key: str) -> str:
-    # 初始化状态数组
-    s = list(range(256))
 
-    # 使用密钥对状态数组进行置换
+@functools.lru_cache(maxsize=64)
+def _rc4_key_schedule(key: str) -> bytes:
+    # 初始化状态数组并使用密钥进行置换，同一个密钥只计算一次
+    s = list(range(256))
+    key_codes = [ord(char) for char in key]
+    key_len = len(key_codes)
     j = 0
     for i in range(256):
-        j = (j + s[i] + ord(key[i % len(key)])) % 256
+        j = (j + s[i] + key_codes[i % key_len]) & 255
         s[i], s[j] = s[j], s[i]
+    return bytes(s)
+
+
+def rc4_encrypt(plaintext: str, key: str) -> str:
+    s = bytearray(_rc4_key_schedule(key))
+
+    # 字符都在 0-255 范围内时按字节处理，否则逐字符处理
+    try:
+        data = plaintext.encode('latin-1')
+    except UnicodeEncodeError:
+        data = None
+    codes = data if data is not None else [ord(char) for char in plaintext]
 
     # 生成密钥流并加密
     i = j = 0
-    result = []
-    for char in plaintext:
-        i = (i + 1) % 256
-        j = (j + s[i]) % 256
-        s[i], s[j] = s[j], s[i]
-        t = (s[i] + s[j]) % 256
-        result.append(chr(s[t] ^ ord(char)))
+    result = [0] * len(codes)
+    for index, code in enumerate(codes):
+        i = (i + 1) & 255
+        si = s[i]
+        j = (j + si) & 255
+        sj = s[j]
+        s[i] = sj
+        s[j] = si
+        result[index] = s[(si + sj) & 255] ^ code
 
-    return ''.join(result)
+    if data is not None:
+        return bytes(result).decode('latin-1')
+    return ''.join(map(chr, result))
 
 
 def left_rotate(x: int, n: int) -> int:
@@ -57,10 +79,129 @@ def gg_j(j: int, x: int, y: int, z: int) -> int:
         raise ValueError("invalid j for bool function GG")
 
 
+# 预先计算每一轮循环左移后的常量 T_j <<< j
+_ROTATED_T = tuple(left_rotate(get_t_j(j), j) for j in range(64))
+
+
+def _sm3_compress(reg: list[int], data, offset: int = 0, mask: int = _MASK, t: tuple = _ROTATED_T) -> None:
+    # 消息扩展
+    w = list(_unpack_block(data, offset))
+    append = w.append
+    for j in range(16, 68):
+        x = w[j - 3]
+        x = w[j - 16] ^ w[j - 9] ^ (((x << 15) | (x >> 17)) & mask)
+        x ^= (((x << 15) | (x >> 17)) & mask) ^ (((x << 23) | (x >> 9)) & mask)
+        y = w[j - 13]
+        append(x ^ (((y << 7) | (y >> 25)) & mask) ^ w[j - 6])
+
+    # 压缩：每次循环展开 4 轮，轮换寄存器的角色而不是逐个赋值；
+    # 前 16 轮与后 48 轮使用不同的布尔函数，拆成两个循环避免逐轮分支
+    a, b, c, d, e, f, g, h = reg
+    for j in range(0, 16, 4):
+        a12 = ((a << 12) | (a >> 20)) & mask
+        ss1 = (a12 + e + t[j]) & mask
+        ss1 = ((ss1 << 7) | (ss1 >> 25)) & mask
+        wj = w[j]
+        tt1 = ((a ^ b ^ c) + d + (ss1 ^ a12) + (wj ^ w[j + 4])) & mask
+        tt2 = ((e ^ f ^ g) + h + ss1 + wj) & mask
+        b = ((b << 9) | (b >> 23)) & mask
+        f = ((f << 19) | (f >> 13)) & mask
+        d = tt1
+        h = tt2 ^ (((tt2 << 9) | (tt2 >> 23)) & mask) ^ (((tt2 << 17) | (tt2 >> 15)) & mask)
+
+        a12 = ((d << 12) | (d >> 20)) & mask
+        ss1 = (a12 + h + t[j + 1]) & mask
+        ss1 = ((ss1 << 7) | (ss1 >> 25)) & mask
+        wj = w[j + 1]
+        tt1 = ((d ^ a ^ b) + c + (ss1 ^ a12) + (wj ^ w[j + 5])) & mask
+        tt2 = ((h ^ e ^ f) + g + ss1 + wj) & mask
+        a = ((a << 9) | (a >> 23)) & mask
+        e = ((e << 19) | (e >> 13)) & mask
+        c = tt1
+        g = tt2 ^ (((tt2 << 9) | (tt2 >> 23)) & mask) ^ (((tt2 << 17) | (tt2 >> 15)) & mask)
+
+        a12 = ((c << 12) | (c >> 20)) & mask
+        ss1 = (a12 + g + t[j + 2]) & mask
+        ss1 = ((ss1 << 7) | (ss1 >> 25)) & mask
+        wj = w[j + 2]
+        tt1 = ((c ^ d ^ a) + b + (ss1 ^ a12) + (wj ^ w[j + 6])) & mask
+        tt2 = ((g ^ h ^ e) + f + ss1 + wj) & mask
+        d = ((d << 9) | (d >> 23)) & mask
+        h = ((h << 19) | (h >> 13)) & mask
+        b = tt1
+        f = tt2 ^ (((tt2 << 9) | (tt2 >> 23)) & mask) ^ (((tt2 << 17) | (tt2 >> 15)) & mask)
+
+        a12 = ((b << 12) | (b >> 20)) & mask
+        ss1 = (a12 + f + t[j + 3]) & mask
+        ss1 = ((ss1 << 7) | (ss1 >> 25)) & mask
+        wj = w[j + 3]
+        tt1 = ((b ^ c ^ d) + a + (ss1 ^ a12) + (wj ^ w[j + 7])) & mask
+        tt2 = ((f ^ g ^ h) + e + ss1 + wj) & mask
+        c = ((c << 9) | (c >> 23)) & mask
+        g = ((g << 19) | (g >> 13)) & mask
+        a = tt1
+        e = tt2 ^ (((tt2 << 9) | (tt2 >> 23)) & mask) ^ (((tt2 << 17) | (tt2 >> 15)) & mask)
+
+    for j in range(16, 64, 4):
+        a12 = ((a << 12) | (a >> 20)) & mask
+        ss1 = (a12 + e + t[j]) & mask
+        ss1 = ((ss1 << 7) | (ss1 >> 25)) & mask
+        wj = w[j]
+        tt1 = (((a & b) | (c & (a | b))) + d + (ss1 ^ a12) + (wj ^ w[j + 4])) & mask
+        tt2 = ((g ^ (e & (f ^ g))) + h + ss1 + wj) & mask
+        b = ((b << 9) | (b >> 23)) & mask
+        f = ((f << 19) | (f >> 13)) & mask
+        d = tt1
+        h = tt2 ^ (((tt2 << 9) | (tt2 >> 23)) & mask) ^ (((tt2 << 17) | (tt2 >> 15)) & mask)
+
+        a12 = ((d << 12) | (d >> 20)) & mask
+        ss1 = (a12 + h + t[j + 1]) & mask
+        ss1 = ((ss1 << 7) | (ss1 >> 25)) & mask
+        wj = w[j + 1]
+        tt1 = (((d & a) | (b & (d | a))) + c + (ss1 ^ a12) + (wj ^ w[j + 5])) & mask
+        tt2 = ((f ^ (h & (e ^ f))) + g + ss1 + wj) & mask
+        a = ((a << 9) | (a >> 23)) & mask
+        e = ((e << 19) | (e >> 13)) & mask
+        c = tt1
+        g = tt2 ^ (((tt2 << 9) | (tt2 >> 23)) & mask) ^ (((tt2 << 17) | (tt2 >> 15)) & mask)
+
+        a12 = ((c << 12) | (c >> 20)) & mask
+        ss1 = (a12 + g + t[j + 2]) & mask
+        ss1 = ((ss1 << 7) | (ss1 >> 25)) & mask
+        wj = w[j + 2]
+        tt1 = (((c & d) | (a & (c | d))) + b + (ss1 ^ a12) + (wj ^ w[j + 6])) & mask
+        tt2 = ((e ^ (g & (h ^ e))) + f + ss1 + wj) & mask
+        d = ((d << 9) | (d >> 23)) & mask
+        h = ((h << 19) | (h >> 13)) & mask
+        b = tt1
+        f = tt2 ^ (((tt2 << 9) | (tt2 >> 23)) & mask) ^ (((tt2 << 17) | (tt2 >> 15)) & mask)
+
+        a12 = ((b << 12) | (b >> 20)) & mask
+        ss1 = (a12 + f + t[j + 3]) & mask
+        ss1 = ((ss1 << 7) | (ss1 >> 25)) & mask
+        wj = w[j + 3]
+        tt1 = (((b & c) | (d & (b | c))) + a + (ss1 ^ a12) + (wj ^ w[j + 7])) & mask
+        tt2 = ((h ^ (f & (g ^ h))) + e + ss1 + wj) & mask
+        c = ((c << 9) | (c >> 23)) & mask
+        g = ((g << 19) | (g >> 13)) & mask
+        a = tt1
+        e = tt2 ^ (((tt2 << 9) | (tt2 >> 23)) & mask) ^ (((tt2 << 17) | (tt2 >> 15)) & mask)
+
+    # 更新寄存器
+    reg[0] ^= a
+    reg[1] ^= b
+    reg[2] ^= c
+    reg[3] ^= d
+    reg[4] ^= e
+    reg[5] ^= f
+    reg[6] ^= g
+    reg[7] ^= h
+
+
 class SM3:
     def __init__(self):
         self.reg = []
-        self.chunk = []
+        self.chunk = bytearray()
         self.size = 0
         self.reset()
 
@@ -70,111 +211,35 @@ class SM3:
             1937774191, 1226093241, 388252375, 3666478592,
             2842636476, 372324522, 3817729613, 2969243214
         ]
-        self.chunk = []
+        self.chunk = bytearray()
         self.size = 0
 
     def write(self, data):
         # 将输入转换为字节数组
         if isinstance(data, str):
-            # 直接转换为UTF-8字节列表
-            a = list(data.encode('utf-8'))
-        else:
-            a = data
+            data = data.encode('utf-8')
 
-        self.size += len(a)
-        f = 64 - len(self.chunk)
+        self.size += len(data)
+        chunk = self.chunk
+        chunk += bytes(data)
 
-        if len(a) < f:
-            # 如果数据长度小于剩余空间，直接添加
-            self.chunk.extend(a)
-        else:
-            # 否则分块处理
-            self.chunk.extend(a[:f])
-
-            while len(self.chunk) >= 64:
-                self._compress(self.chunk)
-                if f < len(a):
-                    self.chunk = a[f:min(f + 64, len(a))]
-                else:
-                    self.chunk = []
-                f += 64
+        # 每满 64 字节压缩一次，剩余部分留到下次写入
+        full = len(chunk) - len(chunk) % 64
+        for offset in range(0, full, 64):
+            _sm3_compress(self.reg, chunk, offset)
+        del chunk[:full]
 
     def _fill(self):
-        # 计算比特长度
+        # 添加填充位，填充0直到剩余8字节用于存储长度，再添加64位消息长度
         bit_length = 8 * self.size
-
-        # 添加填充位
-        padding_pos = len(self.chunk)
         self.chunk.append(0x80)
-        padding_pos = (padding_pos + 1) % 64
-
-        # 如果剩余空间不足8字节，则填充到下一个块
-        if 64 - padding_pos < 8:
-            padding_pos -= 64
-
-        # 填充0直到剩余8字节用于存储长度
-        while padding_pos < 56:
-            self.chunk.append(0)
-            padding_pos += 1
-
-        # 添加消息长度（高32位）
-        high_bits = bit_length // 4294967296
-        for i in range(4):
-            self.chunk.append((high_bits >> (8 * (3 - i))) & 0xFF)
-
-        # 添加消息长度（低32位）
-        for i in range(4):
-            self.chunk.append((bit_length >> (8 * (3 - i))) & 0xFF)
+        self.chunk += bytes((56 - len(self.chunk)) % 64)
+        self.chunk += (bit_length & 0xFFFFFFFFFFFFFFFF).to_bytes(8, 'big')
 
     def _compress(self, data):
         if len(data) < 64:
             raise ValueError("compress error: not enough data")
-        else:
-            # 消息扩展
-            w = [0] * 132
-
-            # 将字节数组转换为字
-            for t in range(16):
-                w[t] = (data[4 * t] << 24) | (data[4 * t + 1] << 16) | (data[4 * t + 2] << 8) | data[4 * t + 3]
-                w[t] &= 0xFFFFFFFF
-
-            # 消息扩展
-            for j in range(16, 68):
-                a = w[j - 16] ^ w[j - 9] ^ left_rotate(w[j - 3], 15)
-                a = a ^ left_rotate(a, 15) ^ left_rotate(a, 23)
-                w[j] = (a ^ left_rotate(w[j - 13], 7) ^ w[j - 6]) & 0xFFFFFFFF
-
-            # 计算w'
-            for j in range(64):
-                w[j + 68] = (w[j] ^ w[j + 4]) & 0xFFFFFFFF
-
-            # 压缩
-            a, b, c, d, e, f, g, h = self.reg
-
-            for j in range(64):
-                ss1 = left_rotate((left_rotate(a, 12) + e + left_rotate(get_t_j(j), j)) & 0xFFFFFFFF, 7)
-                ss2 = ss1 ^ left_rotate(a, 12)
-                tt1 = (ff_j(j, a, b, c) + d + ss2 + w[j + 68]) & 0xFFFFFFFF
-                tt2 = (gg_j(j, e, f, g) + h + ss1 + w[j]) & 0xFFFFFFFF
-
-                d = c
-                c = left_rotate(b, 9)
-                b = a
-                a = tt1
-                h = g
-                g = left_rotate(f, 19)
-                f = e
-                e = (tt2 ^ left_rotate(tt2, 9) ^ left_rotate(tt2, 17)) & 0xFFFFFFFF
-
-            # 更新寄存器
-            self.reg[0] ^= a
-            self.reg[1] ^= b
-            self.reg[2] ^= c
-            self.reg[3] ^= d
-            self.reg[4] ^= e
-            self.reg[5] ^= f
-            self.reg[6] ^= g
-            self.reg[7] ^= h
+        _sm3_compress(self.reg, bytes(data[:64]))
 
     def sum(self, data=None, output_format=None):
         """
@@ -189,62 +254,61 @@ class SM3:
 
         # 分块压缩
         for f in range(0, len(self.chunk), 64):
-            self._compress(self.chunk[f:f + 64])
+            _sm3_compress(self.reg, self.chunk, f)
 
+        digest = _pack_digest(*self.reg)
         if output_format == 'hex':
             # 十六进制输出
-            result = ''.join(f'{val:08x}' for val in self.reg)
+            result = digest.hex()
         else:
             # 字节数组输出
-            result = []
-            for f in range(8):
-                c = self.reg[f]
-                result.append((c >> 24) & 0xFF)
-                result.append((c >> 16) & 0xFF)
-                result.append((c >> 8) & 0xFF)
-                result.append(c & 0xFF)
+            result = list(digest)
 
         self.reset()
         return result
 
 
-def result_encrypt(long_str: str, num: str | None = None) -> str:
-    # 魔改base64编码表
-    encoding_tables = {
-        "s0": "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/=",
-        "s1": "Dkdpgh4ZKsQB80/Mfvw36XI1R25+WUAlEi7NLboqYTOPuzmFjJnryx9HVGcaStCe=",
-        "s2": "Dkdpgh4ZKsQB80/Mfvw36XI1R25-WUAlEi7NLboqYTOPuzmFjJnryx9HVGcaStCe=",
-        "s3": "ckdp1h4ZKsUB80/Mfvw36XIgR25+WQAlEi7NLboqYTOPuzmFjJnryx9HVGDaStCe",
-        "s4": "Dkdpgh2ZmsQB80/MfvV36XI1R45-WUAlEixNLwoqYTOPuzKFjJnry79HbGcaStCe"
-    }
-
-    # 位移常量
-    masks = [16515072, 258048, 4032, 63]  # 对应 0, 1, 2 的掩码，添加63作为第四个掩码
-    shifts = [18, 12, 6, 0]  # 对应的位移量
+# 魔改base64编码表
+ENCODING_TABLES = {
+    "s0": "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/=",
+    "s1": "Dkdpgh4ZKsQB80/Mfvw36XI1R25+WUAlEi7NLboqYTOPuzmFjJnryx9HVGcaStCe=",
+    "s2": "Dkdpgh4ZKsQB80/Mfvw36XI1R25-WUAlEi7NLboqYTOPuzmFjJnryx9HVGcaStCe=",
+    "s3": "ckdp1h4ZKsUB80/Mfvw36XIgR25+WQAlEi7NLboqYTOPuzmFjJnryx9HVGDaStCe",
+    "s4": "Dkdpgh2ZmsQB80/MfvV36XI1R45-WUAlEixNLwoqYTOPuzKFjJnry79HbGcaStCe"
+}
 
-    encoding_table = encoding_tables[num]
 
-    result = ""
-    round_num = 0
-    long_int = get_long_int(round_num, long_str)
+@functools.cache
+def _pair_table(num: str) -> tuple[str, ...]:
+    # 每 12 位对应两个输出字符，一次查表代替两次掩码和位移
+    table = ENCODING_TABLES[num][:64]
+    return tuple(x + y for x in table for y in table)
 
-    total_chars = math.ceil(len(long_str) / 3 * 4)
 
-    for i in range(total_chars):
-        # 每4个字符处理一组3字节
-        if i // 4 != round_num:
-            round_num += 1
-            long_int = get_long_int(round_num, long_str)
+def result_encrypt(long_str: str, num: str | None = None) -> str:
+    pairs = _pair_table(num)
 
-        # 计算当前位置的索引
-        index = i % 4
+    try:
+        codes = long_str.encode('latin-1')
+    except UnicodeEncodeError:
+        codes = [ord(char) for char in long_str]
 
-        # 使用掩码和位移提取6位值
-        char_index = (long_int & masks[index]) >> shifts[index]
+    length = len(codes)
+    remainder = length % 3
+    if remainder:
+        # 末尾不足 3 字节时补 0，多出的字符在最后截掉
+        codes = list(codes) + [0] * (3 - remainder)
 
-        result += encoding_table[char_index]
+    # 每4个字符处理一组3字节
+    result = []
+    append = result.append
+    for i in range(0, len(codes), 3):
+        long_int = (codes[i] << 16) | (codes[i + 1] << 8) | codes[i + 2]
+        append(pairs[(long_int >> 12) & 4095])
+        append(pairs[long_int & 4095])
 
-    return result
+    total_chars = (length * 4 + 2) // 3
+    return ''.join(result)[:total_chars]
 
 
 def get_long_int(round_num: int, long_str: str) -> int:
@@ -270,6 +334,7 @@ def gener_random(random_num: int, option: list[int]) -> list[int]:
     ]
 
 
+@functools.cache
 def generate_random_str() -> str:
     """
     生成随机字符串
@@ -289,6 +354,38 @@ def generate_random_str() -> str:
     return ''.join(chr(b) for b in random_bytes)
 
 
+# 每个 UA 对应的摘要会被反复使用，只需保留少量最近使用的 UA
+UA_DIGEST_CACHE_SIZE = 256
+
+
+@functools.cache
+def _suffix_digest(suffix: str) -> tuple[int, ...]:
+    # 对后缀两次sm3之的结果，只与固定后缀有关
+    sm3 = SM3()
+    return tuple(sm3.sum(sm3.sum(suffix)))
+
+
+@functools.lru_cache(maxsize=UA_DIGEST_CACHE_SIZE)
+def _ua_digest(user_agent: str) -> tuple[int, ...]:
+    # 对ua进行rc4加密、编码后再sm3的结果，只与ua有关
+    ua_key = chr(0) + chr(1) + chr(14)  # [1/256, 1, 14]
+    return tuple(SM3().sum(result_encrypt(rc4_encrypt(user_agent, ua_key), "s3")))
+
+
+@functools.lru_cache(maxsize=16)
+def _window_env_codes(window_env_str: str) -> tuple[int, ...]:
+    return tuple(ord(char) for char in window_env_str)
+
+
+def clear_sign_cache() -> None:
+    """
+    清空按 UA、后缀和环境信息缓存的中间结果
+    """
+    _suffix_digest.cache_clear()
+    _ua_digest.cache_clear()
+    _window_env_codes.cache_clear()
+
+
 def generate_rc4_bb_str(url_search_params: str, user_agent: str, window_env_str: str,
                         suffix: str = "cus", arguments: list[int] | None = None) -> str:
     if arguments is None:
@@ -297,17 +394,13 @@ def generate_rc4_bb_str(url_search_params: str, user_agent: str, window_env_str:
     sm3 = SM3()
     start_time = int(time.time() * 1000)
 
-    # 三次加密处理
+    # 三次加密处理，只有第一步与请求参数有关，后两步的结果按后缀和ua缓存
     # 1: url_search_params两次sm3之的结果
     url_search_params_list = sm3.sum(sm3.sum(url_search_params + suffix))
     # 2: 对后缀两次sm3之的结果
-    cus = sm3.sum(sm3.sum(suffix))
+    cus = _suffix_digest(suffix)
     # 3: 对ua处理之后的结果
-    ua_key = chr(0) + chr(1) + chr(14)  # [1/256, 1, 14]
-    ua = sm3.sum(result_encrypt(
-        rc4_encrypt(user_agent, ua_key),
-        "s3"
-    ))
+    ua = _ua_digest(user_agent)
 
     end_time = start_time + 100
 
@@ -408,7 +501,7 @@ def generate_rc4_bb_str(url_search_params: str, user_agent: str, window_env_str:
     b[60] = (b[15]['aid'] >> 24) & 255
 
     # 处理环境信息
-    window_env_list = [ord(char) for char in window_env_str]
+    window_env_list = _window_env_codes(window_env_str)
     b[64] = len(window_env_list)
     b[65] = b[64] & 255
     b[66] = (b[64] >> 8) & 255
@@ -4,10 +4,14 @@ import urllib.parse
 
 from deprecated import deprecated
 
+from ...alias_cache import get_alias_cache
 from ...data import StreamData, wrap_stream
-from ...requests.async_http import async_req, get_response_status
+from ...requests.async_http import async_req
+from ...requests.instrument import sign_span
+from ...verifier import get_stream_verifier, quality_fallback_order
 from ..base import BaseLiveStream
 from .ab_sign import ab_sign
+from .rsc import FlightData
 from .utils import DouyinUtils, UnsupportedUrlError
 
 
@@ -97,7 +101,8 @@ class DouyinLiveStream(BaseLiveStream):
         }
 
         api = 'https://live.douyin.com/webcast/room/web/enter/?' + urllib.parse.urlencode(params)
-        a_bogus = ab_sign(urllib.parse.urlparse(api).query, headers['user-agent'])
+        with sign_span('a_bogus'):
+            a_bogus = ab_sign(urllib.parse.urlparse(api).query, headers['user-agent'])
         api += "&a_bogus=" + a_bogus
         json_str = await async_req(api, proxy_addr=self.proxy_addr, headers=headers)
         if not json_str:
@@ -149,27 +154,16 @@ class DouyinLiveStream(BaseLiveStream):
 
     async def _get_app_web_stream_data(self, url: str, process_data: bool = True):
         html_str = await async_req(url, proxy_addr=self.proxy_addr, headers=self.pc_headers)
-        match_json_str = re.search(
-            '</script><script >self.__rsc_f.push\\(\\[1,"(\\{.*?)"]\\)</script><script >self.__rsc_f.push', html_str)
-
-        if not match_json_str:
+        flight = FlightData.from_html(html_str)
+        del html_str
+        page_data = flight.find_first('data', lambda value: isinstance(value, dict) and 'room' in value)
+        if not page_data:
             raise Exception("Fetch stream data error")
 
-        json_str = match_json_str.group(1)
-        cleaned_string = json_str.replace('\\', '').replace(r'u0026', r'&').replace(
-            '"sdk_params":"', '"sdk_params":').replace('","enableEncryption', ',"enableEncryption')
-        cleaned_string = '{"data":' + cleaned_string.split(',"data":')[1]
-        json_data = json.loads(cleaned_string)
-
-        json_str2 = re.findall('</script><script >self.__rsc_f.push\\(\\[1,"5(.*?)</script>$', html_str)[-1]
-        json_str2 = json_str2.replace('\\\\\\"', '"').replace('\\"', '"').replace('"{', '{').replace('}"', '}')
-        json_str2 = json_str2.split(':["$","$L7",null,', maxsplit=1)[-1].split(']\\n"])', maxsplit=1)[0]
-        json_data2 = json.loads(json_str2)
-
         if not process_data:
-            return json_data2
+            return {'data': page_data}
 
-        room_data = json_data2['data']['room']
+        room_data = page_data['room']
         room_data['anchor_name'] = room_data['owner']['nickname']
         room_data['live_url'] = "http://live.douyin.com/live/" + room_data['owner']['webRid']
 
@@ -183,25 +177,31 @@ class DouyinLiveStream(BaseLiveStream):
 
         if orientation == 2:
             room_data['stream_orientation'] = 2
-            stream_data_str = list(pull_datas.values())[0]['streamData']
-            stream_data = json.loads(stream_data_str)
+            stream_data = flight.resolve(list(pull_datas.values())[0]['streamData'])
+            if isinstance(stream_data, str):
+                stream_data = json.loads(stream_data)
             sorted_stream_data = self.sort_streams_by_bitrate(stream_data["data"])
             hls_pull_url_map = {}
             flv_pull_url_map = {}
             for i in sorted_stream_data:
                 hls_pull_url_map[i["name"]] = i['hls']
                 flv_pull_url_map[i["name"]] = i['flv']
-                room_data['stream_url']['hls_pull_url_map'] = hls_pull_url_map
-                room_data['stream_url']['flv_pull_url'] = flv_pull_url_map
+                stream_url['hls_pull_url_map'] = hls_pull_url_map
+                stream_url['flv_pull_url'] = flv_pull_url_map
             return room_data
         else:
             room_data['stream_orientation'] = 1
-            stream_data = stream_url['liveCoreSdkData']['pullData']['streamData']
-            if orientation == 1 and not stream_data.startswith('$'):
-                origin_data = json.loads(stream_data)['data']['origin']['main']
+            stream_data = flight.resolve(stream_url['liveCoreSdkData']['pullData']['streamData'])
+            if isinstance(stream_data, str) and not stream_data.startswith('$'):
+                stream_data = json.loads(stream_data)
+            if isinstance(stream_data, dict) and 'origin' in stream_data.get('data', {}):
+                origin_data = stream_data['data']['origin']['main']
             else:
-                origin_data = json_data['data']['origin']['main']
+                origin = flight.find_first('origin', lambda value: isinstance(value, dict) and 'main' in value)
+                origin_data = origin['main']
             sdk_params = origin_data['sdk_params']
+            if isinstance(sdk_params, str):
+                sdk_params = json.loads(sdk_params)
             origin_hls_codec = sdk_params.get('VCodec') or ''
             origin_m3u8 = {'ORIGIN': origin_data["hls"] + '&codec=' + origin_hls_codec}
             origin_flv = {'ORIGIN': origin_data["flv"] + '&codec=' + origin_hls_codec}
@@ -230,11 +230,19 @@ class DouyinLiveStream(BaseLiveStream):
                 if 'https://live.douyin.com/' in url:
                     web_rid = url.split('?')[0].rsplit('/', maxsplit=1)[-1]
                 else:
-                    html_str = await async_req(url, proxy_addr=self.proxy_addr, headers=self.pc_headers)
-                    web_rid = re.search('webRid(.*?)desensitizedNickname', html_str).group(1)
-                    web_rid = re.search(r'(\d+)', web_rid).group(1)
+                    async def fetch_web_rid() -> str:
+                        html_str = await async_req(url, proxy_addr=self.proxy_addr, headers=self.pc_headers)
+                        _web_rid = re.search('webRid(.*?)desensitizedNickname', html_str).group(1)
+                        return re.search(r'(\d+)', _web_rid).group(1)
+
+                    web_rid = await get_alias_cache().resolve('douyin_web_rid', url, fetch_web_rid)
                 return await self._get_web_stream_data(web_rid, process_data)
 
+            # Profile links resolve through get_unique_id; skip the failing reflow lookup once it is known.
+            unique_id = await get_alias_cache().get('douyin_unique_id', url)
+            if unique_id:
+                return await self.fetch_web_stream_data('https://live.douyin.com/' + unique_id)
+
             room_id, sec_uid = await douyin_utils.get_sec_user_id(url, proxy_addr=self.proxy_addr)
             app_params = {
                 "verifyFp": "verify_lxj5zv70_7szNlAB7_pxNY_48Vh_ALKF_GA1Uf3yteoOY",
@@ -247,7 +255,8 @@ class DouyinLiveStream(BaseLiveStream):
                 "is_need_double_stream": True
             }
             api = 'https://webcast.amemv.com/webcast/room/reflow/info/?' + urllib.parse.urlencode(app_params)
-            a_bogus = ab_sign(urllib.parse.urlparse(api).query, self.mobile_headers['user-agent'])
+            with sign_span('a_bogus'):
+                a_bogus = ab_sign(urllib.parse.urlparse(api).query, self.mobile_headers['user-agent'])
             api += "&a_bogus=" + a_bogus
             json_str = await async_req(api, proxy_addr=self.proxy_addr, headers=self.mobile_headers)
             if not json_str:
@@ -286,6 +295,20 @@ class DouyinLiveStream(BaseLiveStream):
             unique_id = await douyin_utils.get_unique_id(url, proxy_addr=self.proxy_addr)
             return await self.fetch_web_stream_data('https://live.douyin.com/' + unique_id)
 
+    async def fetch_live_status(self, url: str) -> tuple[bool, dict | None]:
+        """
+        Checks whether a room is live. Room URLs (live.douyin.com/<web_rid>) only need the room status,
+        without decoding the stream data; app, share and profile URLs are resolved to the room first, and its
+        data is returned.
+        """
+        if not re.match(r'https?://live\.douyin\.com/\d+', url.strip()):
+            json_data = await self.fetch_web_stream_data(url)
+            return json_data.get('status') == 2, json_data
+        web_rid = url.strip().split('?')[0].rsplit('/', maxsplit=1)[-1]
+        json_data = await self._get_web_stream_data(web_rid, process_data=False)
+        room_list = json_data['data'].get('data')
+        return bool(room_list) and room_list[0].get('status') == 2, None
+
     async def fetch_web_stream_data(self, url: str, process_data: bool = True) -> dict:
         web_rid = url.split('?')[0].rsplit('/', maxsplit=1)[-1]
         return await self._get_web_stream_data(web_rid, process_data)
@@ -400,13 +423,12 @@ class DouyinLiveStream(BaseLiveStream):
                 flv_url_list.append(flv_url_list[-1])
                 m3u8_url_list.append(m3u8_url_list[-1])
             video_quality, quality_index = self.get_quality_index(video_quality)
-            m3u8_url = m3u8_url_list[quality_index]
-            flv_url = flv_url_list[quality_index]
-            ok = await get_response_status(url=m3u8_url, proxy_addr=self.proxy_addr, headers=self.pc_headers)
-            if not ok:
-                index = quality_index+1 if quality_index < 4 else quality_index - 1
-                m3u8_url = m3u8_url_list[index]
-                flv_url = flv_url_list[index]
+            order = quality_fallback_order(quality_index, len(m3u8_url_list))
+            verified = await get_stream_verifier().first_working(
+                [m3u8_url_list[i] for i in order], proxy_addr=self.proxy_addr, headers=self.pc_headers)
+            index = m3u8_url_list.index(verified.best) if verified.best else quality_index
+            m3u8_url = m3u8_url_list[index]
+            flv_url = flv_url_list[index]
 
             result |= {
                 'is_live': True,
@@ -416,4 +438,5 @@ class DouyinLiveStream(BaseLiveStream):
                 'flv_url': flv_url,
                 'record_url': m3u8_url or flv_url
             }
+            result['extra']['backup_url_list'] = verified.fallbacks
         return wrap_stream(result)
@@ -0,0 +1,183 @@
+import json
+from collections.abc import Callable, Iterator
+from typing import Any
+
+PUSH_MARKER = 'self.__rsc_f.push('
+
+_decoder = json.JSONDecoder()
+
+
+def iter_pushed_chunks(html: str, marker: str = PUSH_MARKER) -> Iterator[str]:
+    """
+    Yields the flight data chunks pushed by the inline scripts of a React Server Components page.
+
+    Every `self.__rsc_f.push([1, "..."])` call is decoded with the JSON decoder at its position in the page,
+    so the JS string escapes are undone in a single pass and the page itself is never copied.
+
+    Args:
+        html (str): The page.
+        marker (str): The push call that precedes each chunk. Defaults to "self.__rsc_f.push(".
+
+    Yields:
+        str: The decoded chunks, in page order.
+    """
+    pos = 0
+    while True:
+        index = html.find(marker, pos)
+        if index == -1:
+            return
+        pos = index + len(marker)
+        try:
+            value, pos = _decoder.raw_decode(html, pos)
+        except ValueError:
+            continue
+        # [0] is the bootstrap call, [1, str] a data chunk, [2, ...] form state and [3, str] binary data.
+        if isinstance(value, list) and len(value) == 2 and value[0] == 1 and isinstance(value[1], str):
+            yield value[1]
+
+
+def _utf8_end(text: str, start: int, size: int) -> int:
+    # Text rows are prefixed with their length in UTF-8 bytes, not in characters.
+    pos = start
+    while size > 0 and pos < len(text):
+        code = ord(text[pos])
+        size -= 1 if code < 0x80 else 2 if code < 0x800 else 3 if code < 0x10000 else 4
+        pos += 1
+    return pos
+
+
+def parse_rows(payload: str) -> dict[str, Any]:
+    """
+    Parses a flight payload into its rows.
+
+    A payload is a sequence of rows such as `5:["$","$L7",null,{...}]` or `a:I[...]`: a hex id, an optional
+    upper-case tag and a JSON value, ending with a newline. Text rows (`T<hex length>,<text>`) are kept as
+    strings. Rows that cannot be parsed are skipped.
+
+    Args:
+        payload (str): The concatenated flight data chunks.
+
+    Returns:
+        dict[str, Any]: The row values, keyed by row id.
+    """
+    rows: dict[str, Any] = {}
+    pos, size = 0, len(payload)
+    while pos < size:
+        colon = payload.find(':', pos)
+        if colon == -1:
+            break
+        row_id = payload[pos:colon]
+        tag_end = colon + 1
+        while tag_end < size and payload[tag_end].isupper():
+            tag_end += 1
+        tag = payload[colon + 1:tag_end]
+
+        if tag == 'T':
+            comma = payload.find(',', tag_end)
+            try:
+                length = int(payload[tag_end:comma], 16)
+            except ValueError:
+                length = 0
+            end = _utf8_end(payload, comma + 1, length)
+            rows[row_id] = payload[comma + 1:end]
+            pos = end
+            continue
+
+        try:
+            rows[row_id], end = _decoder.raw_decode(payload, tag_end)
+        except ValueError:
+            end = tag_end
+        newline = payload.find('\n', end)
+        pos = size if newline == -1 else newline + 1
+    return rows
+
+
+class FlightData:
+    """
+    The decoded React Server Components payload of a page, e.g. a Douyin app share page.
+
+    Values are looked up by key across every row. References to other rows (`"$7"`, `"$L7"`, `"$@7"`) are
+    resolved when a value is returned.
+
+    Example:
+        >>> flight = FlightData.from_html(html_str)
+        >>> room = flight.find_first('room', lambda value: isinstance(value, dict) and 'streamUrl' in value)
+    """
+
+    def __init__(self, rows: dict[str, Any]):
+        """
+        Initializes the payload from parsed rows.
+
+        Args:
+            rows (dict[str, Any]): The row values, keyed by row id, see `parse_rows`.
+        """
+        self.rows = rows
+
+    @classmethod
+    def from_html(cls, html: str, marker: str = PUSH_MARKER) -> 'FlightData':
+        """
+        Decodes the payload pushed by the inline scripts of a page.
+
+        Args:
+            html (str): The page.
+            marker (str): The push call that precedes each chunk. Defaults to "self.__rsc_f.push(".
+
+        Returns:
+            FlightData: The decoded payload; it has no rows if the page contains no flight data.
+        """
+        return cls(parse_rows(''.join(iter_pushed_chunks(html, marker))))
+
+    def resolve(self, value: Any) -> Any:
+        """
+        Returns the row a reference string points to, or the value itself if it is not a reference.
+
+        Args:
+            value (Any): The value, e.g. "$L7".
+
+        Returns:
+            Any: The referenced row, or the value. "$$" escapes are turned back into a literal "$".
+        """
+        if not isinstance(value, str) or not value.startswith('$'):
+            return value
+        if value.startswith('$$'):
+            return value[1:]
+        ref = value[2:] if value[1:2] in ('L', '@') else value[1:]
+        return self.rows.get(ref, value)
+
+    def find(self, key: str) -> Iterator[Any]:
+        """
+        Yields the value of every dict entry named `key`, in row order.
+
+        Args:
+            key (str): The key, e.g. "room".
+
+        Yields:
+            Any: The resolved values.
+        """
+        for row in self.rows.values():
+            stack = [row]
+            while stack:
+                node = stack.pop()
+                if isinstance(node, dict):
+                    if key in node:
+                        yield self.resolve(node[key])
+                    stack.extend(reversed(node.values()))
+                elif isinstance(node, list):
+                    stack.extend(reversed(node))
+
+    def find_first(self, key: str, predicate: Callable[[Any], bool] | None = None) -> Any | None:
+        """
+        Returns the first value named `key` that matches `predicate`.
+
+        Args:
+            key (str): The key, e.g. "room".
+            predicate (Callable[[Any], bool] | None): Tells the wanted value apart from others with the same key.
+                Defaults to None (any value).
+
+        Returns:
+            Any | None: The value, or None if there is none.
+        """
+        for value in self.find(key):
+            if predicate is None or predicate(value):
+                return value
+        return None
@@ -4,7 +4,9 @@ import urllib.parse
 import execjs
 import httpx
 
-from ... import JS_SCRIPT_PATH, utils
+from ...alias_cache import get_alias_cache
+from ...js_worker import NodeWorkerError, call_js
+from ...requests.client_pool import get_client_pool
 
 
 class UnsupportedUrlError(Exception):
@@ -33,11 +35,9 @@ class DouyinUtils:
             headers = DouyinUtils.HEADERS
         query = urllib.parse.urlparse(url).query
         try:
-            with open(f'{JS_SCRIPT_PATH}/x-bogus.js') as f:
-                js_code = f.read()
-            xbogus = execjs.compile(js_code).call('sign', query, headers.get("User-Agent") or headers.get("user-agent"))
+            xbogus = await call_js('x-bogus.js', 'sign', query, headers.get("User-Agent") or headers.get("user-agent"))
             return xbogus
-        except execjs.ProgramError:
+        except NodeWorkerError:
             raise execjs.ProgramError('Failed to execute JS code. Please check if the Node.js environment')
 
     @staticmethod
@@ -45,26 +45,27 @@ class DouyinUtils:
         if not headers or all(k.lower() not in ['user-agent', 'cookie'] for k in headers):
             headers = DouyinUtils.HEADERS
 
-        try:
-            proxy_addr = utils.handle_proxy_addr(proxy_addr)
-            async with httpx.AsyncClient(proxy=proxy_addr, timeout=15) as client:
-                response = await client.get(url, headers=headers, follow_redirects=True)
+        async def fetch_sec_user_id() -> list:
+            try:
+                response = await get_client_pool().request(
+                    'GET', url, proxy_addr=proxy_addr, headers=headers, timeout=15, follow_redirects=True)
                 redirect_url = response.url
                 if 'reflow/' in str(redirect_url):
                     match = re.search(r'sec_user_id=([\w_\-]+)&', str(redirect_url))
                     if match:
                         sec_user_id = match.group(1)
                         room_id = str(redirect_url).split('?')[0].rsplit('/', maxsplit=1)[1]
-                        return room_id, sec_user_id
+                        return [room_id, sec_user_id]
                     else:
                         raise RuntimeError("Could not find sec_user_id in the URL.")
                 else:
                     raise UnsupportedUrlError("The redirect URL does not contain 'reflow/'.")
-        except UnsupportedUrlError as e:
-            raise e
-        except Exception as e:
-            raise RuntimeError(f"An error occurred: {e}")
-        return None
+            except UnsupportedUrlError as e:
+                raise e
+            except Exception as e:
+                raise RuntimeError(f"An error occurred: {e}")
+
+        return tuple(await get_alias_cache().resolve('douyin_sec_user_id', url, fetch_sec_user_id))
 
     @staticmethod
     async def get_unique_id(url: str, proxy_addr: str | None = None, headers: dict | None = None) -> str | None:
@@ -72,35 +73,39 @@ class DouyinUtils:
         if not headers or all(k.lower() not in ['user-agent', 'cookie'] for k in headers):
             headers = DouyinUtils.HEADERS
 
-        try:
-            proxy_addr = utils.handle_proxy_addr(proxy_addr)
-            async with httpx.AsyncClient(proxy=proxy_addr, timeout=15) as client:
-                response = await client.get(url, headers=headers, follow_redirects=True)
+        async def fetch_unique_id() -> str:
+            request_headers = dict(headers)
+            try:
+                pool = get_client_pool()
+                response = await pool.request(
+                    'GET', url, proxy_addr=proxy_addr, headers=request_headers, timeout=15, follow_redirects=True)
                 redirect_url = str(response.url)
                 if 'reflow/' in str(redirect_url):
                     raise UnsupportedUrlError("Unsupported URL")
 
                 sec_user_id = redirect_url.split('?')[0].rsplit('/', maxsplit=1)[1]
 
-                headers['cookie'] = ('ttwid=1%7C4ejCkU2bKY76IySQENJwvGhg1IQZrgGEupSyTKKfuyk%7C1740470403%7Cbc9a'
-                                     'd2ee341f1a162f9e27f4641778030d1ae91e31f9df6553a8f2efa3bdb7b4; __ac_nonce=06'
-                                     '83e59f3009cc48fbab0; __ac_signature=_02B4Z6wo00f01mG6waQAAIDB9JUCzFb6.TZhmsU'
-                                     'AAPBf34; __ac_referer=__ac_blank')
-                profile_response = await client.get(f'https://www.iesdouyin.com/share/user/{sec_user_id}',
-                                                    headers=headers, follow_redirects=True)
+                request_headers['cookie'] = (
+                    'ttwid=1%7C4ejCkU2bKY76IySQENJwvGhg1IQZrgGEupSyTKKfuyk%7C1740470403%7Cbc9a'
+                    'd2ee341f1a162f9e27f4641778030d1ae91e31f9df6553a8f2efa3bdb7b4; __ac_nonce=06'
+                    '83e59f3009cc48fbab0; __ac_signature=_02B4Z6wo00f01mG6waQAAIDB9JUCzFb6.TZhmsU'
+                    'AAPBf34; __ac_referer=__ac_blank')
+                profile_response = await pool.request(
+                    'GET', f'https://www.iesdouyin.com/share/user/{sec_user_id}', proxy_addr=proxy_addr,
+                    headers=request_headers, timeout=15, follow_redirects=True)
                 matches = re.findall(r'unique_id":"(.*?)","verification_type', profile_response.text)
 
                 if matches:
-                    unique_id = matches[-1]
-                    return unique_id
+                    return matches[-1]
                 else:
                     raise RuntimeError("Could not find unique_id in the response.")
 
-        except UnsupportedUrlError as e:
-            raise e
-        except Exception as e:
-            raise RuntimeError(f"An error occurred: {e}")
-        return None
+            except UnsupportedUrlError as e:
+                raise e
+            except Exception as e:
+                raise RuntimeError(f"An error occurred: {e}")
+
+        return await get_alias_cache().resolve('douyin_unique_id', url, fetch_unique_id)
 
     @staticmethod
     async def get_live_room_id(room_id: str, sec_user_id: str, proxy_addr: str | None = None,
@@ -126,12 +131,11 @@ class DouyinUtils:
         api = api + "&X-Bogus=" + xbogus
 
         try:
-            proxy_addr = utils.handle_proxy_addr(proxy_addr)
-            async with httpx.AsyncClient(proxy=proxy_addr, timeout=15) as client:
-                response = await client.get(api, headers=headers)
-                response.raise_for_status()
-                json_data = response.json()
-                return json_data['data']['room']['owner']['web_rid']
+            response = await get_client_pool().request(
+                'GET', api, proxy_addr=proxy_addr, headers=headers, timeout=15)
+            response.raise_for_status()
+            json_data = response.json()
+            return json_data['data']['room']['owner']['web_rid']
         except httpx.HTTPStatusError as e:
             raise Exception(f"HTTP status error occurred: {e.response.status_code}")
         except Exception as e:
@@ -1,13 +1,26 @@
+import asyncio
+import functools
 import hashlib
 import json
 import re
 import time
 
+from ...alias_cache import get_alias_cache
 from ...data import StreamData, wrap_stream
 from ...requests.async_http import async_req
+from ...verifier import get_stream_verifier
 from ..base import BaseLiveStream
 
 
+@functools.lru_cache(maxsize=64)
+def _iterate_secret(rand_str: str, key: str, enc_time: int) -> str:
+    # The iterated hash only depends on the white key, so it is computed once per key.
+    secret = rand_str
+    for _ in range(enc_time):
+        secret = hashlib.md5((secret + key).encode()).hexdigest()
+    return secret
+
+
 class DouyuLiveStream(BaseLiveStream):
     """
     A class for fetching and processing Douyu live stream information.
@@ -16,6 +29,13 @@ class DouyuLiveStream(BaseLiveStream):
     WEB_DOMAIN = "www.douyu.com"
     PLAY_DOMAIN = "playweb.douyucdn.cn"
     MOBILE_DOMAIN = "m.douyu.com"
+    WHITE_KEY_TTL = 300
+    # getH5PlayV1 error codes meaning the signature was rejected ("-9": stale timestamp, "-15": auth failed).
+    # Other errors, e.g. an offline room, are not caused by the white key.
+    SIGN_ERROR_CODES = frozenset({-9, -15})
+
+    # The getEncryption payload, shared by every instance until it expires: (payload, expiry as Unix time).
+    _white_key: tuple[dict, float] | None = None
 
     USER_AGENT = (
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -45,12 +65,16 @@ class DouyuLiveStream(BaseLiveStream):
             rid = match_rid.group(1)
         else:
             path = url.split("douyu.com/")[1].split("?")[0].split("/")[0]
-            html_str = await async_req(
-                url=f'https://{self.MOBILE_DOMAIN}/{path}',
-                proxy_addr=self.proxy_addr,
-                headers=self.base_headers
-            )
-            rid = re.search('"rid":(\\d+)', html_str).group(1)
+
+            async def fetch_rid() -> str:
+                html_str = await async_req(
+                    url=f'https://{self.MOBILE_DOMAIN}/{path}',
+                    proxy_addr=self.proxy_addr,
+                    headers=self.base_headers
+                )
+                return re.search('"rid":(\\d+)', html_str).group(1)
+
+            rid = await get_alias_cache().resolve('douyu', path, fetch_rid)
         return rid
 
     async def fetch_app_stream_data(self, url: str, process_data: bool = True):
@@ -132,7 +156,23 @@ class DouyuLiveStream(BaseLiveStream):
         }
         return result
 
-    async def _update_white_key(self) -> dict:
+    async def _update_white_key(self, refresh: bool = False) -> dict:
+        """
+        Returns the white-key payload used to sign getH5PlayV1 requests.
+
+        The payload is cached until the "expire_at" time it carries (or for WHITE_KEY_TTL seconds if it has
+        none), so resolving many rooms and CDNs costs one getEncryption request.
+
+        Args:
+            refresh (bool): If True, ignores the cached payload. Defaults to False.
+
+        Returns:
+            dict: The payload.
+        """
+        cached = DouyuLiveStream._white_key
+        if cached and not refresh and cached[1] > time.time():
+            return cached[0]
+
         url = f'https://{self.WEB_DOMAIN}/wgapi/livenc/liveweb/websec/getEncryption?did={self.DEFAULT_DID}'
         json_str = await async_req(
             url=url,
@@ -142,15 +182,27 @@ class DouyuLiveStream(BaseLiveStream):
         data = json.loads(json_str)
         if data.get('error') != 0:
             raise RuntimeError('获取白名单密钥失败')
-        return data['data']
+        white = data['data']
+        try:
+            # Renew a little early so that a request signed just before the expiry is still accepted.
+            expires = float(white['expire_at']) - 30
+        except (KeyError, TypeError, ValueError):
+            expires = time.time() + self.WHITE_KEY_TTL
+        DouyuLiveStream._white_key = (white, expires)
+        return white
 
     async def _fetch_web_stream_url(self, rid: str, rate: str = '-1', cdn: str | None = None) -> dict:
-        white = await self._update_white_key()
+        cached = DouyuLiveStream._white_key is not None and DouyuLiveStream._white_key[1] > time.time()
+        json_data = await self._request_web_stream_url(await self._update_white_key(), rid, rate, cdn)
+        if cached and json_data.get('error') in self.SIGN_ERROR_CODES:
+            # The cached key may have been revoked before its expiry; sign again with a new one.
+            json_data = await self._request_web_stream_url(await self._update_white_key(refresh=True), rid, rate, cdn)
+        return json_data
+
+    async def _request_web_stream_url(self, white: dict, rid: str, rate: str, cdn: str | None) -> dict:
         ts = int(time.time())
-        secret = white['rand_str']
+        secret = _iterate_secret(white['rand_str'], white['key'], white['enc_time'])
         salt = f"{rid}{ts}" if not white['is_special'] else ""
-        for _ in range(white['enc_time']):
-            secret = hashlib.md5((secret + white['key']).encode()).hexdigest()
         auth = hashlib.md5((secret + white['key'] + salt).encode()).hexdigest()
 
         params = {
@@ -220,10 +272,15 @@ class DouyuLiveStream(BaseLiveStream):
             info = _flv_data.get('data')
             if not info:
                 return
+            return _flv_data
+
+        def add_url(_flv_data: dict | None) -> None:
+            if not _flv_data:
+                return
+            info = _flv_data['data']
             _flv_url = f"{info['rtmp_url']}/{info['rtmp_live']}"
             if _flv_url not in flv_url_list:
                 flv_url_list.append(_flv_url)
-            return _flv_data
 
         if not json_data['is_live']:
             json_data |= {
@@ -236,14 +293,30 @@ class DouyuLiveStream(BaseLiveStream):
             return wrap_stream(json_data)
 
         flv_data = await get_url(_rid=rid, _rate=rate, _cdn=cdn)
+        add_url(flv_data)
 
         if flv_data and flv_data.get('data'):
             rtmp_cdn = flv_data['data'].get('rtmp_cdn')
             cdn_list = flv_data['data'].get('cdnsWithName', [])
 
-            for item in cdn_list:
-                if item['cdn'] != rtmp_cdn:
-                    await get_url(_rid=rid, _rate=rate, _cdn=item['cdn'])
+            # The backup CDNs are requested concurrently; their URLs keep the order of cdnsWithName.
+            backups = await asyncio.gather(
+                *(get_url(_rid=rid, _rate=rate, _cdn=item['cdn']) for item in cdn_list if item['cdn'] != rtmp_cdn),
+                return_exceptions=True
+            )
+            for backup in backups:
+                if not isinstance(backup, BaseException):
+                    add_url(backup)
+
+        if flv_url_list and self.verify_streams:
+            verified = await get_stream_verifier().verify(
+                flv_url_list, proxy_addr=self.proxy_addr, headers=self.base_headers)
+            if verified.best:
+                flv_url_list = verified.working
+
+        if self.cdn_ranker and len(flv_url_list) > 1:
+            flv_url_list = await self.cdn_ranker.rank(
+                flv_url_list, proxy_addr=self.proxy_addr, headers=self.base_headers)
 
         if flv_url_list:
             flv_url = flv_url_list[0]
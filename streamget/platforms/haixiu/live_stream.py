@@ -6,6 +6,7 @@ import execjs
 
 from ... import JS_SCRIPT_PATH
 from ...data import StreamData, wrap_stream
+from ...js_worker import NodeWorkerError, call_js
 from ...requests.async_http import async_req
 from ..base import BaseLiveStream
 
@@ -50,10 +51,8 @@ class HaixiuLiveStream(BaseLiveStream):
             "_st1": int(time.time() * 1000)
         }
         try:
-            with open(f'{JS_SCRIPT_PATH}/haixiu.js') as f:
-                js_code = f.read()
-            ajax_data = execjs.compile(js_code).call('sign', params, f'{JS_SCRIPT_PATH}/crypto-js.min.js')
-        except execjs.ProgramError:
+            ajax_data = await call_js('haixiu.js', 'sign', params, f'{JS_SCRIPT_PATH}/crypto-js.min.js')
+        except NodeWorkerError:
             raise execjs.ProgramError('Failed to execute JS code. Please check if the Node.js environment')
 
         params["accessToken"] = urllib.parse.unquote(urllib.parse.unquote(access_token))
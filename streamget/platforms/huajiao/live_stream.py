@@ -4,7 +4,7 @@ import time
 import urllib.parse
 
 from ...data import StreamData, wrap_stream
-from ...requests.async_http import async_req
+from ...requests.async_http import async_extract, async_req
 from ..base import BaseLiveStream
 
 
@@ -29,9 +29,9 @@ class HuajiaoLiveStream(BaseLiveStream):
         live_id = url.split('?')[0].rsplit('/', maxsplit=1)[1]
         api = f'https://www.huajiao.com/l/{live_id}'
         try:
-            html_str = await async_req(url=api, proxy_addr=self.proxy_addr, headers=self.pc_headers)
-            json_str = re.search('var feed = (.*?});', html_str).group(1)
-            json_data = json.loads(json_str)
+            json_str = await async_extract(
+                api, 'var feed = ', '};', proxy_addr=self.proxy_addr, headers=self.pc_headers)
+            json_data = json.loads(json_str + '}')
             sn = json_data['feed']['sn']
             uid = json_data['author']['uid']
             nickname = json_data['author']['nickname']
@@ -5,36 +5,110 @@ import re
 import time
 import urllib.parse
 
-import requests
-
+from ...alias_cache import get_alias_cache
 from ...data import StreamData, wrap_stream
-from ..base import BaseLiveStream
+from ...requests.async_http import async_req
+from ...verifier import get_stream_verifier
+from ..base import BaseLiveStream, instance_or_class_method
 
 
 class HuyaLiveStream(BaseLiveStream):
     """
     A class for fetching and processing Huya live stream information.
     """
+    # The anonymous uid is not tied to a room, so a single login can sign every stream URL until it expires.
+    ANONYMOUS_UID_TTL = 3600
+    _anonymous_uid: tuple[str, float] | None = None
 
     def __init__(self, proxy_addr: str | None = None, cookies: str | None = None):
         super().__init__(proxy_addr, cookies)
-        self.session = requests.Session()
-        self.session.headers.update(
-            {
-                "User-Agent": (
-                    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/127.0.0.0 Safari/537.36"
-                ),
-            }
+        self.pc_headers = self._get_pc_headers()
+
+    def _get_pc_headers(self) -> dict:
+        headers = {
+            'user-agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) '
+                          'Chrome/127.0.0.0 Safari/537.36',
+        }
+        if self.cookies:
+            headers['cookie'] = self.cookies
+        return headers
+
+    @classmethod
+    async def get_anonymous_uid(cls, proxy_addr: str | None = None) -> str:
+        """
+        Returns an anonymous Huya uid, logging in again only after the cached one has expired.
+
+        Args:
+            proxy_addr (str | None): The proxy address to use. Defaults to None.
+
+        Returns:
+            str: The anonymous uid used to sign stream URLs.
+        """
+        cached = cls._anonymous_uid
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
+
+        payload = {
+            "appId": 5002,
+            "byPass": 3,
+            "context": "",
+            "version": "2.4",
+            "data": {},
+        }
+        uid_resp = await async_req(
+            "https://udblgn.huya.com/web/anonymousLogin",
+            proxy_addr=proxy_addr,
+            json_data=payload,
+            headers={"Content-Type": "application/json"},
+            timeout=15,
         )
-        if proxy_addr:
-            self.session.proxies.update({"http": proxy_addr, "https": proxy_addr})
+        uid = str(json.loads(uid_resp)["data"]["uid"])
+        cls._anonymous_uid = (uid, time.monotonic() + cls.ANONYMOUS_UID_TTL)
+        return uid
+
+    async def fetch_live_status(self, url: str) -> tuple[bool, dict | None]:
+        """
+        Checks whether a room is live from the mini-program room data, without signing the stream URLs. The
+        room data is returned, since it is also the output of `fetch_web_stream_data`.
+        """
+        json_data = await self.fetch_app_stream_data(url)
+        return 'raw_data' in json_data, json_data
 
     async def fetch_web_stream_data(self, url: str, process_data: bool = True) -> dict:
         """Web endpoint fallback - unified to app interface."""
         return await self.fetch_app_stream_data(url, process_data)
 
+    async def _scrape_room_id(self, url: str) -> str:
+        """
+        Resolves the numeric room id of a vanity room URL from the room page.
+        """
+        html_str = await async_req(url, proxy_addr=self.proxy_addr, headers=self.pc_headers, timeout=15)
+
+        match = re.search(
+            r'<link\s+[^>]*rel=["\']canonical["\'][^>]*href=["\']https?://www\.huya\.com/(\d+)["\']',
+            html_str,
+            re.IGNORECASE,
+        )
+        if match:
+            room_id = match.group(1)
+        else:
+            match = re.search(
+                r'<meta\s+[^>]*property=["\']og:url["\'][^>]*content=["\']https?://www\.huya\.com/(\d+)["\']',
+                html_str,
+                re.IGNORECASE,
+            )
+            if match:
+                room_id = match.group(1)
+            else:
+                match = re.search(r'"lProfileRoom"\s*:\s*(\d+)', html_str)
+                if match:
+                    room_id = match.group(1)
+                else:
+                    raise Exception(
+                        "无法解析别名房间号，请检查网址是否正确或尝试使用数字房间号"
+                    )
+        return room_id
+
     async def fetch_app_stream_data(self, url: str, process_data: bool = True) -> dict:
         """
         Fetch live stream data using the mini-program API and generate real URLs
@@ -43,37 +117,7 @@ class HuyaLiveStream(BaseLiveStream):
         room_id = url.split("?")[0].rsplit("/", maxsplit=1)[-1].strip("/")
 
         if not room_id.isdigit():
-            try:
-                resp = self.session.get(url, timeout=15)
-                resp.raise_for_status()
-                html_str = resp.text
-
-                match = re.search(
-                    r'<link\s+[^>]*rel=["\']canonical["\'][^>]*href=["\']https?://www\.huya\.com/(\d+)["\']',
-                    html_str,
-                    re.IGNORECASE,
-                )
-                if match:
-                    room_id = match.group(1)
-                else:
-                    match = re.search(
-                        r'<meta\s+[^>]*property=["\']og:url["\'][^>]*content=["\']https?://www\.huya\.com/(\d+)["\']',
-                        html_str,
-                        re.IGNORECASE,
-                    )
-                    if match:
-                        room_id = match.group(1)
-                    else:
-                        match = re.search(r'"lProfileRoom"\s*:\s*(\d+)', html_str)
-                        if match:
-                            room_id = match.group(1)
-                        else:
-                            raise Exception(
-                                "无法解析别名房间号，请检查网址是否正确或尝试使用数字房间号"
-                            )
-
-            except requests.RequestException as e:
-                raise Exception(f"获取房间页面失败: {e}")
+            room_id = await get_alias_cache().resolve('huya', room_id, lambda: self._scrape_room_id(url))
 
         live_url = "https://www.huya.com/" + str(room_id)
 
@@ -84,7 +128,7 @@ class HuyaLiveStream(BaseLiveStream):
             "showSecret": "1",
         }
         wx_app_api = f"https://mp.huya.com/cache.php?{urllib.parse.urlencode(params)}"
-        json_str = self.session.get(wx_app_api, timeout=15).text
+        json_str = await async_req(wx_app_api, proxy_addr=self.proxy_addr, headers=self.pc_headers, timeout=15)
         json_data = json.loads(json_str)
 
         if not process_data:
@@ -108,10 +152,13 @@ class HuyaLiveStream(BaseLiveStream):
             "live_url": live_url,
         }
 
-    @staticmethod
-    async def fetch_stream_url(json_data: dict, video_quality: str | int | None = None) -> StreamData:
+    @instance_or_class_method
+    async def fetch_stream_url(self, json_data: dict, video_quality: str | int | None = None) -> StreamData:
         """
          Fetches the stream URL for a live room and wraps it into a StreamData object.
+
+         It can still be called on the class, `HuyaLiveStream.fetch_stream_url(json_data)`, as when it was a
+         staticmethod; the anonymous login, verification and CDN ranking then run without proxy or cookies.
          """
         platform = "虎牙直播"
 
@@ -131,20 +178,7 @@ class HuyaLiveStream(BaseLiveStream):
         live_title = json_data["title"]
         live_url = json_data["live_url"]
 
-        payload = {
-            "appId": 5002,
-            "byPass": 3,
-            "context": "",
-            "version": "2.4",
-            "data": {},
-        }
-        uid_resp = requests.post(
-            "https://udblgn.huya.com/web/anonymousLogin",
-            json=payload,
-            headers={"Content-Type": "application/json"},
-            timeout=15,
-        ).text
-        uid = json.loads(uid_resp)["data"]["uid"]
+        uid = await HuyaLiveStream.get_anonymous_uid(proxy_addr=self.proxy_addr)
 
         base_steam_info_list = raw_data["data"]["stream"]["baseSteamInfoList"]
         play_url_list = []
@@ -228,6 +262,17 @@ class HuyaLiveStream(BaseLiveStream):
 
         flv_url = play_url_list[0]["flv_url"] if play_url_list else ""
 
+        if self.verify_streams and all_flv_urls:
+            verified = await get_stream_verifier().verify(
+                all_flv_urls, proxy_addr=self.proxy_addr, headers=self.pc_headers)
+            if verified.best:
+                flv_url = verified.best
+                all_flv_urls = verified.working
+
+        if self.cdn_ranker and len(all_flv_urls) > 1:
+            all_flv_urls = await self.cdn_ranker.rank(all_flv_urls, proxy_addr=self.proxy_addr, headers=self.pc_headers)
+            flv_url = all_flv_urls[0]
+
         if flv_url in all_flv_urls:
             all_flv_urls.remove(flv_url)
 
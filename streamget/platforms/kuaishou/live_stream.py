@@ -2,7 +2,7 @@ import json
 import re
 
 from ...data import StreamData, wrap_stream
-from ...requests.async_http import async_req
+from ...requests.async_http import async_extract
 from ..base import BaseLiveStream
 
 
@@ -26,15 +26,16 @@ class KwaiLiveStream(BaseLiveStream):
             dict: A dictionary containing anchor name, live status, room URL, and title.
         """
         try:
-            html_str = await async_req(url=url, proxy_addr=self.proxy_addr, headers=self.pc_headers)
+            json_str = await async_extract(
+                url, '<script>window.__INITIAL_STATE__=', ';(function(){var s;',
+                proxy_addr=self.proxy_addr, headers=self.pc_headers)
         except Exception as e:
             raise Exception(f"Failed to fetch data from {url}.{e}")
 
         try:
-            json_str = re.search('<script>window.__INITIAL_STATE__=(.*?);\\(function\\(\\)\\{var s;', html_str).group(1)
             play_list = re.findall('(\\{"liveStream".*?),"gameInfo', json_str)[0] + "}"
             play_list = json.loads(play_list)
-        except (AttributeError, IndexError, json.JSONDecodeError) as e:
+        except (TypeError, IndexError, json.JSONDecodeError) as e:
             raise Exception(f"Failed to parse JSON data from {url}. Error: {e}")
 
         result = {"type": 2, "is_live": False, 'live_url': url}
@@ -6,6 +6,7 @@ import execjs
 
 from ... import JS_SCRIPT_PATH
 from ...data import StreamData, wrap_stream
+from ...js_worker import NodeWorkerError, call_js
 from ...requests.async_http import async_req
 from ..base import BaseLiveStream
 
@@ -46,10 +47,8 @@ class LiveMeLiveStream(BaseLiveStream):
 
         room_id = url.split("/index.html")[0].rsplit('/', maxsplit=1)[-1]
         try:
-            with open(f'{JS_SCRIPT_PATH}/liveme.js') as f:
-                js_code = f.read()
-            sign_data = execjs.compile(js_code).call('sign', room_id, f'{JS_SCRIPT_PATH}/crypto-js.min.js')
-        except execjs.ProgramError:
+            sign_data = await call_js('liveme.js', 'sign', room_id, f'{JS_SCRIPT_PATH}/crypto-js.min.js')
+        except NodeWorkerError:
             raise execjs.ProgramError('Failed to execute JS code. Please check if the Node.js environment')
         lm_s_sign = sign_data.pop("lm_s_sign")
         tongdun_black_box = sign_data.pop("tongdun_black_box")
@@ -1,13 +1,12 @@
 import json
-import subprocess
 import time
 import urllib.parse
 import uuid
 
 import execjs
 
-from ... import JS_SCRIPT_PATH
 from ...data import StreamData, wrap_stream
+from ...js_worker import NodeWorkerError, call_js
 from ...requests.async_http import async_req
 from ..base import BaseLiveStream
 
@@ -45,14 +44,8 @@ class MiguLiveStream(BaseLiveStream):
     @staticmethod
     async def _get_dd_calcu(url):
         try:
-            result = subprocess.run(
-                ["node", f"{JS_SCRIPT_PATH}/migu.js", url],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            return result.stdout.strip()
-        except execjs.ProgramError:
+            return await call_js('migu.js', 'getDdCalcu', url)
+        except NodeWorkerError:
             raise execjs.ProgramError('Failed to execute JS code. Please check if the Node.js environment')
 
     async def fetch_web_stream_data(self, url: str, process_data: bool = True) -> dict:
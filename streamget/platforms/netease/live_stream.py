@@ -1,8 +1,7 @@
 import json
-import re
 
 from ...data import StreamData, wrap_stream
-from ...requests.async_http import async_req
+from ...requests.async_http import async_extract
 from ..base import BaseLiveStream
 
 
@@ -26,10 +25,12 @@ class NeteaseLiveStream(BaseLiveStream):
             dict: A dictionary containing anchor name, live status, room URL, and title.
         """
         url = url + '/' if url[-1] != '/' else url
-        html_str = await async_req(url.strip(), proxy_addr=self.proxy_addr, headers=self.pc_headers)
-        json_str = re.search('<script id="__NEXT_DATA__" .* crossorigin="anonymous">(.*?)</script></body>',
-                             html_str, re.DOTALL).group(1)
-        json_data = json.loads(json_str)
+        script = await async_extract(
+            url.strip(), '<script id="__NEXT_DATA__"', '</script>', proxy_addr=self.proxy_addr, headers=self.pc_headers)
+        if script is None:
+            raise Exception(f"Failed to find __NEXT_DATA__ in {url}")
+        # The extracted text still starts with the rest of the script tag.
+        json_data = json.loads(script.split('>', 1)[1])
         if not process_data:
             return json_data
         room_data = json_data['props']['pageProps']['roomInfoInitData']
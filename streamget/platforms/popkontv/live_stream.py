@@ -1,9 +1,11 @@
 import json
 import re
+import time
 
 import httpx
 
 from ... import utils
+from ...credentials import Credential, get_credential_store, jwt_expiry
 from ...data import StreamData, wrap_stream
 from ...requests.async_http import async_req
 from ..base import BaseLiveStream
@@ -13,6 +15,9 @@ class PopkonTVLiveStream(BaseLiveStream):
     """
     A class for fetching and processing PopkonTV live stream information.
     """
+    # Lifetime assumed for access tokens that do not carry an expiry.
+    TOKEN_TTL = 12 * 3600
+
     def __init__(self, proxy_addr: str | None = None, cookies: str | None = None, username: str | None = None,
                  password: str | None = None, access_token: str | None = None, partner_code: str | None = 'P-00001'):
         super().__init__(proxy_addr, cookies)
@@ -95,7 +100,26 @@ class PopkonTVLiveStream(BaseLiveStream):
         else:
             return anchor_name, None
 
+    def _credential_key(self) -> str:
+        return f'popkontv:{self.username}'
+
+    def _use_token(self, access_token: str) -> None:
+        self.access_token = access_token
+        self.pc_headers.pop('Authorization', None)
+        self.pc_headers['authorization'] = f'Bearer {access_token}'
+
     async def login_popkontv(self) -> tuple:
+        """
+        Returns the access token and partner code of the configured account, logging in only if no valid token
+        is stored.
+
+        Returns:
+            tuple: The access token and the partner code.
+        """
+        credential = await get_credential_store().obtain(self._credential_key(), self._login_popkontv)
+        return credential.value, credential.extra.get('partner_code')
+
+    async def _login_popkontv(self) -> Credential:
         headers = {
             'Accept': 'application/json, text/plain, */*',
             'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8,en-GB;q=0.7,en-US;q=0.6',
@@ -127,7 +151,11 @@ class PopkonTVLiveStream(BaseLiveStream):
                 elif login_status_code == 'S2000':
                     token = json_data['data'].get("token")
                     partner_code = json_data['data'].get("partnerCode")
-                    return token, partner_code
+                    return Credential(
+                        value=token,
+                        expires_at=jwt_expiry(token) or time.time() + self.TOKEN_TTL,
+                        extra={'partner_code': partner_code}
+                    )
                 else:
                     raise Exception(f"popkontv login failed, {json_data.get('statusMsg', 'unknown error')}")
         except httpx.HTTPStatusError as e:
@@ -176,19 +204,29 @@ class PopkonTVLiveStream(BaseLiveStream):
                 return await async_req(
                     play_api, proxy_addr=self.proxy_addr, json_data=_json_data, headers=self.pc_headers)
 
-            json_str = await fetch_data(self.partner_code)
+            partner_code = self.partner_code
+            if self.username and not self.access_token:
+                credential = await get_credential_store().get(self._credential_key())
+                if credential is not None:
+                    self._use_token(credential.value)
+                    partner_code = credential.extra.get('partner_code') or partner_code
+
+            json_str = await fetch_data(partner_code)
 
             if 'HTTP Error 400' in json_str or 'statusCd":"E5000' in json_str:
 
                 if len(self.username) < 4 or len(self.password) < 10:
                     raise RuntimeError("popkontv login failed! Please enter the correct account and password for the "
                                        "popkontv platform in the config.ini file.")
+                if self.access_token:
+                    # The stored token, if it is the one just used, was rejected.
+                    await get_credential_store().invalidate(self._credential_key(), self.access_token)
                 # print("Logging into popkontv platform...")
                 new_access_token, new_partner_code = await self.login_popkontv()
                 if new_access_token and len(new_access_token) == 640:
                     # print("Logged into popkontv platform successfully! Starting to fetch live streaming data...")
-                    self.pc_headers['Authorization'] = f'Bearer {new_access_token}'
-                    self.access_token = new_access_token
+                    self._use_token(new_access_token)
+                    new_token = new_access_token
                     json_str = await fetch_data(new_partner_code)
                 else:
                     raise RuntimeError("popkontv login failed, please check if the account and password are correct")
@@ -2,7 +2,7 @@ import json
 import re
 
 from ...data import StreamData, wrap_stream
-from ...requests.async_http import async_req
+from ...requests.async_http import async_extract, async_req
 from ..base import BaseLiveStream
 
 
@@ -39,11 +39,12 @@ class RedNoteLiveStream(BaseLiveStream):
         user_id = re.search("/user/profile/(.*?)(?=/|\\?|$)", url)
         user_id = user_id.group(1) if user_id else host_id
         result = {"anchor_name": '', "is_live": False, "live_url": url}
-        html_str = await async_req(url, proxy_addr=self.proxy_addr, headers=self.mobile_headers)
-        match_data = re.search("<script>window.__INITIAL_STATE__=(.*?)</script>", html_str)
+        json_str = await async_extract(
+            url, '<script>window.__INITIAL_STATE__=', '</script>',
+            proxy_addr=self.proxy_addr, headers=self.mobile_headers)
 
-        if match_data:
-            json_str = match_data.group(1).replace("undefined", "null")
+        if json_str is not None:
+            json_str = json_str.replace("undefined", "null")
             json_data = json.loads(json_str)
             if not process_data:
                 return json_data
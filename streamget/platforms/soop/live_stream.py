@@ -1,9 +1,11 @@
 import json
-import re
+import time
 import urllib.parse
 import uuid
 
+from ...credentials import Credential, get_credential_store
 from ...data import StreamData, wrap_stream
+from ...m3u8 import fetch_playlist
 from ...requests.async_http import async_req
 from ..base import BaseLiveStream
 
@@ -12,6 +14,9 @@ class SoopLiveStream(BaseLiveStream):
     """
     A class for fetching and processing SOOP live stream information.
     """
+    # Login cookies are shared through the credential store and renewed after this many seconds.
+    SESSION_TTL = 24 * 3600
+
     def __init__(self, proxy_addr: str | None = None, cookies: str | None = None,
                  username: str | None = None, password: str | None = None):
         super().__init__(proxy_addr, cookies)
@@ -37,7 +42,27 @@ class SoopLiveStream(BaseLiveStream):
             'cookie': self.cookies or '',
         }
 
+    def _credential_key(self) -> str:
+        return f'soop:{self.username}'
+
+    def _use_cookies(self, cookies: str) -> None:
+        self.cookies = cookies
+        self.pc_headers['cookie'] = cookies
+
     async def login_sooplive(self) -> str | None:
+        """
+        Returns the login cookies of the configured account, logging in only if no valid session is stored.
+
+        Returns:
+            str | None: The cookie string, or None if the login did not return an auth ticket.
+        """
+        credential = await get_credential_store().obtain(self._credential_key(), self._login_sooplive)
+        if credential is None:
+            return None
+        self._use_cookies(credential.value)
+        return credential.value
+
+    async def _login_sooplive(self) -> Credential | None:
         if self.username and self.password and len(self.username) < 6 or len(self.password) < 10:
             raise RuntimeError("sooplive login failed! Please enter the correct account and password for the sooplive "
                                "platform in the config.ini file.")
@@ -58,9 +83,10 @@ class SoopLiveStream(BaseLiveStream):
         try:
             cookie_dict = await async_req(url, proxy_addr=self.proxy_addr, headers=self.pc_headers,
                                           data=data, return_cookies=True, timeout=20)
-            self.cookies = '; '.join([f"{k}={v}" for k, v in cookie_dict.items()])
-            self.pc_headers['cookie'] = self.cookies
-            return self.cookies
+            cookies = '; '.join([f"{k}={v}" for k, v in cookie_dict.items()])
+            if 'AuthTicket=' not in cookies:
+                return None
+            return Credential(value=cookies, expires_at=time.time() + self.SESSION_TTL)
         except Exception as e:
             raise Exception(
                 f"sooplive login failed, please check if the account password in the configuration file is correct. {e}"
@@ -143,17 +169,9 @@ class SoopLiveStream(BaseLiveStream):
                     'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
                                   'Chrome/141.0.0.0 Safari/537.36 Edg/141.0.0.0',
                 }
-                resp = await async_req(url=m3u8, proxy_addr=self.proxy_addr, headers=headers)
-                play_url_list = []
+                playlist = await fetch_playlist(m3u8, proxy_addr=self.proxy_addr, headers=headers)
                 url_prefix = '/'.join(m3u8.split('/')[0:3])
-                for i in resp.split('\n'):
-                    if not i.startswith('#') and i.strip():
-                        play_url_list.append(url_prefix + i.strip())
-                bandwidth_pattern = re.compile(r'BANDWIDTH=(\d+)')
-                bandwidth_list = bandwidth_pattern.findall(resp)
-                url_to_bandwidth = {purl: int(bandwidth) for bandwidth, purl in zip(bandwidth_list, play_url_list)}
-                play_url_list = sorted(play_url_list, key=lambda purl: url_to_bandwidth[purl], reverse=True)
-                return play_url_list
+                return [url_prefix + stream.uri for stream in playlist.sorted_streams()]
 
             m3u8_url = 'https://global-media.sooplive.com/live/' + str(bj_id) + '/master.m3u8'
             result |= {
@@ -164,6 +182,34 @@ class SoopLiveStream(BaseLiveStream):
             }
         return result
 
+    async def check_live_status(self, url: str) -> bool:
+        """
+        Checks whether a room is live from the broadcast status only, without requesting a CDN
+        assignment or the master playlist.
+        """
+        split_url = url.split('/')
+        bj_id = split_url[3] if len(split_url) < 6 else split_url[5]
+        if "sooplive.com" in url:
+            status, _ = await self._get_soop_stream_info_global(bj_id)
+            return bool(status)
+
+        data = {
+            'bj_id': bj_id,
+            'broad_no': '',
+            'agent': 'web',
+            'confirm_adult': 'true',
+            'player_type': 'webm',
+            'mode': 'live',
+        }
+        json_str = await async_req('http://api.m.sooplive.co.kr/broad/a/watch', proxy_addr=self.proxy_addr,
+                                   headers=self.pc_headers, data=data)
+        json_data = json.loads(json_str)
+        code = json_data['data'].get('code')
+        if code == -6001:
+            raise Exception("error message：Please check if the input sooplive live room address is correct.")
+        # -3002 / -3004: the broadcast is on but needs a logged-in (adult) account to watch.
+        return json_data['result'] == 1 or code in (-3002, -3004)
+
     async def fetch_web_stream_data(self, url: str, process_data: bool = True) -> dict:
         """
         Fetches web stream data for a live room.
@@ -179,6 +225,11 @@ class SoopLiveStream(BaseLiveStream):
         if "sooplive.com" in url:
             return await self._fetch_web_stream_data_global(url, process_data)
 
+        if self.username and not self.cookies:
+            credential = await get_credential_store().get(self._credential_key())
+            if credential is not None:
+                self._use_cookies(credential.value)
+
         split_url = url.split('/')
         bj_id = split_url[3] if len(split_url) < 6 else split_url[5]
 
@@ -206,22 +257,18 @@ class SoopLiveStream(BaseLiveStream):
         result = {"anchor_name": anchor_name or '', "is_live": False, "live_url": url}
 
         async def get_url_list(m3u8: str) -> list[str]:
-            resp = await async_req(url=m3u8, proxy_addr=self.proxy_addr, headers=self.pc_headers)
-            play_url_list = []
+            playlist = await fetch_playlist(m3u8, proxy_addr=self.proxy_addr, headers=self.pc_headers)
             url_prefix = m3u8.rsplit('/', maxsplit=1)[0] + '/'
-            for i in resp.split('\n'):
-                if i.startswith('auth_playlist'):
-                    play_url_list.append(url_prefix + i.strip())
-            bandwidth_pattern = re.compile(r'BANDWIDTH=(\d+)')
-            bandwidth_list = bandwidth_pattern.findall(resp)
-            url_to_bandwidth = {purl: int(bandwidth) for bandwidth, purl in zip(bandwidth_list, play_url_list)}
-            play_url_list = sorted(play_url_list, key=lambda purl: url_to_bandwidth[purl], reverse=True)
-            return play_url_list
+            return [url_prefix + stream.uri for stream in playlist.sorted_streams()
+                    if stream.uri.startswith('auth_playlist')]
 
         if not anchor_name:
             async def handle_login() -> str | None:
+                if self.cookies:
+                    # The stored session, if it is the one just used, was rejected.
+                    await get_credential_store().invalidate(self._credential_key(), self.cookies)
                 cookie = await self.login_sooplive()
-                if 'AuthTicket=' in cookie:
+                if cookie and 'AuthTicket=' in cookie:
                     # print("sooplive platform login successful! Starting to fetch live streaming data...")
                     return cookie
 
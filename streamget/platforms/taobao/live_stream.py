@@ -4,8 +4,10 @@ import urllib.parse
 
 import execjs
 
-from ... import JS_SCRIPT_PATH, utils
+from ... import utils
+from ...alias_cache import get_alias_cache
 from ...data import StreamData, wrap_stream
+from ...js_worker import NodeWorkerError, call_js
 from ...requests.async_http import async_req
 from ..base import BaseLiveStream
 
@@ -41,9 +43,12 @@ class TaobaoLiveStream(BaseLiveStream):
 
         live_id = self.get_params(url, 'id') or self.get_params(url, 'liveId')
         if not live_id:
-            html_str = await async_req(url, proxy_addr=self.proxy_addr, headers=self.pc_headers)
-            redirect_url = re.findall("var url = '(.*?)';", html_str)[0]
-            live_id = self.get_params(redirect_url, 'id') or self.get_params(url, 'liveId')
+            async def fetch_live_id() -> str | None:
+                html_str = await async_req(url, proxy_addr=self.proxy_addr, headers=self.pc_headers)
+                redirect_url = re.findall("var url = '(.*?)';", html_str)[0]
+                return self.get_params(redirect_url, 'id') or self.get_params(url, 'liveId')
+
+            live_id = await get_alias_cache().resolve('taobao', url, fetch_live_id)
 
         params = {
             'jsv': '2.7.0',
@@ -67,10 +72,8 @@ class TaobaoLiveStream(BaseLiveStream):
             t13 = int(time.time() * 1000)
             pre_sign_str = f'{_m_h5_tk.split("_")[0]}&{t13}&{app_key}&' + params['data']
             try:
-                with open(f'{JS_SCRIPT_PATH}/taobao-sign.js') as f:
-                    js_code = f.read()
-                sign = execjs.compile(js_code).call('sign', pre_sign_str)
-            except execjs.ProgramError:
+                sign = await call_js('taobao-sign.js', 'sign', pre_sign_str)
+            except NodeWorkerError:
                 raise execjs.ProgramError('Failed to execute JS code. Please check if the Node.js environment')
             params |= {'sign': sign, 't': t13}
             api = 'https://h5api.m.taobao.com/h5/mtop.mediaplatform.live.livedetail/4.0/?' + \
@@ -3,7 +3,8 @@ import re
 from operator import itemgetter
 
 from ...data import StreamData, wrap_stream
-from ...requests.async_http import async_req, get_response_status
+from ...requests.async_http import MarkerExtractor, async_scan
+from ...verifier import get_stream_verifier, quality_fallback_order
 from ..base import BaseLiveStream
 
 
@@ -35,21 +36,24 @@ class TikTokLiveStream(BaseLiveStream):
         Returns:
             dict: A dictionary containing anchor name, live status, room URL, and title.
         """
-        html_str = await async_req(url=url, proxy_addr=self.proxy_addr, headers=self.pc_headers, http2=False)
+        # Only the SIGI_STATE blob is kept, and the download stops once it is complete. The start of the page
+        # is kept to explain pages without it.
+        extractor = await async_scan(
+            url, MarkerExtractor('<script id="SIGI_STATE" type="application/json">', '</script>', head_size=65536),
+            proxy_addr=self.proxy_addr, headers=self.pc_headers, http2=False)
+        if extractor.value is not None:
+            json_data = json.loads(extractor.value)
+            json_data['live_url'] = url
+            return json_data
+        html_str = extractor.head
         if "We regret to inform you that we have discontinued operating TikTok" in html_str:
             msg = re.search('<p>\n\\s+(We regret to inform you that we have discontinu.*?)\\.\n\\s+</p>', html_str)
             raise ConnectionError(
                 "Your proxy node's regional network is blocked from accessing TikTok; please switch to a node in "
                 f"another region to access. {msg.group(1) if msg else ''}"
             )
-        if 'UNEXPECTED_EOF_WHILE_READING' not in html_str:
-            json_str = re.findall(
-                '<script id="SIGI_STATE" type="application/json">(.*?)</script>', html_str, re.DOTALL)
-            if not json_str:
-                raise ConnectionError("Please check if your network can access the TikTok website normally")
-            json_data = json.loads(json_str[0])
-            json_data['live_url'] = url
-            return json_data
+        if 'UNEXPECTED_EOF_WHILE_READING' not in str(extractor.error):
+            raise ConnectionError("Please check if your network can access the TikTok website normally")
         return {'live_url': url}
 
     async def fetch_stream_url(self, json_data: dict, video_quality: str | int | None = None) -> StreamData:
@@ -111,17 +115,14 @@ class TikTokLiveStream(BaseLiveStream):
             while len(m3u8_url_list) < 5:
                 m3u8_url_list.append(m3u8_url_list[-1])
             video_quality, quality_index = self.get_quality_index(video_quality)
-            flv_dict: dict = flv_url_list[quality_index]
-            m3u8_dict: dict = m3u8_url_list[quality_index]
-
-            check_url = m3u8_dict.get('url') or flv_dict.get('url')
-            ok = await get_response_status(
-                url=check_url, proxy_addr=self.proxy_addr, headers=self.pc_headers, http2=False)
-
-            if not ok:
-                index = quality_index + 1 if quality_index < 4 else quality_index - 1
-                flv_dict: dict = flv_url_list[index]
-                m3u8_dict: dict = m3u8_url_list[index]
+            check_urls = [m3u8_dict.get('url') or flv_dict.get('url')
+                          for m3u8_dict, flv_dict in zip(m3u8_url_list, flv_url_list)]
+            order = quality_fallback_order(quality_index, len(check_urls))
+            verified = await get_stream_verifier().first_working(
+                [check_urls[i] for i in order], proxy_addr=self.proxy_addr, headers=self.pc_headers, http2=False)
+            index = check_urls.index(verified.best) if verified.best else quality_index
+            flv_dict: dict = flv_url_list[index]
+            m3u8_dict: dict = m3u8_url_list[index]
 
             flv_url = flv_dict['url'].replace("https://", "http://")
             m3u8_url = m3u8_dict['url'].replace("https://", "http://")
@@ -131,6 +132,7 @@ class TikTokLiveStream(BaseLiveStream):
                 'quality': video_quality,
                 'm3u8_url': m3u8_url,
                 'flv_url': flv_url,
-                'record_url': m3u8_url or flv_url
+                'record_url': m3u8_url or flv_url,
+                'extra': {'backup_url_list': [url.replace("https://", "http://") for url in verified.fallbacks]}
             }
         return wrap_stream(result)
\ No newline at end of file
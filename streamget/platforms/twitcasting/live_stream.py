@@ -1,7 +1,9 @@
 import json
 import re
+import time
 
 from ... import utils
+from ...credentials import Credential, get_credential_store
 from ...data import StreamData, wrap_stream
 from ...requests.async_http import async_req
 from ..base import BaseLiveStream
@@ -11,6 +13,9 @@ class TwitCastingLiveStream(BaseLiveStream):
     """
     A class for fetching and processing TwitCasting live stream information.
     """
+    # Login cookies are shared through the credential store and renewed after this many seconds.
+    SESSION_TTL = 24 * 3600
+
     def __init__(self, proxy_addr: str | None = None, cookies: str | None = None, username: str | None = None,
                  password: str | None = None, account_type: str | None = None):
         super().__init__(proxy_addr, cookies)
@@ -31,7 +36,27 @@ class TwitCastingLiveStream(BaseLiveStream):
                                       'keep=1; chid=relay_trade_jp;',
         }
 
+    def _credential_key(self) -> str:
+        return f'twitcasting:{self.account_type or "default"}:{self.username}'
+
+    def _use_cookies(self, cookies: str) -> None:
+        self.cookies = cookies
+        self.mobile_headers['cookie'] = cookies
+
     async def login_twitcasting(self) -> str | None:
+        """
+        Returns the login cookies of the configured account, logging in only if no valid session is stored.
+
+        Returns:
+            str | None: The cookie string, or None if the login did not return a session cookie.
+        """
+        credential = await get_credential_store().obtain(self._credential_key(), self._login_twitcasting)
+        if credential is None:
+            return None
+        self._use_cookies(credential.value)
+        return credential.value
+
+    async def _login_twitcasting(self) -> Credential | None:
         if self.account_type == "twitter":
             login_url = 'https://twitcasting.tv/indexpasswordlogin.php'
             login_api = 'https://twitcasting.tv/indexpasswordlogin.php?redir=/indexloginwindow.php?next=%2F&keep=1'
@@ -53,9 +78,8 @@ class TwitCastingLiveStream(BaseLiveStream):
                 login_api, proxy_addr=self.proxy_addr, headers=self.mobile_headers,
                 data=data, return_cookies=True, timeout=20)
             if 'tc_ss' in cookie_dict:
-                self.cookies = utils.dict_to_cookie_str(cookie_dict)
-                self.mobile_headers['cookie'] = self.cookies
-                return self.cookies
+                cookies = utils.dict_to_cookie_str(cookie_dict)
+                return Credential(value=cookies, expires_at=time.time() + self.SESSION_TTL)
         except Exception as e:
             raise Exception("TwitCasting login error,", e)
 
@@ -82,6 +106,10 @@ class TwitCastingLiveStream(BaseLiveStream):
 
         result = {"anchor_name": '', "is_live": False, "live_url": url}
         new_cookie = None
+        if self.username and not self.cookies:
+            credential = await get_credential_store().get(self._credential_key())
+            if credential is not None:
+                self._use_cookies(credential.value)
         try:
             to_login = self.get_params(url, "login")
             if to_login == 'true':
@@ -95,6 +123,9 @@ class TwitCastingLiveStream(BaseLiveStream):
             anchor_name, live_status, live_title = await get_data()
         except AttributeError:
             # print("Failed to retrieve TwitCasting data, attempting to log in...")
+            if self.cookies:
+                # The stored session, if it is the one just used, was rejected.
+                await get_credential_store().invalidate(self._credential_key(), self.cookies)
             new_cookie = await self.login_twitcasting()
             if not new_cookie:
                 raise RuntimeError("TwitCasting login failed, please check if the account and password in the "
@@ -1,9 +1,9 @@
 import json
 import random
-import re
 import urllib.parse
 
 from ...data import StreamData, wrap_stream
+from ...m3u8 import fetch_playlist
 from ...requests.async_http import async_req
 from ...utils import generate_random_string
 from ..base import BaseLiveStream
@@ -77,55 +77,29 @@ class TwitchLiveStream(BaseLiveStream):
             'is_audio_only': bool
         }
         """
-        resp = await async_req(m3u8, proxy_addr=proxy, headers=headers)
+        playlist = await fetch_playlist(m3u8, proxy_addr=proxy, headers=headers)
         play_url_list = []
-
-        lines = resp.split('\n')
-        current_stream_info = {}
-        current_group_id = None
-        current_name = None
-
-        for line in lines:
-            line = line.strip()
-
-            # Parse #EXT-X-MEDIA line to get GROUP-ID and NAME
-            if line.startswith('#EXT-X-MEDIA:'):
-                group_id_match = re.search(r'GROUP-ID="([^"]+)"', line)
-                name_match = re.search(r'NAME="([^"]+)"', line)
-                if group_id_match:
-                    current_group_id = group_id_match.group(1)
-                if name_match:
-                    current_name = name_match.group(1)
-
-            # Parse #EXT-X-STREAM-INF line
-            elif line.startswith('#EXT-X-STREAM-INF:'):
-                bandwidth_match = re.search(r'BANDWIDTH=(\d+)', line)
-                resolution_match = re.search(r'RESOLUTION=(\d+x\d+)', line)
-
-                current_stream_info['bandwidth'] = int(bandwidth_match.group(1)) if bandwidth_match else 0
-                current_stream_info['resolution'] = resolution_match.group(1) if resolution_match else None
-
-            # URL line - add stream to list
-            elif line.startswith('https://') and current_stream_info:
-                stream = {
-                    'url': line,
-                    'bandwidth': current_stream_info.get('bandwidth', 0),
-                    'resolution': current_stream_info.get('resolution'),
-                    'group_id': current_group_id or 'unknown',
-                    'name': current_name or 'unknown',
-                    'is_audio_only': current_group_id == 'audio_only'
-                }
-                play_url_list.append(stream)
-
-                # Reset for next stream
-                current_stream_info = {}
-                current_group_id = None
-                current_name = None
-
-        # Sort by bandwidth descending (highest quality first)
-        play_url_list.sort(key=lambda x: x['bandwidth'], reverse=True)
+        for stream in playlist.sorted_streams():
+            if not stream.uri.startswith('https://'):
+                continue
+            group_id = stream.media.group_id if stream.media else None
+            play_url_list.append({
+                'url': stream.uri,
+                'bandwidth': stream.bandwidth,
+                'resolution': stream.resolution,
+                'group_id': group_id or 'unknown',
+                'name': (stream.media.name if stream.media else None) or 'unknown',
+                'is_audio_only': group_id == 'audio_only'
+            })
         return play_url_list
 
+    async def check_live_status(self, url: str) -> bool:
+        """
+        Checks whether a channel is live with the GQL room query only, without requesting a playback token.
+        """
+        _, status, _ = await self.get_twitchtv_room_info(url)
+        return status
+
     async def fetch_web_stream_data(self, url: str, process_data: bool = True) -> dict:
         """
         Fetches web stream data for a live room.
@@ -1,8 +1,7 @@
 import json
-import re
 
 from ...data import StreamData, wrap_stream
-from ...requests.async_http import async_req
+from ...requests.async_http import async_extract
 from ..base import BaseLiveStream
 
 
@@ -14,6 +13,25 @@ class YoutubeLiveStream(BaseLiveStream):
         super().__init__(proxy_addr, cookies)
         self.pc_headers = self._get_pc_headers()
 
+    async def _get_player_response(self, url: str) -> dict:
+        # The player response is near the top of the watch page; the rest of the page is not downloaded.
+        json_str = await async_extract(
+            url, 'var ytInitialPlayerResponse = ', ';var meta = document.createElement',
+            proxy_addr=self.proxy_addr, headers=self.pc_headers)
+        if json_str is None:
+            raise Exception(f"Failed to find ytInitialPlayerResponse in {url}")
+        return json.loads(json_str)
+
+    async def check_live_status(self, url: str) -> bool:
+        """
+        Checks whether a video is live from the watch page, without fetching the HLS master playlist.
+        """
+        json_data = await self._get_player_response(url)
+        if 'videoDetails' not in json_data:
+            raise Exception(
+                "Error: Please log in to YouTube on your device's webpage and configure cookies in the config.ini")
+        return bool(json_data['videoDetails'].get('isLive'))
+
     async def fetch_web_stream_data(self, url: str, process_data: bool = True) -> dict:
         """
         Fetches web stream data for a live room.
@@ -25,10 +43,7 @@ class YoutubeLiveStream(BaseLiveStream):
         Returns:
             dict: A dictionary containing anchor name, live status, room URL, and title.
         """
-        html_str = await async_req(url, proxy_addr=self.proxy_addr, headers=self.pc_headers)
-        json_str = re.search('var ytInitialPlayerResponse = (.*?);var meta = document\\.createElement', html_str).group(
-            1)
-        json_data = json.loads(json_str)
+        json_data = await self._get_player_response(url)
         if not process_data:
             return json_data
         result = {"anchor_name": "", "is_live": False, "live_url": url}
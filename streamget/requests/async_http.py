@@ -1,8 +1,7 @@
 from typing import Any
 
-import httpx
-
-from .. import utils
+from .client_pool import ClientPool, get_client_pool
+from .single_flight import get_single_flight, request_key
 
 OptionalStr = str | None
 OptionalDict = dict[str, Any] | None
@@ -19,7 +18,9 @@ async def async_req(
         return_cookies: bool = False,
         include_cookies: bool = False,
         verify: bool = False,
-        http2: bool = True
+        http2: bool = True,
+        pool: ClientPool | None = None,
+        coalesce: bool | None = None
 ) -> OptionalDict | OptionalStr | tuple:
     """
     Sends an asynchronous HTTP request to the specified URL.
@@ -40,6 +41,10 @@ async def async_req(
         include_cookies (bool): If True, includes cookies in the response tuple. Defaults to False.
         verify (bool): If, True verifies the SSL certificate. Defaults to False.
         http2 (bool): If True, enables HTTP/2 support. Defaults to True.
+        pool (ClientPool | None): The client pool to send the request through. Defaults to the shared pool.
+        coalesce (bool | None): If True, identical requests made while one is in flight share its response.
+            Defaults to None, which coalesces GET requests only: POST requests such as logins are sent
+            separately unless `coalesce=True` is passed.
 
     Returns:
         OptionalDict | OptionalStr | tuple: The response text, JSON data,
@@ -60,17 +65,56 @@ async def async_req(
         - If `data` or `json_data` is provided, a POST request is sent; otherwise, a GET request is sent.
         - The `redirect_url` parameter only returns the final URL after following redirects.
         - If `return_cookies` is True, the function returns a tuple containing the response text and cookies.
+        - Connections are reused between calls through the shared `ClientPool`.
+        - Concurrent GET calls with the same URL, headers and options send a single request.
     """
     if headers is None:
         headers = {}
+    pool = pool or get_client_pool()
+    method = 'POST' if data or json_data else 'GET'
+    if coalesce is None:
+        coalesce = method == 'GET'
+    if not coalesce:
+        return await _send_request(
+            url, proxy_addr, headers, data, json_data, timeout, redirect_url, return_cookies, include_cookies,
+            verify, http2, pool)
+
+    key = request_key(method, url, data or json_data, headers, proxy_addr, timeout, redirect_url, return_cookies,
+                      include_cookies, verify, http2, bool(json_data), id(pool))
+    result = await get_single_flight().do(key, lambda: _send_request(
+        url, proxy_addr, headers, data, json_data, timeout, redirect_url, return_cookies, include_cookies,
+        verify, http2, pool))
+    # The cookie dicts are shared by every coalesced caller; hand out copies.
+    if isinstance(result, dict):
+        return dict(result)
+    if isinstance(result, tuple):
+        return result[0], dict(result[1])
+    return result
+
+
+async def _send_request(
+        url: str,
+        proxy_addr: OptionalStr,
+        headers: dict,
+        data: dict | bytes | None,
+        json_data: dict | list | None,
+        timeout: int,
+        redirect_url: bool,
+        return_cookies: bool,
+        include_cookies: bool,
+        verify: bool,
+        http2: bool,
+        pool: ClientPool
+) -> OptionalDict | OptionalStr | tuple:
     try:
-        proxy_addr = utils.handle_proxy_addr(proxy_addr)
         if data or json_data:
-            async with httpx.AsyncClient(proxy=proxy_addr, timeout=timeout, verify=verify, http2=http2) as client:
-                response = await client.post(url, data=data, json=json_data, headers=headers)
+            response = await pool.request(
+                'POST', url, proxy_addr=proxy_addr, verify=verify, http2=http2,
+                data=data, json=json_data, headers=headers, timeout=timeout)
         else:
-            async with httpx.AsyncClient(proxy=proxy_addr, timeout=timeout, verify=verify, http2=http2) as client:
-                response = await client.get(url, headers=headers, follow_redirects=True)
+            response = await pool.request(
+                'GET', url, proxy_addr=proxy_addr, verify=verify, http2=http2,
+                headers=headers, timeout=timeout, follow_redirects=True)
 
         if redirect_url:
             return str(response.url)
@@ -85,13 +129,194 @@ async def async_req(
     return resp_str
 
 
+class MarkerExtractor:
+    """
+    Finds the text between a start and an end marker in a body that arrives in chunks.
+
+    Markers split across chunk boundaries are found. While the start marker is being searched, only a few
+    characters of the body are kept; once it is found, only the text after it is kept. `feed` returns True
+    as soon as the end marker has been seen, so the rest of the body does not have to be read. Like the
+    non-greedy pattern `start(.*?)end`, the value ends at the first end marker after the start marker.
+
+    Attributes:
+        value (str | None): The text between the markers, or None until the end marker has been seen.
+        head (str): The first `head_size` characters of the body, to inspect pages without the markers.
+        error (Exception | None): The error that interrupted the download, set by `async_scan`.
+
+    Example:
+        >>> extractor = MarkerExtractor('<script id="SIGI_STATE" type="application/json">', '</script>')
+        >>> for chunk in chunks:
+        ...     if extractor.feed(chunk):
+        ...         break
+        >>> extractor.value
+    """
+
+    def __init__(self, start: str, end: str, head_size: int = 0):
+        """
+        Initializes a new marker extractor.
+
+        Args:
+            start (str): The text that precedes the value.
+            end (str): The text that follows the value.
+            head_size (int): Number of characters kept from the start of the body. Defaults to 0.
+        """
+        if not start or not end:
+            raise ValueError('The start and end markers must not be empty')
+        self.start = start
+        self.end = end
+        self.head_size = head_size
+        self.value: str | None = None
+        self.head = ''
+        self.error: Exception | None = None
+        self._found_start = False
+        self._tail = ''
+        self._parts: list[str] = []
+        self._length = 0
+
+    @property
+    def complete(self) -> bool:
+        return self.value is not None
+
+    def feed(self, chunk: str) -> bool:
+        """
+        Scans the next chunk of the body.
+
+        Args:
+            chunk (str): The chunk.
+
+        Returns:
+            bool: True once the value is complete.
+        """
+        if self.value is not None:
+            return True
+        if len(self.head) < self.head_size:
+            self.head += chunk[:self.head_size - len(self.head)]
+
+        if not self._found_start:
+            window = self._tail + chunk
+            index = window.find(self.start)
+            if index == -1:
+                self._tail = window[max(0, len(window) - len(self.start) + 1):]
+                return False
+            self._found_start = True
+            self._tail = ''
+            chunk = window[index + len(self.start):]
+
+        window = self._tail + chunk
+        index = window.find(self.end)
+        if index == -1:
+            self._parts.append(chunk)
+            self._length += len(chunk)
+            self._tail = window[max(0, len(window) - len(self.end) + 1):]
+            return False
+        # The end marker may have started in the tail kept from the previous chunk.
+        self.value = (''.join(self._parts) + chunk)[:self._length - len(self._tail) + index]
+        self._parts = []
+        return True
+
+
+async def async_scan(
+        url: str,
+        extractor: MarkerExtractor,
+        proxy_addr: OptionalStr = None,
+        headers: OptionalDict = None,
+        timeout: int = 20,
+        verify: bool = False,
+        http2: bool = True,
+        pool: ClientPool | None = None
+) -> MarkerExtractor:
+    """
+    Downloads a page into a `MarkerExtractor` and closes the connection as soon as the value is complete.
+
+    Like `async_req`, errors are not raised; they are stored in `extractor.error`.
+
+    Args:
+        url (str): The URL of the page.
+        extractor (MarkerExtractor): The extractor to feed.
+        proxy_addr (OptionalStr): The proxy address to use. Defaults to None.
+        headers (OptionalDict): Custom headers to include in the request. Defaults to None.
+        timeout (int): The request timeout in seconds. Defaults to 20.
+        verify (bool): If True, verifies the SSL certificate. Defaults to False.
+        http2 (bool): If True, enables HTTP/2 support. Defaults to True.
+        pool (ClientPool | None): The client pool to send the request through. Defaults to the shared pool.
+
+    Returns:
+        MarkerExtractor: The extractor.
+    """
+    pool = pool or get_client_pool()
+    try:
+        response = await pool.request(
+            'GET', url, proxy_addr=proxy_addr, verify=verify, http2=http2, headers=headers or {},
+            timeout=timeout, follow_redirects=True, stream=True)
+        try:
+            async for chunk in response.aiter_text():
+                if extractor.feed(chunk):
+                    break
+        finally:
+            await response.aclose()
+    except Exception as e:
+        extractor.error = e
+    return extractor
+
+
+async def async_extract(
+        url: str,
+        start: str,
+        end: str,
+        proxy_addr: OptionalStr = None,
+        headers: OptionalDict = None,
+        timeout: int = 20,
+        verify: bool = False,
+        http2: bool = True,
+        pool: ClientPool | None = None,
+        coalesce: bool = True
+) -> OptionalStr:
+    """
+    Downloads a page and returns the text between two markers, e.g. a JSON blob embedded in the HTML.
+
+    The body is scanned while it is being received and the connection is closed as soon as the end marker
+    arrives, so the rest of the page is neither downloaded nor kept in memory.
+
+    Args:
+        url (str): The URL of the page.
+        start (str): The text that precedes the value.
+        end (str): The text that follows the value.
+        proxy_addr (OptionalStr): The proxy address to use. Defaults to None.
+        headers (OptionalDict): Custom headers to include in the request. Defaults to None.
+        timeout (int): The request timeout in seconds. Defaults to 20.
+        verify (bool): If True, verifies the SSL certificate. Defaults to False.
+        http2 (bool): If True, enables HTTP/2 support. Defaults to True.
+        pool (ClientPool | None): The client pool to send the request through. Defaults to the shared pool.
+        coalesce (bool): If True, identical extractions made while one is in flight share its result.
+            Defaults to True.
+
+    Returns:
+        OptionalStr: The text between the markers, or None if they were not found or the request failed.
+
+    Example:
+        >>> json_str = await async_extract(url, 'var ytInitialPlayerResponse = ', ';var meta = ')
+    """
+    pool = pool or get_client_pool()
+
+    async def extract() -> OptionalStr:
+        extractor = await async_scan(url, MarkerExtractor(start, end), proxy_addr, headers, timeout, verify, http2,
+                                     pool)
+        return extractor.value
+
+    if not coalesce:
+        return await extract()
+    key = request_key('GET', url, None, headers, proxy_addr, timeout, verify, http2, id(pool), 'extract', start, end)
+    return await get_single_flight().do(key, extract)
+
+
 async def get_response_status(
         url: str,
         proxy_addr: OptionalStr = None,
         headers: OptionalDict = None,
         timeout: int = 10,
         verify: bool = False,
-        http2: bool = True
+        http2: bool = True,
+        pool: ClientPool | None = None
 ) -> int:
     """
     Checks if a URL returns a successful HTTP status code (200 OK).
@@ -106,6 +331,7 @@ async def get_response_status(
         timeout (int): The request timeout in seconds. Defaults to 10.
         verify (bool): If True, verifies the SSL certificate. Defaults to False.
         http2 (bool): If True, enables HTTP/2 support. Defaults to True.
+        pool (ClientPool | None): The client pool to send the request through. Defaults to the shared pool.
 
     Returns:
         int: such as 200, 304, 403.
@@ -125,11 +351,12 @@ async def get_response_status(
         - This function uses the HEAD request method, which is lightweight and suitable for checking status codes.
         - returns a status code other than 200 OK.
     """
+    pool = pool or get_client_pool()
     try:
-        proxy_addr = utils.handle_proxy_addr(proxy_addr)
-        async with httpx.AsyncClient(proxy=proxy_addr, timeout=timeout, verify=verify, http2=http2) as client:
-            response = await client.head(url, headers=headers, follow_redirects=True)
-            return response.status_code
+        response = await pool.request(
+            'HEAD', url, proxy_addr=proxy_addr, verify=verify, http2=http2,
+            headers=headers, timeout=timeout, follow_redirects=True)
+        return response.status_code
     except Exception as e:
         print(e)
     return False
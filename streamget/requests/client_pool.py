@@ -0,0 +1,203 @@
+import asyncio
+import weakref
+from contextvars import ContextVar
+from typing import Any
+
+import httpx
+
+from .. import utils
+from . import instrument
+
+_request_cookies: ContextVar[httpx.Cookies | None] = ContextVar('streamget_request_cookies', default=None)
+
+
+class _PooledAsyncClient(httpx.AsyncClient):
+    """
+    AsyncClient whose cookie jar is scoped to a single request instead of the client.
+
+    A pooled client is shared by every platform and every room, so cookies set by one response
+    must never leak into another request. Each call made through `ClientPool.request` gets a fresh
+    jar, which still carries cookies across the redirects of that one call, exactly like the
+    throwaway clients used previously.
+    """
+
+    @property
+    def cookies(self) -> httpx.Cookies:
+        jar = _request_cookies.get()
+        return jar if jar is not None else httpx.Cookies()
+
+    @cookies.setter
+    def cookies(self, cookies: Any) -> None:
+        pass
+
+
+class ClientPool:
+    """
+    A registry of long-lived, connection-pooled `httpx.AsyncClient` instances.
+
+    Clients are keyed by (proxy, verify, http2) and kept alive between requests, so repeated polls
+    of the same host reuse TCP/TLS connections (and HTTP/2 connections are multiplexed) instead of
+    paying a new handshake for every request.
+
+    `httpx` connections are bound to the event loop that opened them, so the registry keeps a
+    separate set of clients per running loop. Clients belonging to a loop that has been closed are
+    dropped together with the loop.
+
+    Example:
+        >>> async def main():
+        ...     async with ClientPool(max_connections=200) as pool:
+        ...         response = await pool.request('GET', 'https://example.com')
+        ...         print(response.status_code)
+        >>> asyncio.run(main())
+        200
+    """
+
+    def __init__(
+            self,
+            max_connections: int | None = 100,
+            max_keepalive_connections: int | None = 20,
+            keepalive_expiry: float | None = 30.0,
+            transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        """
+        Initializes a new client pool.
+
+        Args:
+            max_connections (int | None): Maximum number of connections per client. Defaults to 100.
+            max_keepalive_connections (int | None): Maximum number of idle connections kept alive per client.
+                Defaults to 20.
+            keepalive_expiry (float | None): Seconds an idle connection is kept before being closed. Defaults to 30.
+            transport (httpx.AsyncBaseTransport | None): Sends every request of the pool instead of the network,
+                e.g. a `RecordReplayTransport`. Proxy settings are then left to the transport. Defaults to None.
+        """
+        self.transport = transport
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[Any, httpx.AsyncClient]] = \
+            weakref.WeakKeyDictionary()
+
+    def _create_client(self, proxy_addr: str | None, verify: bool, http2: bool) -> httpx.AsyncClient:
+        if self.transport is not None:
+            # A proxy would be mounted in front of the transport and bypass it.
+            return _PooledAsyncClient(transport=self.transport)
+        return _PooledAsyncClient(proxy=proxy_addr, verify=verify, http2=http2, limits=self.limits)
+
+    def _loop_clients(self) -> dict[Any, httpx.AsyncClient]:
+        return self._clients.setdefault(asyncio.get_running_loop(), {})
+
+    def get_client(self, proxy_addr: str | None = None, verify: bool = False, http2: bool = True) -> httpx.AsyncClient:
+        """
+        Returns the pooled client for the given settings, creating it on first use.
+
+        Must be called from within a running event loop.
+
+        Args:
+            proxy_addr (str | None): The proxy address to use. Defaults to None.
+            verify (bool): Whether to verify SSL certificates. Defaults to False.
+            http2 (bool): Whether to enable HTTP/2. Defaults to True.
+
+        Returns:
+            httpx.AsyncClient: The shared client for these settings.
+        """
+        clients = self._loop_clients()
+        proxy_addr = utils.handle_proxy_addr(proxy_addr)
+        key = (proxy_addr, verify, http2)
+        client = clients.get(key)
+        if client is None or client.is_closed:
+            client = clients[key] = self._create_client(proxy_addr, verify, http2)
+        return client
+
+    async def request(
+            self,
+            method: str,
+            url: str,
+            proxy_addr: str | None = None,
+            verify: bool = False,
+            http2: bool = True,
+            **kwargs
+    ) -> httpx.Response:
+        """
+        Sends a request through the pooled client matching the given settings.
+
+        Any extra keyword arguments (headers, data, json, timeout, follow_redirects...) are passed
+        to `httpx.AsyncClient.request`. Cookies set by the response are visible on
+        `response.cookies` but are not kept for later requests.
+
+        With `stream=True` the response is returned as soon as its headers arrive; the body must be
+        read with `response.aiter_bytes()` / `aiter_text()` and the response closed with `aclose()`.
+
+        Returns:
+            httpx.Response: The fully read response, or the open streaming response.
+        """
+        client = self.get_client(proxy_addr, verify, http2)
+        return await self._send(client, method, url, **kwargs)
+
+    @staticmethod
+    async def _send(client: httpx.AsyncClient, method: str, url: str, stream: bool = False, **kwargs) -> httpx.Response:
+        token = _request_cookies.set(httpx.Cookies())
+        trace = None
+        if instrument.is_enabled():
+            # Streamed responses are reported when their headers arrive, without a "body" phase.
+            trace = instrument.RequestTrace()
+            kwargs['extensions'] = {**(kwargs.get('extensions') or {}), 'trace': trace}
+        try:
+            if not stream:
+                response = await client.request(method, url, **kwargs)
+            else:
+                follow_redirects = kwargs.pop('follow_redirects', httpx.USE_CLIENT_DEFAULT)
+                request = client.build_request(method, url, **kwargs)
+                response = await client.send(request, stream=True, follow_redirects=follow_redirects)
+        except Exception as e:
+            if trace is not None:
+                trace.finish(url, method, error=e)
+            raise
+        finally:
+            _request_cookies.reset(token)
+        if trace is not None:
+            trace.finish(url, method, response.status_code)
+        return response
+
+    async def aclose(self) -> None:
+        """
+        Closes every client created by this pool on the current event loop.
+        """
+        loop = asyncio.get_running_loop()
+        clients = self._clients.pop(loop, {})
+        for client in clients.values():
+            await client.aclose()
+
+    async def __aenter__(self) -> 'ClientPool':
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.aclose()
+
+
+_default_pool = ClientPool()
+
+
+def get_client_pool() -> ClientPool:
+    """
+    Returns the process-wide client pool used by `async_req` and `get_response_status`.
+    """
+    return _default_pool
+
+
+def set_client_pool(pool: ClientPool) -> None:
+    """
+    Replaces the process-wide client pool, e.g. to change the connection limits.
+
+    The previous pool is not closed; call `aclose()` on it if it has been used.
+    """
+    global _default_pool
+    _default_pool = pool
+
+
+async def close_client_pool() -> None:
+    """
+    Closes the connections held by the process-wide client pool on the current event loop.
+    """
+    await _default_pool.aclose()
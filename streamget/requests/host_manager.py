@@ -0,0 +1,207 @@
+import asyncio
+import time
+import weakref
+from dataclasses import dataclass, replace
+
+import httpx
+
+from .. import utils
+from .client_pool import ClientPool, _PooledAsyncClient
+
+
+@dataclass
+class HostStats:
+    """
+    Request counters for a single origin (scheme, host and port).
+
+    Attributes:
+        origin (str): The origin, e.g. "https://api.live.bilibili.com".
+        http_version (str | None): The protocol negotiated by the last response, e.g. "HTTP/2".
+        multiplexed (bool): Whether requests to this origin share a single HTTP/2 connection. It is set once the
+            origin has answered over HTTP/2 without redirecting to another origin.
+        requests (int): Number of completed requests.
+        failures (int): Number of requests that raised an error.
+        in_flight (int): Number of requests currently being sent.
+        peak_in_flight (int): Highest number of requests sent at the same time.
+        waiting (int): Number of requests waiting for a free stream slot.
+        total_time (float): Accumulated request time in seconds.
+    """
+    origin: str
+    http_version: str | None = None
+    multiplexed: bool = False
+    requests: int = 0
+    failures: int = 0
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    waiting: int = 0
+    total_time: float = 0.0
+
+    @property
+    def average_time(self) -> float:
+        return self.total_time / self.requests if self.requests else 0.0
+
+
+class HostConnectionManager(ClientPool):
+    """
+    A host-aware client pool for polling many rooms that live on the same few API hosts.
+
+    Every origin gets its own client. Requests start on a small per-host connection pool; once an
+    origin has negotiated HTTP/2 it is served over a single multiplexed connection. Origins that only
+    speak HTTP/1.1, redirect to other origins, or are requested with http2=False stay on the pool.
+    The number of concurrent requests per origin is capped, and per-origin counters are available
+    through `stats()`.
+
+    Example:
+        >>> from streamget.requests.client_pool import set_client_pool
+        >>> manager = HostConnectionManager(max_streams_per_host=200)
+        >>> set_client_pool(manager)
+        >>> # ... run the platform fetchers ...
+        >>> manager.stats()['https://api.live.bilibili.com']
+        HostStats(origin='https://api.live.bilibili.com', http_version='HTTP/2', multiplexed=True, ...)
+    """
+
+    def __init__(
+            self,
+            max_streams_per_host: int = 100,
+            max_connections_per_host: int = 10,
+            keepalive_expiry: float | None = 30.0,
+            transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        """
+        Initializes a new host connection manager.
+
+        Args:
+            max_streams_per_host (int): Maximum number of concurrent requests per origin. Defaults to 100.
+            max_connections_per_host (int): Maximum number of connections per origin when it cannot be
+                multiplexed over HTTP/2. Defaults to 10.
+            keepalive_expiry (float | None): Seconds an idle connection is kept before being closed. Defaults to 30.
+            transport (httpx.AsyncBaseTransport | None): Sends every request instead of the network, e.g. a
+                `RecordReplayTransport`. Defaults to None.
+        """
+        super().__init__(
+            max_connections=max_connections_per_host,
+            max_keepalive_connections=max_connections_per_host,
+            keepalive_expiry=keepalive_expiry,
+            transport=transport
+        )
+        self.max_streams_per_host = max_streams_per_host
+        self.multiplexed_limits = httpx.Limits(
+            max_connections=1, max_keepalive_connections=1, keepalive_expiry=keepalive_expiry)
+        self._stats: dict[str, HostStats] = {}
+        # Origins that redirected to another origin are never multiplexed.
+        self._redirecting: set[str] = set()
+        self._semaphores: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.Semaphore]] = \
+            weakref.WeakKeyDictionary()
+
+    @staticmethod
+    def _origin(url: str) -> str:
+        parsed = httpx.URL(url)
+        port = parsed.port
+        return f'{parsed.scheme}://{parsed.host}' + (f':{port}' if port else '')
+
+    def _get_stats(self, origin: str) -> HostStats:
+        stats = self._stats.get(origin)
+        if stats is None:
+            stats = self._stats[origin] = HostStats(origin=origin)
+        return stats
+
+    def _get_semaphore(self, origin: str) -> asyncio.Semaphore:
+        semaphores = self._semaphores.setdefault(asyncio.get_running_loop(), {})
+        semaphore = semaphores.get(origin)
+        if semaphore is None:
+            semaphore = semaphores[origin] = asyncio.Semaphore(self.max_streams_per_host)
+        return semaphore
+
+    def get_host_client(
+            self,
+            url: str,
+            proxy_addr: str | None = None,
+            verify: bool = False,
+            http2: bool = True
+    ) -> httpx.AsyncClient:
+        """
+        Returns the client dedicated to the origin of `url`, creating it on first use.
+
+        Args:
+            url (str): Any URL on the target origin.
+            proxy_addr (str | None): The proxy address to use. Defaults to None.
+            verify (bool): Whether to verify SSL certificates. Defaults to False.
+            http2 (bool): Whether HTTP/2 may be used for this origin. Defaults to True.
+
+        Returns:
+            httpx.AsyncClient: The client for this origin and settings.
+        """
+        origin = self._origin(url)
+        multiplexed = http2 and self._get_stats(origin).multiplexed
+        proxy_addr = utils.handle_proxy_addr(proxy_addr)
+        key = (origin, proxy_addr, verify, http2, multiplexed)
+        clients = self._loop_clients()
+        client = clients.get(key)
+        if client is None or client.is_closed:
+            if self.transport is not None:
+                client = clients[key] = _PooledAsyncClient(transport=self.transport)
+            else:
+                limits = self.multiplexed_limits if multiplexed else self.limits
+                client = clients[key] = _PooledAsyncClient(
+                    proxy=proxy_addr, verify=verify, http2=http2, limits=limits)
+        return client
+
+    async def request(
+            self,
+            method: str,
+            url: str,
+            proxy_addr: str | None = None,
+            verify: bool = False,
+            http2: bool = True,
+            **kwargs
+    ) -> httpx.Response:
+        origin = self._origin(url)
+        stats = self._get_stats(origin)
+        semaphore = self._get_semaphore(origin)
+
+        stats.waiting += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            stats.waiting -= 1
+
+        stats.in_flight += 1
+        stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+        start = time.monotonic()
+        try:
+            client = self.get_host_client(url, proxy_addr, verify, http2)
+            response = await self._send(client, method, url, **kwargs)
+        except Exception:
+            stats.failures += 1
+            raise
+        finally:
+            stats.in_flight -= 1
+            stats.total_time += time.monotonic() - start
+            semaphore.release()
+
+        stats.requests += 1
+        stats.http_version = response.http_version
+        if response.history:
+            if any(self._origin(str(hop.url)) != origin for hop in (*response.history[1:], response)):
+                # The single connection would also carry the hops to the other origin and serialize them.
+                self._redirecting.add(origin)
+                stats.multiplexed = False
+        elif http2 and origin not in self._redirecting:
+            # Only an origin that negotiated HTTP/2 can share one connection; over HTTP/1.1 it would
+            # serialize every request.
+            stats.multiplexed = response.http_version == 'HTTP/2'
+
+        return response
+
+    def stats(self) -> dict[str, HostStats]:
+        """
+        Returns a snapshot of the per-origin counters.
+
+        Returns:
+            dict[str, HostStats]: Counters keyed by origin.
+        """
+        return {origin: replace(stats) for origin, stats in self._stats.items()}
+
+    async def aclose(self) -> None:
+        await super().aclose()
+        self._semaphores.pop(asyncio.get_running_loop(), None)
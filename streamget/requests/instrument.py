@@ -0,0 +1,227 @@
+import time
+import urllib.parse
+from collections.abc import Callable
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+REQUEST = 'request'
+STAGE = 'stage'
+SIGN = 'sign'
+
+
+@dataclass(slots=True)
+class Timing:
+    """
+    The timings of one instrumented operation.
+
+    Attributes:
+        kind (str): "request" for an HTTP request, "sign" for request signing (e.g. a JS signer or `a_bogus`),
+            and "stage" for a whole `fetch_web_stream_data` or `fetch_stream_url` call.
+        name (str): The endpoint (host and path) of a request, the signer, or the stage method name.
+        platform (str | None): The platform class the operation ran for, e.g. "DouyinLiveStream", or None
+            outside of a platform call.
+        duration (float): Wall time of the operation, in seconds.
+        phases (dict[str, float]): Seconds per phase. Requests have "queue" (waiting for a pooled
+            connection), "connect" (DNS lookup and TCP connect), "tls", "ttfb" (request sent until the
+            response headers arrive) and "body"; phases that did not happen, e.g. "connect" on a reused
+            connection, are left out. Stages have "http" and "sign" (time spent in requests and signing
+            made by the stage) and "other" (the rest, mostly parsing); with concurrent requests, "http"
+            counts each of them and "other" is a lower bound.
+        status (int | None): The HTTP status code of a request.
+        error (str | None): The exception class name if the operation failed.
+    """
+    kind: str
+    name: str
+    platform: str | None
+    duration: float
+    phases: dict[str, float] = field(default_factory=dict)
+    status: int | None = None
+    error: str | None = None
+
+
+TimingCallback = Callable[[Timing], Any]
+
+_callbacks: list[TimingCallback] = []
+_platform: ContextVar[str | None] = ContextVar('streamget_timing_platform', default=None)
+# The running stage accumulates the time spent in requests and signing: [http seconds, sign seconds].
+_stage_totals: ContextVar[list[float] | None] = ContextVar('streamget_timing_stage', default=None)
+_disabled_span = nullcontext()
+
+
+def add_timing_callback(callback: TimingCallback) -> None:
+    """
+    Registers a function called with a `Timing` for every instrumented request, signing call and stage.
+
+    Callbacks run synchronously on the event loop, so they should only record or enqueue the timing.
+    Exceptions raised by a callback are ignored. Instrumentation is active while at least one callback is
+    registered; without callbacks the timing code is skipped entirely.
+
+    Args:
+        callback (Callable[[Timing], Any]): The function to call.
+
+    Example:
+        >>> add_timing_callback(lambda t: print(t.platform, t.kind, t.name, round(t.duration * 1000), t.phases))
+    """
+    if callback not in _callbacks:
+        _callbacks.append(callback)
+
+
+def remove_timing_callback(callback: TimingCallback) -> None:
+    """
+    Unregisters a callback added with `add_timing_callback`. Unknown callbacks are ignored.
+    """
+    if callback in _callbacks:
+        _callbacks.remove(callback)
+
+
+def is_enabled() -> bool:
+    """
+    Returns whether any timing callback is registered.
+    """
+    return bool(_callbacks)
+
+
+def emit(timing: Timing) -> None:
+    """
+    Passes a timing to every registered callback.
+    """
+    for callback in tuple(_callbacks):
+        try:
+            callback(timing)
+        except Exception:
+            pass
+
+
+def endpoint(url: str) -> str:
+    """
+    Returns the endpoint a request URL is reported under: its host and path, without the query string.
+    """
+    parts = urllib.parse.urlsplit(url)
+    return parts.netloc + parts.path
+
+
+class RequestTrace:
+    """
+    Collects the connection and transfer events of one request through the httpcore "trace" extension.
+    """
+    __slots__ = ('start', 'marks')
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.marks: dict[str, float] = {}
+
+    async def __call__(self, event_name: str, info: dict) -> None:
+        # e.g. "connection.connect_tcp.started" or "http11.receive_response_headers.complete"; the HTTP/1.1 and
+        # HTTP/2 events are recorded under the same names. Later redirect hops overwrite earlier ones.
+        prefix, _, name = event_name.partition('.')
+        self.marks[name if prefix in ('http11', 'http2') else event_name] = time.perf_counter()
+
+    def _span(self, start: str, end: str) -> float | None:
+        started, completed = self.marks.get(start), self.marks.get(end)
+        if started is None or completed is None:
+            return None
+        return completed - started
+
+    def phases(self) -> dict[str, float]:
+        """
+        Returns the durations of the phases that were observed.
+        """
+        marks = self.marks
+        phases = {}
+        first = marks.get('connection.connect_tcp.started', marks.get('send_request_headers.started'))
+        if first is not None:
+            phases['queue'] = first - self.start
+        for phase, start, end in (
+                ('connect', 'connection.connect_tcp.started', 'connection.connect_tcp.complete'),
+                ('tls', 'connection.start_tls.started', 'connection.start_tls.complete'),
+                ('ttfb', 'send_request_headers.started', 'receive_response_headers.complete'),
+                ('body', 'receive_response_headers.complete', 'receive_response_body.complete')):
+            duration = self._span(start, end)
+            if duration is not None:
+                phases[phase] = duration
+        return phases
+
+    def finish(self, url: str, method: str, status: int | None = None, error: BaseException | None = None) -> None:
+        """
+        Emits the timing of the request.
+
+        Args:
+            url (str): The request URL.
+            method (str): The HTTP method.
+            status (int | None): The response status code. Defaults to None.
+            error (BaseException | None): The exception raised by the request, if any. Defaults to None.
+        """
+        duration = time.perf_counter() - self.start
+        totals = _stage_totals.get()
+        if totals is not None:
+            totals[0] += duration
+        emit(Timing(REQUEST, f'{method} {endpoint(url)}', _platform.get(), duration, self.phases(), status,
+                    type(error).__name__ if error is not None else None))
+
+
+@contextmanager
+def _sign_span(name: str):
+    start = time.perf_counter()
+    error = None
+    try:
+        yield
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        duration = time.perf_counter() - start
+        totals = _stage_totals.get()
+        if totals is not None:
+            totals[1] += duration
+        emit(Timing(SIGN, name, _platform.get(), duration, error=error))
+
+
+def sign_span(name: str):
+    """
+    Returns a context manager that times a signing step, e.g. `with sign_span('a_bogus'): ...`.
+
+    When instrumentation is disabled a shared no-op context manager is returned.
+
+    Args:
+        name (str): The name of the signer.
+    """
+    if not _callbacks:
+        return _disabled_span
+    return _sign_span(name)
+
+
+async def run_stage(platform: str, name: str, func: Callable, *args, **kwargs) -> Any:
+    """
+    Awaits a platform stage, tagging the requests and signing steps it makes with the platform, and emits
+    its timing. Stages called from inside another stage only tag their requests.
+
+    Args:
+        platform (str): The platform class name.
+        name (str): The stage name, e.g. "fetch_web_stream_data".
+        func (Callable): The coroutine function to run.
+        *args: Positional arguments of `func`.
+        **kwargs: Keyword arguments of `func`.
+
+    Returns:
+        Any: The result of `func`.
+    """
+    if _stage_totals.get() is not None:
+        return await func(*args, **kwargs)
+    totals = [0.0, 0.0]
+    platform_token = _platform.set(platform)
+    totals_token = _stage_totals.set(totals)
+    start = time.perf_counter()
+    error = None
+    try:
+        return await func(*args, **kwargs)
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        duration = time.perf_counter() - start
+        _stage_totals.reset(totals_token)
+        _platform.reset(platform_token)
+        phases = {'http': totals[0], 'sign': totals[1], 'other': max(0.0, duration - totals[0] - totals[1])}
+        emit(Timing(STAGE, name, platform, duration, phases, error=error))
@@ -0,0 +1,379 @@
+import base64
+import hashlib
+import json
+import re
+import urllib.parse
+from collections import defaultdict
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+# Query parameters and form fields that change on every request (signatures, tokens, timestamps). They are
+# ignored when requests are matched against a cassette, and their values are not written to it.
+VOLATILE_PARAMS = frozenset({
+    'a_bogus', 'X-Bogus', 'x-bogus', '_signature', 'signature', 'sign', 'sig', 'msToken', 'ms_token',
+    'token', 'wsSecret', 'wsTime', 'seqid', 'tt', 't', 'ts', 'time', 'timestamp', '_t', 'did', 'device_id',
+    'play_session_id', 'callback', 'rnd',
+})
+
+# Request fields, query parameters and response keys that hold credentials or secrets. In match keys their
+# values are replaced by a digest, and in stored URLs and bodies by `REDACTED`.
+SENSITIVE_FIELDS = frozenset({
+    'password', 'passwd', 'pwd', 'szPassword', 'szId', 'username', 'user_name', 'access_token', 'accessToken',
+    'refresh_token', 'refreshToken', 'auth_token', 'authToken', 'token', 'signature', 'sig', 'sign', 'wsSecret',
+    'a_bogus', 'X-Bogus', 'msToken', 'ms_token', 'cookie', 'cookies', 'sessionid', 'session_key', 'ticket',
+    'secret', 'client_secret',
+})
+
+# Headers whose values identify the user. They are replaced before a cassette is written.
+SENSITIVE_HEADERS = frozenset({
+    'cookie', 'set-cookie', 'authorization', 'proxy-authorization', 'client-integrity', 'x-csrf-token',
+    'x-tt-token', 'x-api-key',
+})
+
+# The stored body is already decoded, so these headers no longer describe it.
+_DROPPED_RESPONSE_HEADERS = frozenset({'content-encoding', 'content-length', 'transfer-encoding', 'connection'})
+
+REDACTED = '<redacted>'
+
+_SECRET_PARAM = re.compile(
+    r'((?:^|[?&"\']|\\u0026)(?:' + '|'.join(map(re.escape, sorted(SENSITIVE_FIELDS, key=len, reverse=True)))
+    + r')=)([^&"\'\s\\<>]+)')
+
+
+class ReplayMissError(httpx.TransportError):
+    """
+    Raised in replay mode when a request has no recorded response.
+    """
+
+
+def _digest(value: str | bytes) -> str:
+    if isinstance(value, str):
+        value = value.encode('utf-8')
+    return hashlib.sha256(value).hexdigest()[:16]
+
+
+def _strip_params(query: str) -> list[tuple[str, str]]:
+    pairs = urllib.parse.parse_qsl(query, keep_blank_values=True)
+    return sorted((k, _digest(v) if k in SENSITIVE_FIELDS and v else v) for k, v in pairs if k not in VOLATILE_PARAMS)
+
+
+def _body_key(content: bytes, content_type: str) -> str:
+    # Bodies may carry credentials (e.g. a login form), so only a digest of their canonical form is stored.
+    if not content:
+        return ''
+    if 'application/x-www-form-urlencoded' in content_type:
+        return _digest(urllib.parse.urlencode(_strip_params(content.decode('utf-8', 'replace'))))
+    if 'json' in content_type or content[:1] in (b'{', b'['):
+        try:
+            return _digest(json.dumps(json.loads(content), sort_keys=True, separators=(',', ':'), ensure_ascii=False))
+        except ValueError:
+            pass
+    return _digest(content)
+
+
+def request_match_key(method: str, url: str, content: bytes = b'', content_type: str = '',
+                      match_body: bool = True) -> str:
+    """
+    Returns the key a request is recorded and looked up under.
+
+    The key is made of the method, host, path and the sorted query parameters, without the parameters in
+    `VOLATILE_PARAMS`, so that re-signed requests still match their recording. Bodies are compared by a
+    digest of their canonical JSON or of their form fields without the volatile ones, and the values of the
+    `SENSITIVE_FIELDS` parameters by a digest, so that no credential is written to the cassette.
+
+    Args:
+        method (str): The HTTP method.
+        url (str): The request URL.
+        content (bytes): The request body. Defaults to b''.
+        content_type (str): The Content-Type of the body. Defaults to ''.
+        match_body (bool): Whether the body is part of the key. Defaults to True.
+
+    Returns:
+        str: The match key.
+    """
+    parts = urllib.parse.urlsplit(url)
+    key = f'{method.upper()} {parts.netloc.lower()}{parts.path or "/"}'
+    query = urllib.parse.urlencode(_strip_params(parts.query))
+    if query:
+        key += '?' + query
+    if match_body and content:
+        key += ' ' + _body_key(content, content_type)
+    return key
+
+
+def sanitize_url(url: str) -> str:
+    """
+    Replaces the values of the volatile and sensitive query parameters of a URL, which include signatures,
+    tokens and credentials.
+    """
+    parts = urllib.parse.urlsplit(url)
+    if not parts.query:
+        return url
+    pairs = urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+    query = urllib.parse.urlencode(
+        [(k, REDACTED if (k in VOLATILE_PARAMS or k in SENSITIVE_FIELDS) and v else v) for k, v in pairs])
+    return urllib.parse.urlunsplit(parts._replace(query=query))
+
+
+def _mask(match: re.Match) -> str:
+    # The value is masked with as many bytes as it had, so that length-prefixed data such as the text rows of
+    # a React flight payload stays valid.
+    return match.group(1) + 'x' * len(match.group(2).encode('utf-8'))
+
+
+def _redact_text(text: str) -> str:
+    # Signatures and tokens in the URLs embedded in a body, e.g. "...flv?expire=1&sign=abc" or "wsSecret=abc".
+    return _SECRET_PARAM.sub(_mask, text)
+
+
+def _redact_json(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: REDACTED if k in SENSITIVE_FIELDS and isinstance(v, str | int) and v != '' else _redact_json(v)
+                for k, v in value.items()}
+    if isinstance(value, list):
+        return [_redact_json(item) for item in value]
+    if isinstance(value, str):
+        return _redact_text(value)
+    return value
+
+
+def redact_body(content: bytes, content_type: str = '') -> bytes:
+    """
+    Replaces the credentials and signatures in a response body before it is written to a cassette.
+
+    In JSON bodies the values of the keys in `SENSITIVE_FIELDS` are replaced with `REDACTED`. In every text
+    body, including the strings of JSON bodies, the values of those parameters in embedded URLs are masked
+    with "x" characters of the same length. Binary bodies are returned unchanged.
+
+    Args:
+        content (bytes): The decoded body.
+        content_type (str): The Content-Type of the body. Defaults to ''.
+
+    Returns:
+        bytes: The redacted body.
+    """
+    try:
+        text = content.decode('utf-8')
+    except UnicodeDecodeError:
+        return content
+    if 'json' in content_type or text[:1] in ('{', '['):
+        try:
+            value = json.loads(text)
+        except ValueError:
+            pass
+        else:
+            return json.dumps(_redact_json(value), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return _redact_text(text).encode('utf-8')
+
+
+def _sanitize_header(name: str, value: str) -> str:
+    if name.lower() not in SENSITIVE_HEADERS:
+        return value
+    if name.lower() == 'set-cookie':
+        # Keep the cookie name and attributes, which some platforms read back from the response.
+        cookie, sep, attributes = value.partition(';')
+        cookie_name = cookie.split('=', 1)[0]
+        return f'{cookie_name}={REDACTED}{sep}{attributes}'
+    return REDACTED
+
+
+def _encode_body(content: bytes) -> dict[str, str]:
+    try:
+        return {'body': content.decode('utf-8'), 'encoding': 'utf-8'}
+    except UnicodeDecodeError:
+        return {'body': base64.b64encode(content).decode('ascii'), 'encoding': 'base64'}
+
+
+def _decode_body(entry: dict) -> bytes:
+    body = entry.get('body') or ''
+    if entry.get('encoding') == 'base64':
+        return base64.b64decode(body)
+    return body.encode('utf-8')
+
+
+class RecordReplayTransport(httpx.AsyncBaseTransport):
+    """
+    An httpx transport that records responses to a JSON cassette and serves them back without a network.
+
+    In "replay" mode every request is answered from the cassette and a request without a recording raises
+    `ReplayMissError`. In "record" mode requests are sent through the inner transport and their responses
+    are added to the cassette; "auto" replays what it can and records the rest. Recorded bodies are stored
+    decoded. Cookies, credentials and signatures are redacted in the stored headers, URLs and response bodies
+    (see `redact_body`), and request bodies are only stored as a digest in the match key.
+
+    A request may be recorded several times, e.g. a room that is polled twice; its responses are served in
+    the recorded order and the last one is repeated once they are used up, so a cassette can be replayed in
+    a loop.
+
+    Example:
+        >>> transport = RecordReplayTransport('fixtures/bilibili.json')
+        >>> set_client_pool(ClientPool(transport=transport))
+        >>> stream = await BilibiliLiveStream().fetch_stream_url(
+        ...     await BilibiliLiveStream().fetch_web_stream_data(url))
+    """
+
+    MODES = ('replay', 'record', 'auto')
+
+    def __init__(
+            self,
+            path: str | Path | None = None,
+            mode: str = 'replay',
+            inner: httpx.AsyncBaseTransport | None = None,
+            match_body: bool = True,
+            metadata: dict[str, Any] | None = None
+    ):
+        """
+        Initializes a new record/replay transport.
+
+        Args:
+            path (str | Path | None): The cassette file. It is loaded if it exists. Defaults to None (in memory).
+            mode (str): "replay", "record" or "auto". Defaults to "replay".
+            inner (httpx.AsyncBaseTransport | None): Sends the requests that are recorded. Defaults to a new
+                `httpx.AsyncHTTPTransport` with HTTP/2 enabled and certificate checks disabled, like the
+                pooled clients.
+            match_body (bool): Whether request bodies are part of the match key. Defaults to True.
+            metadata (dict[str, Any] | None): Values stored next to the interactions, e.g. the room that was
+                recorded. Defaults to the metadata of the loaded cassette.
+
+        Raises:
+            ValueError: If the mode is unknown.
+        """
+        if mode not in self.MODES:
+            raise ValueError(f'Unknown mode: {mode}, expected one of {", ".join(self.MODES)}')
+        self.path = Path(path) if path is not None else None
+        self.mode = mode
+        self.match_body = match_body
+        self._inner = inner
+        self.interactions: list[dict] = []
+        self.metadata: dict[str, Any] = {}
+        self.misses: list[str] = []
+        self._index: dict[str, list[dict]] | None = None
+        self._positions: defaultdict[str, int] = defaultdict(int)
+        if self.path is not None and self.path.exists():
+            self.load(self.path)
+        if metadata is not None:
+            self.metadata = metadata
+
+    def load(self, path: str | Path) -> None:
+        """
+        Replaces the interactions with the ones of a cassette file.
+
+        Args:
+            path (str | Path): The cassette file.
+        """
+        with open(path, encoding='utf-8') as f:
+            cassette = json.load(f)
+        self.interactions = cassette.get('interactions', [])
+        self.metadata = cassette.get('metadata', {})
+        self._index = None
+        self._positions.clear()
+
+    def save(self, path: str | Path | None = None) -> None:
+        """
+        Writes the cassette.
+
+        Args:
+            path (str | Path | None): The cassette file. Defaults to the path the transport was created with.
+
+        Raises:
+            ValueError: If no path is known.
+        """
+        path = Path(path) if path is not None else self.path
+        if path is None:
+            raise ValueError('No cassette path given')
+        path.parent.mkdir(parents=True, exist_ok=True)
+        cassette = {'version': 1, 'metadata': self.metadata, 'interactions': self.interactions}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(cassette, f, ensure_ascii=False, indent=1)
+            f.write('\n')
+
+    def rewind(self) -> None:
+        """
+        Serves every recording from its first response again.
+        """
+        self._positions.clear()
+
+    @property
+    def index(self) -> dict[str, list[dict]]:
+        # The responses of each match key, built lazily and rebuilt after load() or a recording.
+        if self._index is None:
+            index: dict[str, list[dict]] = {}
+            for interaction in self.interactions:
+                index.setdefault(interaction['key'], []).append(interaction['response'])
+            self._index = index
+        return self._index
+
+    def _key(self, request: httpx.Request, content: bytes) -> str:
+        return request_match_key(request.method, str(request.url), content,
+                                 request.headers.get('content-type', ''), self.match_body)
+
+    def _replay(self, key: str, request: httpx.Request) -> httpx.Response | None:
+        responses = self.index.get(key)
+        if not responses:
+            return None
+        position = self._positions[key]
+        self._positions[key] = position + 1
+        entry = responses[min(position, len(responses) - 1)]
+        return httpx.Response(
+            status_code=entry['status'],
+            headers=[tuple(header) for header in entry.get('headers', [])],
+            content=_decode_body(entry),
+            request=request,
+            extensions={'http_version': entry.get('http_version', 'HTTP/1.1').encode('ascii')},
+        )
+
+    async def _record(self, key: str, request: httpx.Request) -> httpx.Response:
+        if self._inner is None:
+            self._inner = httpx.AsyncHTTPTransport(http2=True, verify=False)
+        response = await self._inner.handle_async_request(request)
+        try:
+            content = await response.aread()
+        finally:
+            await response.aclose()
+
+        headers = [(name, value) for name, value in response.headers.multi_items()
+                   if name.lower() not in _DROPPED_RESPONSE_HEADERS]
+        http_version = response.extensions.get('http_version', b'HTTP/1.1')
+        self.interactions.append({
+            'key': key,
+            'request': {
+                'method': request.method,
+                'url': sanitize_url(str(request.url)),
+                'headers': [[name, _sanitize_header(name, value)] for name, value in request.headers.multi_items()],
+            },
+            'response': {
+                'status': response.status_code,
+                'http_version': http_version.decode('ascii'),
+                'headers': [[name, _sanitize_header(name, value)] for name, value in headers],
+                **_encode_body(redact_body(content, response.headers.get('content-type', ''))),
+            },
+        })
+        self._index = None
+        self._positions[key] += 1
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=headers,
+            content=content,
+            request=request,
+            extensions={'http_version': http_version},
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        content = await request.aread()
+        key = self._key(request, content)
+        if self.mode != 'record':
+            response = self._replay(key, request)
+            if response is not None:
+                return response
+            if self.mode == 'replay':
+                self.misses.append(key)
+                raise ReplayMissError(f'No recorded response for {key}', request=request)
+        return await self._record(key, request)
+
+    async def aclose(self) -> None:
+        # Every pooled client shares this transport, so only the connections of the inner transport are closed;
+        # the cassette stays usable.
+        if self._inner is not None:
+            await self._inner.aclose()
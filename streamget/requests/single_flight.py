@@ -0,0 +1,139 @@
+import asyncio
+import hashlib
+import json
+import weakref
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+
+def body_digest(data: Any) -> str | None:
+    """
+    Returns a short digest of a request body, so that large bodies do not have to be kept in the key.
+
+    Args:
+        data (Any): The body as bytes, str, or a JSON-serializable dict/list.
+
+    Returns:
+        str | None: The hex digest, or None for an empty body.
+    """
+    if not data:
+        return None
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    elif not isinstance(data, bytes | bytearray):
+        data = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8')
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def request_key(method: str, url: str, data: Any = None, headers: dict | None = None, *extra: Hashable) -> tuple:
+    """
+    Builds the single-flight key of an HTTP request from its method, URL, body and headers.
+
+    Args:
+        method (str): The HTTP method.
+        url (str): The request URL.
+        data (Any): The request body. Defaults to None.
+        headers (dict | None): The request headers. Defaults to None.
+        *extra (Hashable): Other settings that change the response, e.g. the proxy.
+
+    Returns:
+        tuple: The key.
+    """
+    return (method.upper(), url, body_digest(data), body_digest(headers), *extra)
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls into a single in-flight call.
+
+    The first caller for a key starts the call; callers arriving while it is running wait for the same
+    result (or exception) instead of starting their own. Nothing is kept once the call completes, so a
+    later caller always triggers a new call. A caller that is cancelled does not cancel the shared call
+    unless it was the last one waiting for it.
+
+    Example:
+        >>> flight = SingleFlight()
+        >>> async def main():
+        ...     key = request_key('GET', 'https://example.com')
+        ...     results = await asyncio.gather(*(flight.do(key, fetch) for _ in range(50)))  # fetch runs once
+        >>> asyncio.run(main())
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.shared = 0
+        self._tasks: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[Hashable, asyncio.Task]] = \
+            weakref.WeakKeyDictionary()
+        self._waiters: dict[asyncio.Task, int] = {}
+
+    def _loop_tasks(self) -> dict[Hashable, asyncio.Task]:
+        return self._tasks.setdefault(asyncio.get_running_loop(), {})
+
+    def in_flight(self, key: Hashable) -> bool:
+        """
+        Returns whether a call for `key` is running on the current event loop.
+        """
+        return key in self._loop_tasks()
+
+    def start(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """
+        Starts a call for `key` unless one is already running, without waiting for it.
+
+        Args:
+            key (Hashable): Identifies identical calls.
+            fn (Callable[[], Awaitable[Any]]): Performs the call.
+
+        Returns:
+            asyncio.Task: The running call.
+        """
+        tasks = self._loop_tasks()
+        task = tasks.get(key)
+        if task is None:
+            self.calls += 1
+            task = tasks[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda t: self._done(tasks, key, t))
+        else:
+            self.shared += 1
+        return task
+
+    @staticmethod
+    def _done(tasks: dict[Hashable, asyncio.Task], key: Hashable, task: asyncio.Task) -> None:
+        if tasks.get(key) is task:
+            del tasks[key]
+        if not task.cancelled():
+            # Calls started without a waiter must not log "exception was never retrieved".
+            task.exception()
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Runs `fn`, or waits for the call already running for `key`.
+
+        Args:
+            key (Hashable): Identifies identical calls.
+            fn (Callable[[], Awaitable[Any]]): Performs the call.
+
+        Returns:
+            Any: The result of the shared call.
+        """
+        task = self.start(key, fn)
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters.get(task) == 1:
+                task.cancel()
+            raise
+        finally:
+            count = self._waiters.pop(task) - 1
+            if count:
+                self._waiters[task] = count
+
+
+_default_flight = SingleFlight()
+
+
+def get_single_flight() -> SingleFlight:
+    """
+    Returns the process-wide single-flight group used by `async_req`.
+    """
+    return _default_flight
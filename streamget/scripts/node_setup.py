@@ -7,6 +7,7 @@ Copyright (c) 2024 by Hmily, All Rights Reserved.
 import os
 import platform
 import re
+import shutil
 import subprocess
 import sys
 import zipfile
@@ -24,6 +25,19 @@ current_dir = Path(__file__).resolve().parent
 node_dir = execute_dir
 
 
+def node_env() -> dict[str, str]:
+    # streamget no longer adds the bundled "node" directory to PATH on import, so it is searched here.
+    env = os.environ.copy()
+    env['PATH'] = str(Path(execute_dir) / 'node') + os.pathsep + env.get('PATH', '')
+    return env
+
+
+def run_node_version() -> subprocess.CompletedProcess:
+    env = node_env()
+    node_path = shutil.which('node', path=env['PATH']) or 'node'
+    return subprocess.run([node_path, '-v'], capture_output=True, env=env)
+
+
 def unzip_file(zip_path: str | Path, extract_to: str | Path, delete: bool = True) -> None:
     if not os.path.exists(extract_to):
         os.makedirs(extract_to)
@@ -75,7 +89,7 @@ def install_nodejs_windows():
             if Path(extract_dir_path).exists() and not Path(new_extract_dir_path).exists():
                 os.rename(extract_dir_path, new_extract_dir_path)
                 os.environ['PATH'] = str(node_dir) + '/node' + os.pathsep + current_env_path
-                result = subprocess.run(["node", "-v"], capture_output=True)
+                result = run_node_version()
                 if result.returncode == 0:
                     logger.debug('Node.js installation was successful. Restart for changes to take effect')
                 else:
@@ -180,7 +194,7 @@ def install_nodejs() -> bool:
 def ensure_nodejs_installed(func):
     def wrapper(*args, **kwargs):
         try:
-            result = subprocess.run(['node', '-v'], capture_output=True)
+            result = run_node_version()
             version = result.stdout.strip()
             if result.returncode == 0 and version:
                 return func(*args, **kwargs)
@@ -204,7 +218,7 @@ def ensure_nodejs_installed(func):
 
 def check_nodejs_installed() -> bool:
     try:
-        result = subprocess.run(['node', '-v'], capture_output=True)
+        result = run_node_version()
         version = result.stdout.strip()
         if result.returncode == 0 and version:
             return True
@@ -0,0 +1,232 @@
+import asyncio
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from .requests.client_pool import ClientPool, get_client_pool
+
+
+@dataclass
+class VerifyResult:
+    """
+    The outcome of probing a list of candidate stream URLs.
+
+    Attributes:
+        best (str | None): The first candidate, in preference order, that answered, or None if none did.
+        working (list[str]): Every candidate that answered, in preference order; `best` comes first.
+        failed (list[str]): The candidates that failed or did not answer before the deadline.
+        statuses (dict[str, int | None]): The HTTP status of each probed URL, or None on error or timeout.
+        remaining (list[str]): The candidates after `best` that had not failed when it was chosen, see
+            `StreamVerifier.first_working`.
+    """
+    best: str | None = None
+    working: list[str] = field(default_factory=list)
+    failed: list[str] = field(default_factory=list)
+    statuses: dict[str, int | None] = field(default_factory=dict)
+    remaining: list[str] = field(default_factory=list)
+
+    @property
+    def fallbacks(self) -> list[str]:
+        """
+        The candidates to fall back to, in preference order: the working ones other than `best`, then the
+        remaining ones.
+        """
+        return self.working[1:] + self.remaining
+
+
+def quality_fallback_order(quality_index: int, count: int = 5) -> list[int]:
+    """
+    Returns the quality indexes to try for a requested quality: the requested one, then the lower qualities,
+    then the higher ones, e.g. [2, 3, 4, 1, 0] for "HD".
+
+    Args:
+        quality_index (int): The index of the requested quality (0 is the original quality).
+        count (int): The number of quality levels. Defaults to 5.
+
+    Returns:
+        list[int]: The indexes in preference order.
+    """
+    return list(range(quality_index, count)) + list(range(quality_index - 1, -1, -1))
+
+
+class StreamVerifier:
+    """
+    Checks candidate stream URLs and keeps the ones that answer.
+
+    Every candidate is requested at the same time and only the response headers are read, so verifying a
+    whole quality or CDN list costs one round trip instead of one per URL. Candidates that have not answered
+    when the deadline expires are counted as failed. `verify` waits for every candidate; `first_working`
+    returns as soon as the preferred working one is known, e.g. the requested quality.
+
+    Example:
+        >>> verifier = StreamVerifier()
+        >>> result = await verifier.verify([cdn1_url, cdn2_url, cdn3_url])
+        >>> result.best, result.fallbacks
+    """
+
+    def __init__(self, timeout: float = 10, pool: ClientPool | None = None):
+        """
+        Initializes a new stream verifier.
+
+        Args:
+            timeout (float): Seconds to wait for the candidates to answer. Defaults to 10.
+            pool (ClientPool | None): The client pool used for the probes. Defaults to the shared pool.
+        """
+        self.timeout = timeout
+        self.pool = pool
+
+    @staticmethod
+    def is_working(status: int | None) -> bool:
+        """
+        Returns whether a probe status means that the stream can be played. Servers that do not allow the
+        request method (405) are counted as working.
+        """
+        return status is not None and (status < 400 or status == 405)
+
+    async def probe(
+            self,
+            url: str,
+            proxy_addr: str | None = None,
+            headers: dict | None = None,
+            http2: bool = True
+    ) -> int | None:
+        """
+        Requests a stream URL and returns its status code as soon as the headers arrive.
+
+        Args:
+            url (str): The stream URL.
+            proxy_addr (str | None): The proxy address to use. Defaults to None.
+            headers (dict | None): Custom headers for the request. Defaults to None.
+            http2 (bool): If True, enables HTTP/2 support. Defaults to True.
+
+        Returns:
+            int | None: The status code, or None if the request failed.
+        """
+        pool = self.pool or get_client_pool()
+        try:
+            response = await pool.request(
+                'GET', url, proxy_addr=proxy_addr, http2=http2, headers=headers or {}, timeout=self.timeout,
+                follow_redirects=True, stream=True)
+        except Exception:
+            return None
+        await response.aclose()
+        return response.status_code
+
+    async def verify(
+            self,
+            candidates: Iterable[str],
+            proxy_addr: str | None = None,
+            headers: dict | None = None,
+            http2: bool = True,
+            timeout: float | None = None
+    ) -> VerifyResult:
+        """
+        Probes every candidate concurrently.
+
+        Args:
+            candidates (Iterable[str]): The stream URLs in preference order. Duplicates and empty values are
+                skipped.
+            proxy_addr (str | None): The proxy address to use. Defaults to None.
+            headers (dict | None): Custom headers for the requests. Defaults to None.
+            http2 (bool): If True, enables HTTP/2 support. Defaults to True.
+            timeout (float | None): Seconds to wait for the candidates. Defaults to the verifier timeout.
+
+        Returns:
+            VerifyResult: The working and failed candidates, in preference order.
+        """
+        urls = list(dict.fromkeys(url for url in candidates if url))
+        result = VerifyResult()
+        if not urls:
+            return result
+
+        tasks = {url: asyncio.ensure_future(self.probe(url, proxy_addr, headers, http2)) for url in urls}
+        _, pending = await asyncio.wait(tasks.values(), timeout=timeout or self.timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        for url, task in tasks.items():
+            result.statuses[url] = None if task.cancelled() else task.result()
+            if self.is_working(result.statuses[url]):
+                result.working.append(url)
+            else:
+                result.failed.append(url)
+        result.best = result.working[0] if result.working else None
+        return result
+
+    async def first_working(
+            self,
+            candidates: Iterable[str],
+            proxy_addr: str | None = None,
+            headers: dict | None = None,
+            http2: bool = True,
+            timeout: float | None = None
+    ) -> VerifyResult:
+        """
+        Probes every candidate concurrently and returns as soon as the preferred working one is known.
+
+        The first candidate, in preference order, that answers is the result: the call returns once it has
+        answered and every candidate before it has failed, without waiting for the others, whose probes are
+        cancelled. Candidates that have not answered when the deadline expires are counted as failed.
+
+        Args:
+            candidates (Iterable[str]): The stream URLs in preference order. Duplicates and empty values are
+                skipped.
+            proxy_addr (str | None): The proxy address to use. Defaults to None.
+            headers (dict | None): Custom headers for the requests. Defaults to None.
+            http2 (bool): If True, enables HTTP/2 support. Defaults to True.
+            timeout (float | None): Seconds to wait for the candidates. Defaults to the verifier timeout.
+
+        Returns:
+            VerifyResult: The first working candidate as `best`, the candidates before it as `failed`, and
+                the candidates after it that did not fail as `remaining`.
+        """
+        urls = list(dict.fromkeys(url for url in candidates if url))
+        result = VerifyResult()
+        if not urls:
+            return result
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (timeout or self.timeout)
+        tasks = [asyncio.ensure_future(self.probe(url, proxy_addr, headers, http2)) for url in urls]
+        try:
+            for position, (url, task) in enumerate(zip(urls, tasks)):
+                if not task.done() and deadline > loop.time():
+                    await asyncio.wait({task}, timeout=deadline - loop.time())
+                result.statuses[url] = task.result() if task.done() else None
+                if not self.is_working(result.statuses[url]):
+                    result.failed.append(url)
+                    continue
+                result.best = url
+                result.working.append(url)
+                for later_url, later_task in zip(urls[position + 1:], tasks[position + 1:]):
+                    if later_task.done():
+                        result.statuses[later_url] = later_task.result()
+                        if not self.is_working(later_task.result()):
+                            continue
+                    result.remaining.append(later_url)
+                break
+        finally:
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        return result
+
+_default_verifier = StreamVerifier()
+
+
+def get_stream_verifier() -> StreamVerifier:
+    """
+    Returns the process-wide stream verifier used by the platform classes.
+    """
+    return _default_verifier
+
+
+def set_stream_verifier(verifier: StreamVerifier) -> None:
+    """
+    Replaces the process-wide stream verifier, e.g. to change the deadline.
+    """
+    global _default_verifier
+    _default_verifier = verifier
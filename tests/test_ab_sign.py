@@ -0,0 +1,97 @@
+"""
+Golden-vector tests for streamget.platforms.douyin.ab_sign.
+
+The vectors in data/ab_sign_vectors.json were recorded from the original pure-Python implementation. To
+re-record them, only when the algorithm changes on purpose:
+
+    python -m tests.test_ab_sign --record
+"""
+import json
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from streamget.platforms.douyin import ab_sign
+
+VECTORS_PATH = Path(__file__).parent / 'data' / 'ab_sign_vectors.json'
+
+USER_AGENTS = [
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/116.0.5845.97 '
+    'Safari/537.36 Core/1.116.567.400 QQBrowser/19.7.6764.400',
+    'Mozilla/5.0 (Linux; Android 11; SAMSUNG SM-G973U) AppleWebKit/537.36 (KHTML, like Gecko) '
+    'SamsungBrowser/14.2 Chrome/87.0.4280.141 Mobile Safari/537.36',
+    'ios/7.830 (ios 17.0; ; iPhone 15 (A2846/A3089/A3090/A3092))',
+    '',
+]
+
+QUERIES = [
+    'aid=6383&app_name=douyin_web&live_id=1&device_platform=web&language=zh-CN&enter_from=web_live'
+    '&cookie_enabled=true&screen_width=1728&screen_height=1117&browser_language=zh-CN&browser_platform=MacIntel'
+    '&browser_name=Chrome&browser_version=116.0.0.0&web_rid=745964462470&msToken=',
+    'verifyFp=verify_hwj52020_7szNy3N0_NkuE_4OHb_9Ib6_1iF8ug7yJBp3&type_id=0&live_id=1&room_id=7414404414431446'
+    '&sec_user_id=&version_code=99.99.99&app_id=1128',
+    'a=1',
+    '',
+]
+
+TIMESTAMPS = [1719411639403, 1735689600000, 4102444800123]
+
+
+def _strings() -> list[str]:
+    # Cover every padding boundary of SM3 (55/56/63/64 bytes) and non-ASCII input.
+    values = ['', 'a', 'abc', 'hello world', '中文字符', '\x00\x7f\x80\xff', 'x' * 1000]
+    values += ['a' * n for n in (55, 56, 57, 63, 64, 65, 119, 120, 127, 128, 129)]
+    values += [''.join(chr((i * 37) % 256) for i in range(n)) for n in (1, 2, 3, 44, 89, 200)]
+    return values
+
+
+def _sm3_stream(value: str, step: int) -> list[int]:
+    sm3 = ab_sign.SM3()
+    data = list(value.encode('utf-8'))
+    for i in range(0, len(data), step):
+        sm3.write(data[i:i + step])
+    return sm3.sum()
+
+
+def build_vectors() -> dict:
+    strings = _strings()
+    vectors = {
+        'sm3_hex': [[s, ab_sign.SM3().sum(s, 'hex')] for s in strings],
+        'sm3_bytes': [[list(s.encode('utf-8')), ab_sign.SM3().sum(list(s.encode('utf-8')))] for s in strings],
+        'sm3_twice': [[s, ab_sign.SM3().sum(ab_sign.SM3().sum(s))] for s in strings],
+        'sm3_stream': [[s, step, _sm3_stream(s, step)] for s in strings for step in (7, 64, 70)],
+        'rc4': [[s, key, ab_sign.rc4_encrypt(s, key)]
+                for s in strings + ['中文Ā￿']
+                for key in ('y', '\x00\x01\x0e', 'secret-key', '中')],
+        'result_encrypt': [[s, table, ab_sign.result_encrypt(s, table)]
+                           for s in strings + ['中文Ā']
+                           for table in ('s0', 's1', 's2', 's3', 's4')],
+        'random_str': ab_sign.generate_random_str(),
+        'ab_sign': [],
+    }
+    for ts in TIMESTAMPS:
+        for query in QUERIES:
+            for ua in USER_AGENTS:
+                with mock.patch('time.time', return_value=ts / 1000):
+                    vectors['ab_sign'].append([ts, query, ua, ab_sign.ab_sign(query, ua)])
+    return vectors
+
+
+class GoldenVectorTest(unittest.TestCase):
+
+    def test_outputs_match_the_recorded_vectors(self):
+        expected = json.loads(VECTORS_PATH.read_text(encoding='utf-8'))
+        vectors = build_vectors()
+        assert set(vectors) == set(expected)
+        for name, values in expected.items():
+            with self.subTest(vector=name):
+                assert vectors[name] == values
+
+
+if __name__ == '__main__':
+    if '--record' in sys.argv:
+        VECTORS_PATH.write_text(json.dumps(build_vectors(), ensure_ascii=False, indent=1), encoding='utf-8')
+        print(f'Recorded vectors to {VECTORS_PATH}')
+    else:
+        unittest.main()
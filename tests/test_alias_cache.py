@@ -0,0 +1,46 @@
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+
+from streamget.alias_cache import AliasCache
+
+
+class AliasCacheTest(unittest.TestCase):
+
+    def test_default_cache_has_no_database(self):
+        cache = AliasCache()
+        assert cache.path is None
+        asyncio.run(cache.set('huya', 'lpl', 660000))
+        assert asyncio.run(cache.get('huya', 'lpl')) == 660000
+        assert cache._conn is None
+
+    def test_database_is_shared_between_instances(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'aliases.sqlite3'
+            writer = AliasCache(path)
+            asyncio.run(writer.set('douyin_sec_user_id', 'https://v.douyin.com/x/', ['1', 'MS4']))
+            writer.close()
+            reader = AliasCache(path)
+            assert asyncio.run(reader.get('douyin_sec_user_id', 'https://v.douyin.com/x/')) == ['1', 'MS4']
+            reader.close()
+
+    def test_concurrent_resolves_share_one_fetch(self):
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return '660000'
+
+        async def run():
+            cache = AliasCache()
+            results = await asyncio.gather(*(cache.resolve('huya', 'lpl', fetch) for _ in range(10)))
+            return results + [await cache.resolve('huya', 'lpl', fetch)]
+
+        assert set(asyncio.run(run())) == {'660000'}
+        assert len(calls) == 1
+
+
+if __name__ == '__main__':
+    unittest.main()
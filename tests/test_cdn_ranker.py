@@ -0,0 +1,89 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from streamget.cdn_ranker import CdnRanker, cdn_key
+from streamget.verifier import StreamVerifier
+
+TX, AL, HS = 'https://tx.example/live.flv', 'https://al.example/live.flv', 'https://hs.example/live.flv'
+
+
+class StubVerifier(StreamVerifier):
+    """Answers after a fixed delay per host; hosts without a delay never answer."""
+
+    def __init__(self, delays: dict[str, float | None], status: int = 200):
+        super().__init__()
+        self.delays = delays
+        self.status = status
+        self.probed: list[str] = []
+
+    async def probe(self, url, proxy_addr=None, headers=None, http2=True):
+        self.probed.append(url)
+        delay = self.delays.get(cdn_key(url))
+        if delay is None:
+            await asyncio.sleep(3600)
+        await asyncio.sleep(delay)
+        return self.status
+
+
+class CdnRankerTest(unittest.TestCase):
+
+    def test_orders_by_measured_latency(self):
+        verifier = StubVerifier({'tx.example': 0.06, 'al.example': 0.01, 'hs.example': 0.03})
+        ranker = CdnRanker(verifier=verifier, timeout=1)
+        assert asyncio.run(ranker.rank([TX, AL, HS])) == [AL, HS, TX]
+        assert sorted(verifier.probed) == sorted([TX, AL, HS])
+
+    def test_ties_and_unmeasured_cdns_keep_their_order(self):
+        ranker = CdnRanker(verifier=StubVerifier({}), timeout=1)
+        for key in ('tx.example', 'al.example', 'hs.example'):
+            ranker.record(key, 0.05)
+        assert asyncio.run(ranker.rank([HS, TX, AL])) == [HS, TX, AL]
+        ranker.clear()
+        ranker.record('al.example', 0.05)
+        with mock.patch.object(ranker, '_is_fresh', return_value=True):
+            assert asyncio.run(ranker.rank([TX, HS, AL])) == [AL, TX, HS]
+
+    def test_scores_decay_and_are_measured_again(self):
+        ranker = CdnRanker(alpha=0.5, half_life=10, max_age=60, verifier=StubVerifier({'tx.example': 0}))
+        with mock.patch('streamget.cdn_ranker.time.monotonic', return_value=100.0):
+            ranker.record('tx.example', 1.0)
+            assert ranker._is_fresh('tx.example')
+        with mock.patch('streamget.cdn_ranker.time.monotonic', return_value=110.0):
+            # The history has lost half its weight: 0.25 * 1.0 + 0.75 * 0.2.
+            assert abs(ranker.record('tx.example', 0.2).latency - 0.4) < 1e-9
+        with mock.patch('streamget.cdn_ranker.time.monotonic', return_value=171.0):
+            assert not ranker._is_fresh('tx.example')
+
+        verifier = StubVerifier({'tx.example': 0, 'al.example': 0})
+        ranker = CdnRanker(max_age=0, verifier=verifier, timeout=1)
+        asyncio.run(ranker.rank([TX, AL]))
+        asyncio.run(ranker.rank([TX, AL]))
+        assert verifier.probed.count(TX) == 2
+        assert ranker.scores()['tx.example'].samples == 2
+
+    def test_failures_count_as_the_timeout(self):
+        verifier = StubVerifier({'tx.example': None, 'al.example': 0.01})
+        ranker = CdnRanker(verifier=verifier, timeout=0.2)
+        assert asyncio.run(ranker.rank([TX, AL])) == [AL, TX]
+        score = ranker.scores()['tx.example']
+        assert score.latency == 0.2
+        assert score.failures == 1
+
+        rejected = CdnRanker(verifier=StubVerifier({'tx.example': 0, 'al.example': 0}, status=403), timeout=0.5)
+        asyncio.run(rejected.rank([TX, AL]))
+        assert rejected.latency('tx.example') == 0.5
+
+    def test_concurrent_rankings_share_probes(self):
+        verifier = StubVerifier({'tx.example': 0.05, 'al.example': 0.02})
+        ranker = CdnRanker(verifier=verifier, timeout=1)
+
+        async def main():
+            return await asyncio.gather(ranker.rank([TX, AL]), ranker.rank([AL, TX]))
+
+        assert asyncio.run(main()) == [[AL, TX], [AL, TX]]
+        assert sorted(verifier.probed) == sorted([TX, AL])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import asyncio
+import unittest
+
+import httpx
+
+from streamget.requests.async_http import async_req
+from streamget.requests.client_pool import ClientPool
+
+
+class CoalesceTest(unittest.TestCase):
+
+    def run_concurrently(self, **kwargs) -> int:
+        calls = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.method)
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, text=str(len(calls)))
+
+        async def run():
+            pool = ClientPool(transport=httpx.MockTransport(handler))
+            try:
+                await asyncio.gather(*(async_req('https://example.com/api', pool=pool, **kwargs) for _ in range(5)))
+            finally:
+                await pool.aclose()
+
+        asyncio.run(run())
+        return len(calls)
+
+    def test_get_requests_are_coalesced(self):
+        assert self.run_concurrently() == 1
+
+    def test_post_requests_are_sent_separately(self):
+        assert self.run_concurrently(data={'user': 'a'}) == 5
+        assert self.run_concurrently(json_data={'user': 'a'}) == 5
+
+    def test_post_requests_can_opt_in(self):
+        assert self.run_concurrently(data={'user': 'a'}, coalesce=True) == 1
+
+    def test_get_requests_can_opt_out(self):
+        assert self.run_concurrently(coalesce=False) == 5
+
+    def test_timeout_is_part_of_the_key(self):
+        calls = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.extensions['timeout']['read'])
+            await asyncio.sleep(0.01)
+            return httpx.Response(200)
+
+        async def run():
+            pool = ClientPool(transport=httpx.MockTransport(handler))
+            try:
+                await asyncio.gather(async_req('https://example.com/api', pool=pool, timeout=1),
+                                     async_req('https://example.com/api', pool=pool, timeout=20))
+            finally:
+                await pool.aclose()
+
+        asyncio.run(run())
+        assert sorted(calls) == [1, 20]
+
+
+if __name__ == '__main__':
+    unittest.main()
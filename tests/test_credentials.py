@@ -0,0 +1,94 @@
+import asyncio
+import tempfile
+import threading
+import types
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+from streamget import credentials
+from streamget.credentials import Credential, CredentialStore, FileCredentialStore
+
+
+def save_credentials(path: str, worker: int) -> None:
+    async def main():
+        store = FileCredentialStore(path)
+        for i in range(20):
+            await store.set(f'soop:user{worker}-{i}', Credential(value=f'cookie-{worker}-{i}'))
+
+    asyncio.run(main())
+
+
+class CredentialStoreTest(unittest.TestCase):
+
+    def test_base_class_is_abstract(self):
+        assert CredentialStore.__abstractmethods__ == {'_load', '_save', '_remove'}
+
+    def test_concurrent_workers_do_not_lose_updates(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = str(Path(directory) / 'credentials.json')
+            with ProcessPoolExecutor(max_workers=4) as executor:
+                list(executor.map(save_credentials, [path] * 4, range(4)))
+            store = FileCredentialStore(path)
+
+            async def check():
+                for worker in range(4):
+                    for i in range(20):
+                        credential = await store.get(f'soop:user{worker}-{i}')
+                        assert credential.value == f'cookie-{worker}-{i}'
+
+            asyncio.run(check())
+
+    def test_invalidate_keeps_a_newer_login(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'credentials.json'
+            first, second = FileCredentialStore(path), FileCredentialStore(path)
+
+            async def main():
+                await first.set('soop:me', Credential(value='old'))
+                await second.set('soop:me', Credential(value='new'))
+                await first.invalidate('soop:me', 'old')
+                assert (await first.get('soop:me')).value == 'new'
+                await first.invalidate('soop:me', 'new')
+                assert await second.get('soop:me') is None
+
+            asyncio.run(main())
+
+    def test_file_access_runs_off_the_event_loop(self):
+        threads = []
+
+        class RecordingStore(FileCredentialStore):
+            def _load(self, key):
+                threads.append(threading.current_thread())
+                return super()._load(key)
+
+        async def login():
+            return Credential(value='cookie')
+
+        with tempfile.TemporaryDirectory() as directory:
+            store = RecordingStore(Path(directory) / 'credentials.json')
+            credential = asyncio.run(store.obtain('soop:me', login))
+        assert credential.value == 'cookie'
+        assert threads
+        assert threading.main_thread() not in threads
+
+    def test_contended_windows_lock_does_not_fail(self):
+        def locking(fd, mode, size):
+            raise OSError('Resource deadlock avoided')
+
+        fake_msvcrt = types.SimpleNamespace(locking=locking, LK_LOCK=1, LK_UNLCK=0)
+        with tempfile.TemporaryDirectory() as directory, \
+                mock.patch.object(credentials, 'fcntl', None), \
+                mock.patch.object(credentials, 'msvcrt', fake_msvcrt, create=True):
+            store = FileCredentialStore(Path(directory) / 'credentials.json')
+
+            async def main():
+                await store.set('soop:me', Credential(value='cookie'))
+                return await store.get('soop:me')
+
+            assert asyncio.run(main()).value == 'cookie'
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,28 @@
+import unittest
+
+from streamget.data import StreamData, wrap_stream
+
+
+class WrapStreamTest(unittest.TestCase):
+
+    def test_missing_fields_are_none(self):
+        data = {'platform': 'Bilibili', 'anchor_name': 'name'}
+        stream = wrap_stream(data)
+        assert stream.anchor_name == 'name'
+        assert stream.record_url is None
+        assert data == {'platform': 'Bilibili', 'anchor_name': 'name'}
+
+    def test_unknown_key_raises(self):
+        with self.assertRaisesRegex(TypeError, 'unexpected keyword argument .room_id.'):  # noqa: PT027
+            wrap_stream({'platform': 'Douyu', 'room_id': '1'})
+
+    def test_from_dict_ignores_unknown_keys(self):
+        assert StreamData.from_dict({'platform': 'Douyu', 'room_id': '1'}).platform == 'Douyu'
+
+    def test_non_dict_raises(self):
+        with self.assertRaises(TypeError):  # noqa: PT027
+            wrap_stream([('platform', 'Douyu')])
+
+
+if __name__ == '__main__':
+    unittest.main()
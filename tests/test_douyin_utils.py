@@ -0,0 +1,66 @@
+import asyncio
+import unittest
+
+import httpx
+
+from streamget.alias_cache import AliasCache, get_alias_cache, set_alias_cache
+from streamget.platforms.douyin.utils import DouyinUtils, UnsupportedUrlError
+from streamget.requests.client_pool import ClientPool, get_client_pool, set_client_pool
+
+SHARE_URL = 'https://v.douyin.com/abc/'
+PROFILE_URL = 'https://v.douyin.com/profile/'
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    if str(request.url) == SHARE_URL:
+        return httpx.Response(302, headers={
+            'location': 'https://webcast.amemv.com/douyin/webcast/reflow/7412?sec_user_id=MS4wLjAB&u_code=1'})
+    if str(request.url) == PROFILE_URL:
+        return httpx.Response(302, headers={'location': 'https://www.iesdouyin.com/share/user/MS4wLjAB?from=share'})
+    if request.url.path == '/share/user/MS4wLjAB':
+        return httpx.Response(200, text='{"unique_id":"old","verification_type":1}'
+                                        '{"unique_id":"anchor","verification_type":1}')
+    return httpx.Response(200, text='<html></html>')
+
+
+class DouyinUtilsTest(unittest.TestCase):
+
+    def run_with_pool(self, coroutine_function):
+        requests = []
+
+        def recording_handler(request: httpx.Request) -> httpx.Response:
+            requests.append(str(request.url))
+            return handler(request)
+
+        async def run():
+            previous_pool, previous_cache = get_client_pool(), get_alias_cache()
+            pool = ClientPool(transport=httpx.MockTransport(recording_handler))
+            set_client_pool(pool)
+            set_alias_cache(AliasCache())
+            try:
+                return await coroutine_function()
+            finally:
+                await pool.aclose()
+                set_client_pool(previous_pool)
+                set_alias_cache(previous_cache)
+
+        return asyncio.run(run()), requests
+
+    def test_sec_user_id_follows_the_redirect_through_the_pool(self):
+        result, requests = self.run_with_pool(lambda: DouyinUtils.get_sec_user_id(SHARE_URL))
+        assert result == ('7412', 'MS4wLjAB')
+        assert requests[0] == SHARE_URL
+        assert requests[1].startswith('https://webcast.amemv.com/douyin/webcast/reflow/7412')
+
+    def test_unique_id_uses_the_pool_for_both_requests(self):
+        result, requests = self.run_with_pool(lambda: DouyinUtils.get_unique_id(PROFILE_URL))
+        assert result == 'anchor'
+        assert requests[-1] == 'https://www.iesdouyin.com/share/user/MS4wLjAB'
+
+    def test_profile_link_is_not_a_room_link(self):
+        with self.assertRaises(UnsupportedUrlError):  # noqa: PT027
+            self.run_with_pool(lambda: DouyinUtils.get_sec_user_id(PROFILE_URL))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import asyncio
+import json
+import time
+import unittest
+
+import httpx
+
+from streamget.platforms.douyu.live_stream import DouyuLiveStream
+from streamget.requests.client_pool import ClientPool, get_client_pool, set_client_pool
+
+WHITE_KEY = {'rand_str': 'abc', 'key': 'k', 'enc_time': 2, 'is_special': 0, 'enc_data': 'e',
+             'expire_at': time.time() + 3600}
+
+
+def fetch(play_error: int) -> list[str]:
+    paths = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        paths.append(request.url.path.rsplit('/', 1)[-1])
+        if 'getEncryption' in request.url.path:
+            return httpx.Response(200, text=json.dumps({'error': 0, 'data': WHITE_KEY}))
+        return httpx.Response(200, text=json.dumps({'error': play_error, 'msg': '', 'data': ''}))
+
+    async def run():
+        previous = get_client_pool()
+        pool = ClientPool(transport=httpx.MockTransport(handler))
+        set_client_pool(pool)
+        try:
+            DouyuLiveStream._white_key = (WHITE_KEY, WHITE_KEY['expire_at'])
+            return await DouyuLiveStream()._fetch_web_stream_url('1')
+        finally:
+            DouyuLiveStream._white_key = None
+            await pool.aclose()
+            set_client_pool(previous)
+
+    asyncio.run(run())
+    return paths
+
+
+class WhiteKeyRefreshTest(unittest.TestCase):
+
+    def test_other_errors_keep_the_cached_key(self):
+        assert fetch(-5) == ['1']
+
+    def test_rejected_signature_refreshes_the_key(self):
+        assert fetch(-15) == ['1', 'getEncryption', '1']
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import asyncio
+import gzip
+import importlib.util
+import io
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from streamget.data import StreamData
+from streamget.export import ArrowWriter, NDJSONWriter, export_streams, export_streams_async, open_writer
+
+STREAMS = [
+    StreamData(platform='抖音', anchor_name='主播', is_live=True, flv_url='https://cdn.example.com/a.flv',
+               extra={'backup_url_list': ['https://cdn2.example.com/a.flv']}),
+    None,
+    StreamData(platform='Twitch', anchor_name='streamer', is_live=False),
+]
+
+
+def read_ndjson(data: bytes) -> list[StreamData]:
+    return [StreamData.from_dict(json.loads(line)) for line in data.decode('utf-8').splitlines()]
+
+
+class ExportTest(unittest.TestCase):
+
+    def test_ndjson_round_trip_skips_none(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'results.ndjson'
+            assert export_streams(STREAMS, path, chunk_size=1) == 2
+            assert read_ndjson(path.read_bytes()) == [STREAMS[0], STREAMS[2]]
+
+    def test_gzip_ndjson_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'results.ndjson.gz'
+            assert export_streams(iter(STREAMS), str(path)) == 2
+            with gzip.open(path, 'rb') as file:
+                assert read_ndjson(file.read()) == [STREAMS[0], STREAMS[2]]
+
+    def test_file_object_is_left_open(self):
+        output = io.BytesIO()
+        with NDJSONWriter(output, chunk_size=10) as writer:
+            writer.write_many(STREAMS)
+        assert writer.rows == 2
+        assert not output.closed
+        assert read_ndjson(output.getvalue()) == [STREAMS[0], STREAMS[2]]
+
+    def test_async_export(self):
+        async def streams():
+            for stream in STREAMS:
+                yield stream
+
+        output = io.BytesIO()
+        assert asyncio.run(export_streams_async(streams(), output)) == 2
+        assert len(read_ndjson(output.getvalue())) == 2
+
+    def test_format_from_extension(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with open_writer(Path(directory) / 'results.jsonl') as writer:
+                assert isinstance(writer, NDJSONWriter)
+            with self.assertRaises(ValueError):  # noqa: PT027
+                open_writer(Path(directory) / 'results.ndjson', file_format='csv')
+
+    def test_missing_pyarrow_raises_import_error(self):
+        with mock.patch.dict(sys.modules, {'pyarrow': None}), \
+                self.assertRaisesRegex(ImportError, r'pip install streamget\[arrow\]'):  # noqa: PT027
+            export_streams(STREAMS, io.BytesIO(), file_format='parquet')
+
+    @unittest.skipUnless(importlib.util.find_spec('pyarrow'), 'pyarrow is not installed')
+    def test_arrow_round_trip(self):
+        import pyarrow.ipc
+
+        output = io.BytesIO()
+        with ArrowWriter(output, chunk_size=1) as writer:
+            writer.write_many(STREAMS)
+        table = pyarrow.ipc.open_file(io.BytesIO(output.getvalue())).read_all()
+        assert table.column('anchor_name').to_pylist() == ['主播', 'streamer']
+        assert json.loads(table.column('extra').to_pylist()[0]) == STREAMS[0].extra
+
+
+if __name__ == '__main__':
+    unittest.main()
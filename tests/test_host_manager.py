@@ -0,0 +1,45 @@
+import asyncio
+import unittest
+
+import httpx
+
+from streamget.requests.host_manager import HostConnectionManager
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    if request.url.host == 'short.example':
+        return httpx.Response(302, headers={'location': 'https://cdn.example/live.flv'})
+    http_version = b'HTTP/1.1' if request.url.host == 'old.example' else b'HTTP/2'
+    return httpx.Response(200, text=request.url.host, extensions={'http_version': http_version})
+
+
+async def fetch(*urls: str) -> HostConnectionManager:
+    manager = HostConnectionManager(transport=httpx.MockTransport(handler))
+    try:
+        for url in urls:
+            response = await manager.request('GET', url, follow_redirects=True)
+            assert response.status_code == 200
+    finally:
+        await manager.aclose()
+    return manager
+
+
+class HostConnectionManagerTest(unittest.TestCase):
+
+    def test_requests_go_through_the_transport(self):
+        manager = asyncio.run(fetch('https://api.example/a', 'https://api.example/b'))
+        assert manager.stats()['https://api.example'].requests == 2
+
+    def test_multiplexed_only_after_http2(self):
+        assert not HostConnectionManager()._get_stats('https://api.example').multiplexed
+        stats = asyncio.run(fetch('https://api.example/a', 'https://old.example/a')).stats()
+        assert stats['https://api.example'].multiplexed
+        assert not stats['https://old.example'].multiplexed
+
+    def test_cross_origin_redirects_are_not_multiplexed(self):
+        stats = asyncio.run(fetch('https://short.example/x', 'https://short.example/y')).stats()
+        assert not stats['https://short.example'].multiplexed
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from streamget import js_worker
+from streamget.js_worker import NodeWorkerPool
+
+
+def is_running(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except OSError:
+        return False
+    # A killed child stays a zombie until it is reaped.
+    try:
+        return os.waitpid(pid, os.WNOHANG) == (0, 0)
+    except ChildProcessError:
+        return False
+
+
+@unittest.skipIf(shutil.which('node') is None, 'Node.js is not installed')
+class NodeWorkerPoolTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.script = Path(directory.name) / 'add.js'
+        self.script.write_text('function add(a, b) { return a + b; }\n', encoding='utf-8')
+
+    def call_and_leave_open(self, pool: NodeWorkerPool) -> list[int]:
+        async def main():
+            assert await pool.call(self.script, 'add', 1, 2) == 3
+            return [worker.process.pid for workers in pool._workers.values() for worker in workers]
+
+        return asyncio.run(main())
+
+    def test_workers_stop_when_asyncio_run_returns(self):
+        pids = self.call_and_leave_open(NodeWorkerPool(size=1))
+        assert pids
+        deadline = time.monotonic() + 5
+        while any(is_running(pid) for pid in pids) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert not any(is_running(pid) for pid in pids)
+
+    def test_close_worker_pool(self):
+        pool = NodeWorkerPool(size=1)
+        previous = js_worker.get_worker_pool()
+        js_worker.set_worker_pool(pool)
+
+        async def main():
+            assert await js_worker.call_js(self.script, 'add', 2, 3) == 5
+            workers = list(pool._workers[asyncio.get_running_loop()])
+            await js_worker.close_worker_pool()
+            return workers
+
+        try:
+            workers = asyncio.run(main())
+        finally:
+            js_worker.set_worker_pool(previous)
+        assert all(worker.process.returncode is not None for worker in workers)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import asyncio
+import unittest
+
+import httpx
+
+from streamget.m3u8 import M3U8Parser, fetch_playlist, parse_playlist
+from streamget.requests.client_pool import ClientPool
+
+MASTER = '''#EXTM3U
+#EXT-X-MEDIA:TYPE=AUDIO,GROUP-ID="aac",NAME="English",URI="audio.m3u8"
+#EXT-X-STREAM-INF:BANDWIDTH=800000,RESOLUTION=640x360,CODECS="avc1.4d401e,mp4a.40.2",FRAME-RATE=30.000
+low.m3u8
+#EXT-X-STREAM-INF:BANDWIDTH=2500000,RESOLUTION=1280x720
+high.m3u8
+#EXT-X-STREAM-INF:BANDWIDTH=800000,RESOLUTION=854x480
+medium.m3u8
+'''
+
+MEDIA = '''#EXTM3U
+#EXT-X-TARGETDURATION:6
+#EXT-X-MEDIA-SEQUENCE:42
+#EXTINF:5.005,first
+seg42.ts
+#EXTINF:4.5,
+seg43.ts
+#EXT-X-ENDLIST
+'''
+
+
+class M3U8ParserTest(unittest.TestCase):
+
+    def test_master_playlist(self):
+        playlist = parse_playlist(MASTER)
+        assert playlist.is_master
+        assert [stream.uri for stream in playlist.streams] == ['low.m3u8', 'high.m3u8', 'medium.m3u8']
+        low = playlist.streams[0]
+        assert low.bandwidth == 800000
+        assert low.resolution == '640x360'
+        assert low.codecs == 'avc1.4d401e,mp4a.40.2'
+        assert low.frame_rate == 30.0
+        assert low.media.uri == 'audio.m3u8'
+        assert playlist.streams[1].media is None
+        assert [stream.uri for stream in playlist.sorted_streams()] == ['high.m3u8', 'low.m3u8', 'medium.m3u8']
+
+    def test_media_playlist(self):
+        playlist = parse_playlist(MEDIA)
+        assert not playlist.is_master
+        assert playlist.target_duration == 6.0
+        assert playlist.media_sequence == 42
+        assert playlist.ended
+        assert [(s.uri, s.duration, s.title) for s in playlist.segments] == [
+            ('seg42.ts', 5.005, 'first'), ('seg43.ts', 4.5, '')]
+
+    def test_chunked_feeding_matches_whole_text(self):
+        for text in (MASTER, MEDIA.replace('\n', '\r\n')):
+            for size in (1, 2, 7, 64):
+                parser = M3U8Parser()
+                for i in range(0, len(text), size):
+                    parser.feed(text[i:i + size])
+                assert parser.close() == parse_playlist(text)
+
+    def test_last_line_without_newline(self):
+        playlist = parse_playlist('#EXTM3U\n#EXTINF:2,\nlast.ts')
+        assert [segment.uri for segment in playlist.segments] == ['last.ts']
+
+    def test_malformed_numeric_values_are_ignored(self):
+        playlist = parse_playlist(
+            '#EXTM3U\n'
+            '#EXT-X-TARGETDURATION:abc\n'
+            '#EXT-X-MEDIA-SEQUENCE:-x\n'
+            '#EXTINF:oops,title\n'
+            'seg.ts\n'
+            '#EXT-X-STREAM-INF:BANDWIDTH=12k,FRAME-RATE=fast\n'
+            'variant.m3u8\n'
+        )
+        assert playlist.target_duration is None
+        assert playlist.media_sequence == 0
+        assert playlist.segments[0].duration == 0.0
+        assert playlist.segments[0].title == 'title'
+        assert playlist.streams[0].bandwidth == 0
+        assert playlist.streams[0].frame_rate is None
+
+    def test_fetch_playlist_parses_the_response(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == '/broken.m3u8':
+                raise httpx.ConnectError('refused', request=request)
+            return httpx.Response(200, text=MEDIA)
+
+        async def main():
+            async with ClientPool(transport=httpx.MockTransport(handler)) as pool:
+                return (await fetch_playlist('https://cdn.example.com/live.m3u8', pool=pool),
+                        await fetch_playlist('https://cdn.example.com/broken.m3u8', pool=pool))
+
+        playlist, broken = asyncio.run(main())
+        assert len(playlist.segments) == 2
+        assert broken.segments == []
+        assert broken.streams == []
+
+
+if __name__ == '__main__':
+    unittest.main()
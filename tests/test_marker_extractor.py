@@ -0,0 +1,71 @@
+import asyncio
+import random
+import re
+import unittest
+
+import httpx
+
+from streamget.requests.async_http import MarkerExtractor, async_extract
+from streamget.requests.client_pool import ClientPool
+
+
+def extract(start: str, end: str, chunks: list[str]) -> str | None:
+    extractor = MarkerExtractor(start, end)
+    for chunk in chunks:
+        if extractor.feed(chunk):
+            break
+    return extractor.value
+
+
+def expected(start: str, end: str, text: str) -> str | None:
+    match = re.search(re.escape(start) + '(.*?)' + re.escape(end), text, re.DOTALL)
+    return match.group(1) if match else None
+
+
+class MarkerExtractorTest(unittest.TestCase):
+
+    def test_markers_split_across_one_character_chunks(self):
+        text = 'x<script>window.__DATA__ = {"a": "</scr"};</script>tail'
+        start, end = 'window.__DATA__ = ', ';</script>'
+        assert extract(start, end, list(text)) == expected(start, end, text) == '{"a": "</scr"}'
+
+    def test_start_marker_split_across_short_chunks(self):
+        assert extract('ac>c', '<<', ['ac', '>c<<', '<']) == expected('ac>c', '<<', 'ac>c<<<')
+
+    def test_random_chunking_matches_the_regex(self):
+        rng = random.Random(0)
+        for _ in range(2000):
+            text = ''.join(rng.choice('ac<>') for _ in range(rng.randint(0, 30)))
+            start = ''.join(rng.choice('ac<>') for _ in range(rng.randint(1, 4)))
+            end = ''.join(rng.choice('ac<>') for _ in range(rng.randint(1, 4)))
+            chunks, position = [], 0
+            while position < len(text):
+                size = rng.randint(1, 4)
+                chunks.append(text[position:position + size])
+                position += size
+            with self.subTest(text=text, start=start, end=end, chunks=chunks):
+                assert extract(start, end, chunks) == expected(start, end, text)
+
+    def test_missing_marker(self):
+        assert extract('start', 'end', ['no markers ', 'here']) is None
+
+
+class AsyncExtractTest(unittest.TestCase):
+
+    def test_extracts_from_the_response_body(self):
+        body = 'a' * 5000 + '<x>value</x>' + 'b' * 5000
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, text=body)
+
+        async def main():
+            async with ClientPool(transport=httpx.MockTransport(handler)) as pool:
+                found = await async_extract('https://example.com/', '<x>', '</x>', pool=pool, coalesce=False)
+                missing = await async_extract('https://example.com/', '<y>', '</y>', pool=pool, coalesce=False)
+                return found, missing
+
+        assert asyncio.run(main()) == ('value', None)
+
+
+if __name__ == '__main__':
+    unittest.main()
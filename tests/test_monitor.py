@@ -0,0 +1,68 @@
+import asyncio
+import unittest
+
+from streamget.data import wrap_stream
+from streamget.monitor import LIVE, LiveMonitor
+from streamget.platforms.base import BaseLiveStream
+from streamget.platforms.douyin.live_stream import DouyinLiveStream
+from streamget.platforms.huya.live_stream import HuyaLiveStream
+
+
+class FakeLiveStream(BaseLiveStream):
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.fetches = 0
+
+    async def fetch_web_stream_data(self, url: str, process_data: bool = True) -> dict:
+        self.fetches += 1
+        return {'anchor_name': 'anchor', 'room_id': '1', 'live_url': url}
+
+    async def fetch_stream_url(self, json_data: dict, video_quality: str | int | None = None):
+        json_data.pop('room_id')
+        return wrap_stream({**json_data, 'platform': 'Fake', 'is_live': True, 'record_url': 'https://cdn/a.flv'})
+
+
+class LiveMonitorTest(unittest.TestCase):
+
+    def test_go_live_reuses_the_room_data_of_the_status_check(self):
+        instance = FakeLiveStream()
+        monitor = LiveMonitor()
+        room = monitor.add_room(instance, 'https://fake/1')
+        events = []
+        asyncio.run(monitor.check_room(room, events.append))
+        assert [event.kind for event in events] == [LIVE]
+        assert events[0].stream.record_url == 'https://cdn/a.flv'
+        assert instance.fetches == 1
+
+    def test_douyin_share_urls_are_resolved_first(self):
+        calls = []
+
+        class ResolvedDouyin(DouyinLiveStream):
+            async def fetch_web_stream_data(self, url: str, process_data: bool = True) -> dict:
+                calls.append(url)
+                return {'status': 2, 'anchor_name': 'anchor'}
+
+        is_live, json_data = asyncio.run(ResolvedDouyin().fetch_live_status('https://v.douyin.com/iQFeBnt/'))
+        assert is_live
+        assert json_data == {'status': 2, 'anchor_name': 'anchor'}
+        assert calls == ['https://v.douyin.com/iQFeBnt/']
+
+    def test_huya_status_check_returns_the_room_data(self):
+        calls = []
+
+        class CountingHuya(HuyaLiveStream):
+            async def fetch_app_stream_data(self, url: str, process_data: bool = True) -> dict:
+                calls.append(url)
+                return {'raw_data': {}, 'anchor_name': 'anchor', 'live_url': url}
+
+        instance = CountingHuya()
+        is_live, json_data = asyncio.run(instance.fetch_live_status('https://www.huya.com/1'))
+        assert is_live
+        assert json_data['anchor_name'] == 'anchor'
+        assert asyncio.run(instance.check_live_status('https://www.huya.com/1'))
+        assert len(calls) == 2
+
+
+if __name__ == '__main__':
+    unittest.main()
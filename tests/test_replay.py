@@ -0,0 +1,109 @@
+import asyncio
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import httpx
+
+from streamget.platforms import load_platform
+from streamget.platforms.huya.live_stream import HuyaLiveStream
+from streamget.requests import instrument
+from streamget.requests.client_pool import ClientPool, get_client_pool, set_client_pool
+from streamget.requests.replay import RecordReplayTransport, redact_body
+
+FIXTURES = Path(__file__).resolve().parent.parent / 'benchmarks' / 'fixtures'
+
+
+async def lookup(transport: RecordReplayTransport):
+    metadata = transport.metadata
+    previous = get_client_pool()
+    pool = ClientPool(transport=transport)
+    set_client_pool(pool)
+    try:
+        live_stream = load_platform(metadata['platform'])()
+        json_data = await getattr(live_stream, metadata.get('method', 'fetch_web_stream_data'))(metadata['url'])
+        return await live_stream.fetch_stream_url(json_data, metadata.get('video_quality'))
+    finally:
+        await pool.aclose()
+        set_client_pool(previous)
+
+
+class FixtureReplayTest(unittest.TestCase):
+
+    def test_every_fixture_resolves_a_stream(self):
+        paths = sorted(FIXTURES.glob('*.json'))
+        assert {'shopee', 'douyin_app'} <= {path.stem for path in paths}
+        for path in paths:
+            with self.subTest(fixture=path.stem):
+                transport = RecordReplayTransport(path)
+                stream = asyncio.run(lookup(transport))
+                assert transport.misses == []
+                assert stream.is_live
+                assert stream.record_url
+
+    def test_static_stage_is_timed_during_replay(self):
+        timings = []
+        instrument.add_timing_callback(timings.append)
+        try:
+            asyncio.run(lookup(RecordReplayTransport(FIXTURES / 'shopee.json')))
+        finally:
+            instrument.remove_timing_callback(timings.append)
+        stages = {(t.platform, t.name) for t in timings if t.kind == instrument.STAGE}
+        assert stages == {('ShopeeLiveStream', 'fetch_web_stream_data'), ('ShopeeLiveStream', 'fetch_stream_url')}
+
+    def test_huya_stage_called_on_class(self):
+        async def lookup_on_class():
+            transport = RecordReplayTransport(FIXTURES / 'huya.json')
+            previous = get_client_pool()
+            pool = ClientPool(transport=transport)
+            set_client_pool(pool)
+            try:
+                json_data = await HuyaLiveStream().fetch_web_stream_data(transport.metadata['url'])
+                return await HuyaLiveStream.fetch_stream_url(json_data)
+            finally:
+                await pool.aclose()
+                set_client_pool(previous)
+
+        stream = asyncio.run(lookup_on_class())
+        assert stream.is_live
+        assert stream.record_url
+
+
+class RedactionTest(unittest.TestCase):
+
+    def test_login_form_is_not_written_to_the_cassette(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json={'RESULT': 1, 'token': 'tok-123', 'url': 'https://a/b.flv?sign=s3cr3t'})
+
+        async def record(path: Path):
+            transport = RecordReplayTransport(path, mode='record', inner=httpx.MockTransport(handler))
+            async with httpx.AsyncClient(transport=transport) as client:
+                await client.post('https://login.sooplive.co.kr/app/LoginAction.php',
+                                  data={'szId': 'me@example.com', 'szPassword': 'hunter2'})
+            transport.save()
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'login.json'
+            asyncio.run(record(path))
+            cassette = path.read_text(encoding='utf-8')
+            for secret in ('me@example.com', 'hunter2', 'tok-123', 's3cr3t'):
+                assert secret not in cassette
+
+            async def replay():
+                transport = RecordReplayTransport(path)
+                async with httpx.AsyncClient(transport=transport) as client:
+                    return await client.post('https://login.sooplive.co.kr/app/LoginAction.php',
+                                             data={'szId': 'me@example.com', 'szPassword': 'hunter2'})
+
+            assert json.loads(asyncio.run(replay()).text)['RESULT'] == 1
+
+    def test_masking_keeps_the_byte_length(self):
+        body = b'T10,https://a/b?sign=0123456789'
+        redacted = redact_body(body, 'text/html')
+        assert b'0123456789' not in redacted
+        assert len(redacted) == len(body)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import asyncio
+import unittest
+
+from streamget.cache import ResultCache, canonical_room_url
+from streamget.data import StreamData
+from streamget.platforms.base import BaseLiveStream
+
+
+class CountingLiveStream(BaseLiveStream):
+
+    def __init__(self, proxy_addr: str | None = None, cookies: str | None = None):
+        super().__init__(proxy_addr, cookies)
+        self.calls = 0
+
+    async def fetch_web_stream_data(self, url: str) -> dict:
+        self.calls += 1
+        return {'url': url, 'cookies': self.cookies}
+
+    async def fetch_stream_url(self, json_data: dict, video_quality: str | int | None = None) -> StreamData:
+        return StreamData(platform='Test', anchor_name=json_data['url'], is_live=True, title=json_data['cookies'],
+                          extra={'hits': []})
+
+
+class CanonicalRoomUrlTest(unittest.TestCase):
+
+    def test_query_identifies_the_room(self):
+        assert canonical_room_url('https://www.youtube.com/watch?v=A') != canonical_room_url(
+            'https://youtube.com/watch?v=B')
+
+    def test_equivalent_spellings(self):
+        assert canonical_room_url('https://www.huya.com/52333/') == canonical_room_url('http://HUYA.com/52333#x')
+        assert canonical_room_url('https://a.com/r?b=2&a=1') == canonical_room_url('https://a.com/r?a=1&b=2')
+
+
+class ResultCacheTest(unittest.TestCase):
+
+    def fetch_all(self, *calls):
+        async def run():
+            return [await live_stream.fetch_stream(url) for live_stream, url in calls]
+        return asyncio.run(run())
+
+    def test_rooms_differing_by_query_are_not_shared(self):
+        live_stream = CountingLiveStream()
+        live_stream.result_cache = ResultCache()
+        a, b = self.fetch_all((live_stream, 'https://www.youtube.com/watch?v=A'),
+                              (live_stream, 'https://www.youtube.com/watch?v=B'))
+        assert a.anchor_name.endswith('v=A')
+        assert b.anchor_name.endswith('v=B')
+        assert live_stream.calls == 2
+
+    def test_cookies_and_proxy_are_part_of_the_key(self):
+        cache = ResultCache()
+        streams = [CountingLiveStream(), CountingLiveStream(cookies='sid=1'), CountingLiveStream(proxy_addr='p:1')]
+        for live_stream in streams:
+            live_stream.result_cache = cache
+        url = 'https://live.example.com/1'
+        results = self.fetch_all(*((live_stream, url) for live_stream in streams))
+        assert results[1].title == 'sid=1'
+        assert [live_stream.calls for live_stream in streams] == [1, 1, 1]
+
+    def test_hits_do_not_share_mutable_values(self):
+        live_stream = CountingLiveStream()
+        live_stream.result_cache = ResultCache()
+        url = 'https://live.example.com/1'
+        first, second = self.fetch_all((live_stream, url), (live_stream, url))
+        first.extra['hits'].append(1)
+        third, = self.fetch_all((live_stream, url))
+        assert live_stream.calls == 1
+        assert second.extra['hits'] == []
+        assert third.extra['hits'] == []
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import asyncio
+import unittest
+
+from streamget.platforms.huya.live_stream import HuyaLiveStream
+from streamget.platforms.shopee.live_stream import ShopeeLiveStream
+from streamget.requests import instrument
+
+SHOPEE_DATA = {'anchor_name': 'shop', 'is_live': True, 'title': 'sale', 'flv_url': 'https://live.shopee/a.flv',
+               'record_url': 'https://live.shopee/a.flv'}
+
+
+class TimedStagesTest(unittest.TestCase):
+
+    def test_static_stage_called_on_instance(self):
+        stream = asyncio.run(ShopeeLiveStream().fetch_stream_url(dict(SHOPEE_DATA)))
+        assert stream.platform == 'Shopee'
+        assert stream.record_url == SHOPEE_DATA['record_url']
+
+    def test_static_stage_called_on_class(self):
+        stream = asyncio.run(ShopeeLiveStream.fetch_stream_url(dict(SHOPEE_DATA)))
+        assert stream.platform == 'Shopee'
+
+    def test_static_stage_emits_timing(self):
+        timings = []
+        instrument.add_timing_callback(timings.append)
+        try:
+            asyncio.run(ShopeeLiveStream().fetch_stream_url(dict(SHOPEE_DATA)))
+        finally:
+            instrument.remove_timing_callback(timings.append)
+        stages = [t for t in timings if t.kind == instrument.STAGE]
+        assert [(t.platform, t.name) for t in stages] == [('ShopeeLiveStream', 'fetch_stream_url')]
+
+    def test_stages_are_wrapped_once(self):
+        for cls, name in ((ShopeeLiveStream, 'fetch_stream_url'), (HuyaLiveStream, 'fetch_web_stream_data')):
+            descriptor = cls.__dict__[name]
+            assert getattr(descriptor, '__func__', descriptor).__timed_stage__
+        assert isinstance(ShopeeLiveStream.__dict__['fetch_stream_url'], staticmethod)
+
+
+if __name__ == '__main__':
+    unittest.main()
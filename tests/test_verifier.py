@@ -0,0 +1,73 @@
+import asyncio
+import time
+import unittest
+
+import httpx
+
+from streamget.requests.client_pool import ClientPool
+from streamget.verifier import StreamVerifier, quality_fallback_order
+
+URLS = [f'https://cdn.example/{quality}.m3u8' for quality in ('or4', 'uhd', 'hd', 'sd', 'ld')]
+
+
+def verifier_for(dead: set[str], probed: list[str], slow: frozenset[str] = frozenset()) -> StreamVerifier:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        url = str(request.url)
+        probed.append(url)
+        if url in slow:
+            await asyncio.sleep(5)
+        return httpx.Response(404 if url in dead else 200)
+
+    return StreamVerifier(timeout=1, pool=ClientPool(transport=httpx.MockTransport(handler)))
+
+
+class FirstWorkingTest(unittest.TestCase):
+
+    def test_default_timeout(self):
+        assert StreamVerifier().timeout == 10
+
+    def test_requested_quality_is_used_when_it_works(self):
+        probed = []
+        candidates = [URLS[i] for i in quality_fallback_order(2)]
+        result = asyncio.run(verifier_for(set(), probed).first_working(candidates))
+        assert sorted(probed) == sorted(URLS)
+        assert result.best == URLS[2]
+        assert result.fallbacks == [URLS[3], URLS[4], URLS[1], URLS[0]]
+
+    def test_falls_back_to_the_next_lower_quality(self):
+        probed = []
+        candidates = [URLS[i] for i in quality_fallback_order(2)]
+        result = asyncio.run(verifier_for({URLS[2], URLS[3]}, probed).first_working(candidates))
+        assert result.best == URLS[4]
+        assert result.failed == [URLS[2], URLS[3]]
+        assert result.fallbacks == [URLS[1], URLS[0]]
+
+    def test_dead_candidates_cost_one_deadline(self):
+        probed = []
+        verifier = verifier_for(set(), probed, slow=frozenset(URLS[:3]))
+        start = time.monotonic()
+        result = asyncio.run(verifier.first_working(URLS))
+        assert time.monotonic() - start < 2
+        assert result.best == URLS[3]
+        assert result.failed == URLS[:3]
+        assert result.statuses[URLS[0]] is None
+
+    def test_returns_without_waiting_for_later_candidates(self):
+        probed = []
+        verifier = verifier_for(set(), probed, slow=frozenset(URLS[1:]))
+        start = time.monotonic()
+        result = asyncio.run(verifier.first_working(URLS))
+        assert time.monotonic() - start < 0.5
+        assert result.best == URLS[0]
+        assert result.fallbacks == URLS[1:]
+
+    def test_no_working_candidate(self):
+        probed = []
+        result = asyncio.run(verifier_for(set(URLS), probed).first_working(URLS))
+        assert result.best is None
+        assert result.failed == URLS
+        assert result.fallbacks == []
+
+
+if __name__ == '__main__':
+    unittest.main()